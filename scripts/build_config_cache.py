@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Pre-compile the packaged criteria and QualiBact snapshot for a release build.
+
+Run this before ``python -m build`` so wheels ship compiled configuration in
+``speccheck/config/compiled`` and the first run after install skips parsing
+the packaged CSV files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+
+from speccheck import config_cache
+from speccheck import criteria as criteria_module
+from speccheck import qualibact as qualibact_module
+from speccheck.config import get_default_criteria_path
+from speccheck.criteria import CriteriaStore
+from speccheck.update_criteria import QUALIBACT_SNAPSHOT_PATH
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=ROOT / "speccheck" / "config" / "compiled",
+        help="Directory to write compiled entries into (replaced if it exists)",
+    )
+    args = parser.parse_args(argv)
+
+    shutil.rmtree(args.output_dir, ignore_errors=True)
+    criteria_path = get_default_criteria_path()
+    criteria_data = Path(criteria_path).read_bytes()
+    snapshot_data = Path(QUALIBACT_SNAPSHOT_PATH).read_bytes()
+    entries = {
+        config_cache.cache_key(
+            "criteria",
+            _sha256(criteria_data),
+            config_cache.source_fingerprint(criteria_module),
+        ): CriteriaStore(criteria_path, criteria_data).compile(),
+        config_cache.cache_key(
+            "qualibact",
+            _sha256(snapshot_data),
+            config_cache.source_fingerprint(qualibact_module),
+        ): qualibact_module._parse_thresholds(snapshot_data.decode("utf-8")),
+    }
+    for name, compiled in entries.items():
+        if not config_cache.write_entry(args.output_dir / name, compiled):
+            print(f"Could not write {args.output_dir / name}", file=sys.stderr)
+            return 1
+        print(args.output_dir / name)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
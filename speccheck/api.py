@@ -0,0 +1,197 @@
+"""In-process Python API: evaluate samples without writing or reading CSVs.
+
+``Evaluator`` validates the criteria and opens metadata once, then evaluates
+any number of samples against that prepared context::
+
+    from speccheck.api import Evaluator
+
+    evaluator = Evaluator(metadata_file="metadata.csv")
+    result = evaluator.evaluate_sample(
+        {"report.tsv": quast_bytes, "fastp.json": fastp_bytes},
+        "SAMPLE_001",
+        organism="Escherichia coli",
+    )
+    result.status, result.failure_reasons
+
+Inputs are paths, directories or globs as accepted by ``speccheck collect``,
+in-memory ``{file name: bytes}`` mappings, or a list mixing paths and
+``(file name, bytes)`` pairs. The file name of an in-memory input is used for
+parser detection exactly as a path's base name would be. ``evaluate_sample``
+and ``evaluate_samples`` are shortcuts over a per-process ``Evaluator`` for the
+given criteria file.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from speccheck.collect import sanitize_report
+from speccheck.collect_workflow import _prepare_collection_context, collect_report
+from speccheck.config import get_default_criteria_path
+
+__all__ = ["Evaluator", "QCResult", "evaluate_sample", "evaluate_samples"]
+
+
+@dataclass(frozen=True)
+class QCResult:
+    """Evaluated QC for one sample.
+
+    ``report`` holds the same fields and values as the sample's
+    ``detailed.*.csv``, with check results as booleans. ``report`` is ``None``
+    and ``status`` is ``"NO_DATA"`` when no input was recognised.
+    """
+
+    sample_id: str
+    status: str
+    passed: bool
+    report: dict | None
+
+    @property
+    def failure_reasons(self) -> list[str]:
+        return _reasons(self.report, "speccheck_failure_reasons")
+
+    @property
+    def warning_reasons(self) -> list[str]:
+        return _reasons(self.report, "speccheck_warning_reasons")
+
+
+class Evaluator:
+    """Long-lived collection context for evaluating many samples in-process."""
+
+    def __init__(
+        self,
+        criteria_file=None,
+        metadata_file=None,
+        allow_unknown_organism=False,
+        fail_on_not_evaluated=False,
+        assembly_type="short",
+    ):
+        self.criteria_file = criteria_file or get_default_criteria_path()
+        self.metadata_file = metadata_file
+        self.allow_unknown_organism = allow_unknown_organism
+        self.fail_on_not_evaluated = fail_on_not_evaluated
+        self.assembly_type = assembly_type
+        self.context = _prepare_collection_context(self.criteria_file, metadata_file)
+
+    def evaluate_sample(self, inputs, sample_id, organism=None, assembly_type=None) -> QCResult:
+        """Parse and evaluate one sample's inputs, returning a ``QCResult``."""
+        paths, contents = _split_inputs(inputs)
+        qc_report = collect_report(
+            organism,
+            paths,
+            self.criteria_file,
+            sample_id,
+            metadata_file=self.metadata_file,
+            allow_unknown_organism=self.allow_unknown_organism,
+            assembly_type=assembly_type or self.assembly_type,
+            fail_on_not_evaluated=self.fail_on_not_evaluated,
+            input_contents=contents,
+            _context=self.context,
+        )
+        if qc_report is None:
+            return QCResult(sample_id=sample_id, status="NO_DATA", passed=False, report=None)
+        qc_report = sanitize_report(qc_report)
+        return QCResult(
+            sample_id=sample_id,
+            status=qc_report["speccheck_overall_status"],
+            passed=bool(qc_report["all_checks_passed"]),
+            report=qc_report,
+        )
+
+    def evaluate_samples(self, samples, organism=None, assembly_type=None) -> list[QCResult]:
+        """Evaluate ``{sample_id: inputs}`` or ``(sample_id, inputs)`` pairs in order."""
+        items = samples.items() if isinstance(samples, dict) else samples
+        return [
+            self.evaluate_sample(inputs, sample_id, organism=organism, assembly_type=assembly_type)
+            for sample_id, inputs in items
+        ]
+
+
+def evaluate_sample(
+    inputs,
+    sample_id,
+    organism=None,
+    assembly_type="short",
+    criteria_file=None,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=False,
+) -> QCResult:
+    """Evaluate one sample with a cached ``Evaluator`` for these options."""
+    evaluator = _evaluator(
+        criteria_file, metadata_file, allow_unknown_organism, fail_on_not_evaluated
+    )
+    return evaluator.evaluate_sample(
+        inputs, sample_id, organism=organism, assembly_type=assembly_type
+    )
+
+
+def evaluate_samples(
+    samples,
+    organism=None,
+    assembly_type="short",
+    criteria_file=None,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=False,
+) -> list[QCResult]:
+    """Evaluate many samples with a cached ``Evaluator`` for these options."""
+    evaluator = _evaluator(
+        criteria_file, metadata_file, allow_unknown_organism, fail_on_not_evaluated
+    )
+    return evaluator.evaluate_samples(samples, organism=organism, assembly_type=assembly_type)
+
+
+def _evaluator(criteria_file, metadata_file, allow_unknown_organism, fail_on_not_evaluated):
+    criteria_file = os.path.abspath(criteria_file or get_default_criteria_path())
+    metadata_file = metadata_file and os.path.abspath(metadata_file)
+    # Rebuild the evaluator when either file is edited in a long-running process.
+    versions = tuple(
+        os.stat(path).st_mtime_ns if path and os.path.exists(path) else None
+        for path in (criteria_file, metadata_file)
+    )
+    return _cached_evaluator(
+        criteria_file, metadata_file, allow_unknown_organism, fail_on_not_evaluated, versions
+    )
+
+
+@lru_cache(maxsize=8)
+def _cached_evaluator(
+    criteria_file, metadata_file, allow_unknown_organism, fail_on_not_evaluated, _versions
+):
+    return Evaluator(
+        criteria_file,
+        metadata_file,
+        allow_unknown_organism=allow_unknown_organism,
+        fail_on_not_evaluated=fail_on_not_evaluated,
+    )
+
+
+def _split_inputs(inputs):
+    """Return ``(paths, {name: bytes})`` from the accepted input forms."""
+    if isinstance(inputs, (str, os.PathLike)):
+        return [os.fspath(inputs)], {}
+    items = inputs.items() if isinstance(inputs, dict) else inputs
+    paths = []
+    contents = {}
+    for item in items:
+        if isinstance(item, (str, os.PathLike)):
+            paths.append(os.fspath(item))
+            continue
+        name, content = item
+        if hasattr(content, "read"):
+            content = content.read()
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        name = os.fspath(name)
+        if name in contents:
+            raise ValueError(f"Duplicate in-memory input name: {name}")
+        contents[name] = content
+    return paths, contents
+
+
+def _reasons(report, column):
+    text = (report or {}).get(column) or "none"
+    return [] if text == "none" else text.split("; ")
@@ -0,0 +1,167 @@
+"""Indexed archives of collected per-sample CSVs.
+
+A finished collection keeps two CSVs per sample for audit, which is two
+inodes per sample and a directory walk plus two opens per sample for every
+``summary`` or ``recheck``. ``compact`` packs them into one ZIP archive::
+
+    speccheck_collected.zip
+        speccheck_index.json    {"samples": {sample_id: {"concise": ..., "detailed": ...}}}
+        <sample>.csv
+        detailed.<sample>.csv
+
+Members keep their file names and bytes, so ``unzip`` restores the original
+files. The index maps each sample ID to its members, and the ZIP central
+directory maps members to their offsets, so one sample is read without
+scanning the others. ``summary`` and ``recheck`` read archives directly.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import os
+import zipfile
+
+from speccheck.atomic import atomic_write, is_partial_file
+from speccheck.quarantine import is_quarantine_report
+
+ARCHIVE_STEM = "speccheck_collected"
+ARCHIVE_NAME = f"{ARCHIVE_STEM}.zip"
+INDEX_MEMBER = "speccheck_index.json"
+ARCHIVE_FORMAT = 1
+DETAILED_PREFIX = "detailed."
+_SUMMARY_OUTPUTS = frozenset({"report.csv", "report.full.csv"})
+
+
+def is_archive_file(filename):
+    """Return True for an archive written by ``compact``."""
+    name = os.path.basename(filename)
+    return name.startswith(ARCHIVE_STEM) and name.endswith(".zip")
+
+
+def compact(directory, archive_path=None, remove=False):
+    """Pack the collected CSVs directly in ``directory`` into an indexed archive.
+
+    ``archive_path`` defaults to ``speccheck_collected.zip`` in ``directory``.
+    Samples already in an existing archive are kept unless a CSV of the same
+    name replaces them. With ``remove``, the packed CSVs are deleted once the
+    archive has been written and verified. Returns the archive path.
+    """
+    archive_path = archive_path or os.path.join(directory, ARCHIVE_NAME)
+    names = _collected_csv_names(directory)
+    if not names and not os.path.exists(archive_path):
+        raise ValueError(f"No collected CSV files found under {os.path.abspath(directory)}")
+
+    members = {}
+    if os.path.exists(archive_path):
+        with CollectedArchive(archive_path) as existing:
+            for name in existing.member_names():
+                if name not in names:
+                    members[name] = existing.read_bytes(name)
+    for name in names:
+        with open(os.path.join(directory, name), "rb") as handle:
+            members[name] = handle.read()
+
+    index = _build_index(members)
+    with atomic_write(archive_path, "wb") as handle:
+        with zipfile.ZipFile(handle, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(
+                INDEX_MEMBER,
+                json.dumps({"format": ARCHIVE_FORMAT, "samples": index}, indent=1, sort_keys=True),
+            )
+            for name in sorted(members):
+                archive.writestr(name, members[name])
+    logging.info(
+        "Packed %d file(s) for %d sample(s) into %s", len(members), len(index), archive_path
+    )
+
+    if remove and names:
+        with zipfile.ZipFile(archive_path) as archive:
+            damaged = archive.testzip()
+        if damaged is not None:
+            raise OSError(f"Archive {archive_path} failed verification at {damaged}")
+        for name in names:
+            os.unlink(os.path.join(directory, name))
+        logging.info("Removed %d packed CSV file(s) from %s", len(names), directory)
+    return archive_path
+
+
+class CollectedArchive:
+    """Read-only, random access to an archive written by ``compact``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        try:
+            index = json.loads(self._zip.read(INDEX_MEMBER))
+        except KeyError:
+            self._zip.close()
+            raise ValueError(f"{path} is not a speccheck archive: no {INDEX_MEMBER}") from None
+        self.samples = index["samples"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    def member_names(self):
+        """Return the archived CSV names, in archive order."""
+        return [name for name in self._zip.namelist() if name != INDEX_MEMBER]
+
+    def read_bytes(self, name):
+        return self._zip.read(name)
+
+    def read_row(self, name):
+        """Return the first row of one archived CSV as ``{column: text}``."""
+        text = self._zip.read(name).decode("utf-8")
+        return next(csv.DictReader(io.StringIO(text, newline="")), None)
+
+    def sample_row(self, sample_id, detailed=False):
+        """Return one sample's concise (or detailed) row, or None if it was not archived."""
+        name = self.samples.get(sample_id, {}).get("detailed" if detailed else "concise")
+        return None if name is None else self.read_row(name)
+
+    def concise_names(self):
+        return [name for name in self.member_names() if not name.startswith(DETAILED_PREFIX)]
+
+    def detailed_names(self):
+        return [name for name in self.member_names() if name.startswith(DETAILED_PREFIX)]
+
+
+def _collected_csv_names(directory):
+    names = []
+    for name in sorted(os.listdir(directory)):
+        if (
+            not name.endswith(".csv")
+            or name.startswith(".")
+            or name in _SUMMARY_OUTPUTS
+            or is_partial_file(name)
+            or is_quarantine_report(name)
+            or not os.path.isfile(os.path.join(directory, name))
+        ):
+            continue
+        names.append(name)
+    return names
+
+
+def _build_index(members):
+    index = {}
+    for name, data in members.items():
+        detailed = name.startswith(DETAILED_PREFIX)
+        row = next(csv.DictReader(io.StringIO(data.decode("utf-8"), newline="")), None) or {}
+        stem = name[len(DETAILED_PREFIX) :] if detailed else name
+        sample_id = row.get("sample_id") or stem[: -len(".csv")]
+        entry = index.setdefault(sample_id, {})
+        kind = "detailed" if detailed else "concise"
+        if kind in entry:
+            raise ValueError(
+                f"Sample {sample_id} has two {kind} CSVs to archive: {entry[kind]} and {name}"
+            )
+        entry[kind] = name
+    return index
@@ -0,0 +1,139 @@
+"""Crash- and concurrency-safe output files.
+
+Many ``speccheck`` processes, for example the tasks of an HPC job array, may
+write into one shared output directory. Every output is first written to a
+hidden ``.<name>.<random>.partial`` file next to its target and renamed into
+place once complete, so readers such as ``summary`` only ever see finished
+files, and a killed job leaves at most a partial file that is ignored.
+
+Files that several processes update in place, such as the collect manifest,
+are read, merged and rewritten while holding an advisory lock on a sibling
+``.<name>.lock`` file. Set ``SPECCHECK_FSYNC=1`` to also flush each file and
+its directory to stable storage before and after the rename, at some cost in
+throughput on network file systems.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from functools import cache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+FSYNC_ENV = "SPECCHECK_FSYNC"
+PARTIAL_SUFFIX = ".partial"
+LOCK_SUFFIX = ".lock"
+
+
+def fsync_enabled() -> bool:
+    """Return True when ``SPECCHECK_FSYNC`` is set to a truthy value."""
+    return os.environ.get(FSYNC_ENV, "").strip().lower() in {"1", "true", "yes"}
+
+
+def is_partial_file(filename) -> bool:
+    """Return whether ``filename`` is an in-progress or abandoned atomic write."""
+    return filename.startswith(".") and filename.endswith(PARTIAL_SUFFIX)
+
+
+def reserve_partial(path) -> str:
+    """Create and return an empty partial file in the same directory as ``path``.
+
+    ``mkstemp`` creates the file readable by its owner only; it is given the
+    mode ``open`` would have used instead, so that the renamed output is as
+    shareable as the directory's umask allows.
+    """
+    directory, name = os.path.split(os.fspath(path))
+    handle, partial_path = tempfile.mkstemp(
+        prefix=f".{name}.", suffix=PARTIAL_SUFFIX, dir=directory or "."
+    )
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(handle, 0o666 & ~_umask())
+    finally:
+        os.close(handle)
+    return partial_path
+
+
+def commit_partial(partial_path, path, fsync=None):
+    """Rename a finished partial file over ``path``, optionally syncing it first."""
+    if fsync is None:
+        fsync = fsync_enabled()
+    if fsync:
+        with open(partial_path, "rb") as handle:
+            os.fsync(handle.fileno())
+    os.replace(partial_path, path)
+    if fsync:
+        _fsync_directory(os.path.dirname(os.fspath(path)) or ".")
+
+
+def discard_partial(partial_path):
+    """Remove a partial file after a failed write; a missing file is fine."""
+    try:
+        os.unlink(partial_path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def atomic_write(path, mode="w", *, fsync=None, encoding=None, newline=None):
+    """Open a partial file for writing and rename it over ``path`` on success.
+
+    On an exception the partial file is removed and ``path`` is left as it was.
+    """
+    if "b" not in mode and encoding is None:
+        encoding = "utf-8"
+    partial_path = reserve_partial(path)
+    try:
+        with open(partial_path, mode, encoding=encoding, newline=newline) as handle:
+            yield handle
+        commit_partial(partial_path, path, fsync=fsync)
+    except BaseException:
+        discard_partial(partial_path)
+        raise
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock for ``path`` until the block exits.
+
+    The lock is taken on a sibling ``.<name>.lock`` file with POSIX record
+    locks, which, unlike ``flock``, are honoured across NFS clients. Where
+    locking is unavailable the block runs unlocked.
+    """
+    directory, name = os.path.split(os.fspath(path))
+    lock_path = os.path.join(directory, f".{name}{LOCK_SUFFIX}")
+    with open(lock_path, "a", encoding="utf-8") as handle:
+        if fcntl is None:  # pragma: no cover - Windows
+            logging.debug("Advisory locks are unavailable; writing %s unlocked", path)
+            yield
+            return
+        fcntl.lockf(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.lockf(handle.fileno(), fcntl.LOCK_UN)
+
+
+@cache
+def _umask():
+    # The umask can only be read by setting it, so do that once per process.
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def _fsync_directory(directory):
+    try:
+        handle = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(handle)
+    finally:
+        os.close(handle)
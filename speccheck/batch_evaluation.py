@@ -0,0 +1,340 @@
+"""Column-wise criteria evaluation for many samples at once.
+
+``EvaluationPlan.evaluate`` walks one sample's parser results row by row. For
+batch and re-evaluation workloads the same plan can instead be applied to a
+frame with one row per sample and one column per flattened ``software.field``
+value (the columns ``add_parsed_values`` produces). Each criteria row then
+becomes a single array comparison or vectorized regex match over all samples,
+and the result carries the same ``.check``/``.status`` columns, per-parser
+``all_checks_passed`` flags, reasons and ``speccheck_overall_status`` as the
+per-sample engine.
+
+A parser counts as present for a sample when any of its columns holds a
+value. Reasons are listed in each sample's own parser order when
+``software_order`` is given (see ``software_order``), and otherwise in the
+order parser columns first appear.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+from speccheck.batch_logging import event
+from speccheck.evaluation import STATUS_RANK, add_parsed_values
+
+_STATUS_NAMES = np.array(sorted(STATUS_RANK, key=STATUS_RANK.get), dtype=object)
+_NOT_EVALUATED = STATUS_RANK["NOT_EVALUATED"]
+
+
+def reports_frame(recovered_values_by_sample) -> pd.DataFrame:
+    """Flatten ``{sample_id: recovered_values}`` into one row per sample.
+
+    Values keep their parsed Python types, so regex checks see the same text
+    as the per-sample engine.
+    """
+    records = {}
+    for sample_id, recovered_values in recovered_values_by_sample.items():
+        record = {}
+        for software, result in recovered_values.items():
+            add_parsed_values(record, software, result)
+        records[sample_id] = record
+    return pd.DataFrame.from_dict(records, orient="index", dtype=object)
+
+
+def software_order(recovered_values_by_sample):
+    """Return each sample's parser order, aligned with ``reports_frame`` rows."""
+    return [tuple(recovered_values) for recovered_values in recovered_values_by_sample.values()]
+
+
+def evaluate_frame(
+    plan, frame, *, software_order=None, fail_on_not_evaluated=False
+) -> pd.DataFrame:
+    """Return the parsed columns of ``frame`` plus all check and summary columns.
+
+    ``software_order`` optionally gives, per row, the order parsers were
+    recovered in, so warning and failure reasons are joined in the same order
+    as ``EvaluationPlan.evaluate`` would join them for that sample.
+    """
+    if software_order is not None and len(software_order) != len(frame):
+        raise ValueError("software_order must have one entry per frame row")
+    evaluator = _FrameEvaluator(frame, fail_on_not_evaluated, software_order)
+    for software in evaluator.softwares:
+        present = evaluator.present(software)
+        baseline_ok = evaluator.evaluate_rows(plan.baseline.get(software, ()), software, present)
+        species_ok = evaluator.evaluate_rows(plan.species.get(software, ()), software, present)
+        parser_ok = baseline_ok & species_ok
+        evaluator.set_column(f"{software}.all_checks_passed", parser_ok, present)
+        evaluator.all_passed &= parser_ok | ~present
+        evaluator.baseline_passed &= baseline_ok | ~present
+        evaluator.species_passed &= species_ok | ~present
+    return evaluator.finish(plan.species_checks_available)
+
+
+class _FrameEvaluator:
+    def __init__(self, frame, fail_on_not_evaluated, software_order=None):
+        self.frame = frame
+        self.software_order = software_order
+        self.size = len(frame)
+        self.fail_on_not_evaluated = fail_on_not_evaluated
+        self.columns = {}
+        self.check_state = {}
+        self.status_rank = {}
+        self.warning_reasons = []
+        self.failure_reasons = []
+        self.warning_count = np.zeros(self.size, dtype=np.int64)
+        self.failure_count = np.zeros(self.size, dtype=np.int64)
+        self.not_evaluated_count = np.zeros(self.size, dtype=np.int64)
+        self.all_passed = np.ones(self.size, dtype=bool)
+        self.baseline_passed = np.ones(self.size, dtype=bool)
+        self.species_passed = np.ones(self.size, dtype=bool)
+        self._values = {}
+        self._has_value = {}
+        self._numeric = {}
+        self._by_software = {}
+        for column in frame.columns:
+            self._by_software.setdefault(str(column).split(".", 1)[0], []).append(column)
+        self.softwares = list(self._by_software)
+
+    def present(self, software):
+        return self.frame[self._by_software[software]].notna().any(axis=1).to_numpy()
+
+    def set_column(self, column, values, mask):
+        output = np.full(self.size, np.nan, dtype=object)
+        output[mask] = values[mask]
+        self.columns[column] = output
+
+    def values(self, criterion):
+        """Return the object array a criterion reads, NaN where it has no value."""
+        key = (criterion.software, criterion.name, criterion.read_type)
+        if key not in self._values:
+            self._values[key] = self._lookup(criterion)
+        return self._values[key]
+
+    def _lookup(self, criterion):
+        missing = np.full(self.size, np.nan, dtype=object)
+        if not criterion.is_depth:
+            column = f"{criterion.software}.{criterion.name}"
+            return self._column(column) if column in self.frame else missing
+        if criterion.read_type is None:
+            return missing
+        # Single read-type results flatten to Depth.<field> with Depth.Read_type;
+        # hybrid results flatten to Depth.<read_type>.<field>.
+        values = missing
+        nested = f"Depth.{criterion.read_type}.{criterion.name}"
+        if nested in self.frame:
+            values = self._column(nested)
+        flat = f"Depth.{criterion.name}"
+        if flat in self.frame and "Depth.Read_type" in self.frame:
+            read_type = self.frame["Depth.Read_type"].astype("string").str.lower()
+            matched = (read_type == criterion.read_type).fillna(False).to_numpy(dtype=bool)
+            values = np.where(matched, self._column(flat).astype(object), values)
+        return values
+
+    def _column(self, column):
+        return self.frame[column].to_numpy()
+
+    def has_value(self, criterion):
+        key = (criterion.software, criterion.name, criterion.read_type)
+        if key not in self._has_value:
+            self._has_value[key] = pd.notna(self.values(criterion))
+        return self._has_value[key]
+
+    def numeric(self, criterion):
+        """Coerce values like the per-sample engine; unparseable text becomes NaN."""
+        key = (criterion.software, criterion.name, criterion.read_type)
+        if key not in self._numeric:
+            values = self.values(criterion)
+            if values.dtype == object:
+                series = pd.Series(values).infer_objects()
+                if series.dtype == object:
+                    series = series.map(_coerce_numeric)
+                values = pd.to_numeric(series, errors="coerce").to_numpy()
+            self._numeric[key] = values.astype(float, copy=False)
+        return self._numeric[key]
+
+    def test(self, criterion, has_value):
+        field = criterion.field
+        operator = field["operator"]
+        if operator == "regex":
+            # Match each distinct value once; cohorts repeat a few species names.
+            pattern = re.compile(str(field["value"]))
+            codes, uniques = pd.factorize(self.values(criterion)[has_value])
+            unique_matches = np.array(
+                [bool(pattern.match(str(value))) for value in uniques], dtype=bool
+            )
+            matched = np.zeros(self.size, dtype=bool)
+            matched[has_value] = unique_matches[codes]
+            return matched
+        threshold = field["value"]
+        if isinstance(threshold, (int, float)):
+            values = self.numeric(criterion)
+            with np.errstate(invalid="ignore"):
+                return _compare(operator, values, threshold) & ~np.isnan(values)
+        values = self.values(criterion)
+        return np.array(
+            [
+                bool(_compare(operator, value, threshold)) if present else False
+                for value, present in zip(values, has_value, strict=True)
+            ],
+            dtype=bool,
+        )
+
+    def evaluate_rows(self, criteria, software, present):
+        group_passed = np.ones(self.size, dtype=bool)
+        for criterion in criteria:
+            column = criterion.column
+            if column not in self.check_state:
+                self.check_state[column] = np.full(self.size, np.nan, dtype=object)
+                self.status_rank[column] = np.full(self.size, -1, dtype=np.int64)
+            check = self.check_state[column]
+            rank = self.status_rank[column]
+            unseen = present & (rank < 0)
+            check[unseen] = True
+            rank[unseen] = STATUS_RANK["PASS"]
+
+            has_value = present & self.has_value(criterion)
+            failed = has_value & ~self.test(criterion, has_value)
+            failed_total = int(failed.sum())
+            if failed_total:
+                logging.info(
+                    "Failed check for %s: %s %s %s in %d sample(s)",
+                    criterion.software,
+                    criterion.name,
+                    criterion.field["operator"],
+                    criterion.field["value"],
+                    failed_total,
+                )
+            severity_rank = STATUS_RANK[criterion.severity]
+            if criterion.severity == "WARN":
+                self.warning_count[failed] += 1
+                self.warning_reasons.append((criterion.reason, failed, software))
+            else:
+                self.failure_count[failed] += 1
+                self.failure_reasons.append((criterion.reason, failed, software))
+                group_passed &= ~failed
+                check[failed] = False
+            np.maximum(rank, np.where(failed, severity_rank, -1), out=rank)
+
+            not_evaluated = unseen & ~has_value
+            if not_evaluated.any():
+                check[not_evaluated] = "NOT_EVALUATED"
+                rank[not_evaluated] = _NOT_EVALUATED
+                if self.fail_on_not_evaluated:
+                    group_passed &= ~not_evaluated
+                self.not_evaluated_count += not_evaluated
+                logging.warning(
+                    "Criteria field %s.%s was not evaluated for %d sample(s) because the "
+                    "parsed %s output did not contain that metric.",
+                    criterion.software,
+                    criterion.name,
+                    int(not_evaluated.sum()),
+                    software,
+                    extra=event(
+                        criterion.software,
+                        criterion.name,
+                        "not evaluated",
+                        count=int(not_evaluated.sum()),
+                    ),
+                )
+        return group_passed
+
+    def finish(self, species_checks_available):
+        result = {}
+        for column, check in self.check_state.items():
+            status_column = column[: -len(".check")] + ".status"
+            rank = self.status_rank[column]
+            status = np.full(self.size, np.nan, dtype=object)
+            evaluated = rank >= 0
+            status[evaluated] = _STATUS_NAMES[rank[evaluated]]
+            result[column] = check
+            result[status_column] = status
+        result.update(self.columns)
+        failures = self.failure_count > 0
+        if self.fail_on_not_evaluated:
+            failures |= self.not_evaluated_count > 0
+        result["all_checks_passed"] = self.all_passed
+        result["speccheck_baseline_checks_passed"] = self.baseline_passed
+        result["speccheck_species_checks_passed"] = (
+            self.species_passed
+            if species_checks_available
+            else np.full(self.size, "NOT_AVAILABLE", dtype=object)
+        )
+        result["speccheck_species_checks_available"] = species_checks_available
+        result["speccheck_warning_count"] = self.warning_count
+        result["speccheck_failure_count"] = self.failure_count
+        result["speccheck_warning_reasons"] = self._join_reasons(self.warning_reasons)
+        result["speccheck_failure_reasons"] = self._join_reasons(self.failure_reasons)
+        result["speccheck_overall_status"] = np.where(
+            failures, "FAIL", np.where(self.warning_count > 0, "WARN", "PASS")
+        )
+        result["speccheck_not_evaluated_count"] = self.not_evaluated_count
+        evaluated = pd.DataFrame(result, index=self.frame.index)
+        return pd.concat([self.frame, evaluated], axis=1)
+
+    def _join_reasons(self, reasons):
+        """Join reasons per sample, building each distinct combination once."""
+        if not reasons:
+            return np.full(self.size, "none", dtype=object)
+        failed = np.packbits(
+            np.column_stack([mask for _reason, mask, _software in reasons]), axis=1
+        )
+        # View each sample's packed bit pattern as one opaque value for hashing.
+        keys = np.ascontiguousarray(failed).view(np.dtype((np.void, failed.shape[1]))).ravel()
+        pattern_codes, patterns = pd.factorize(keys)
+        order_codes, orders = self._software_orders()
+        codes, combinations = pd.factorize(pattern_codes * len(orders) + order_codes)
+        texts = np.empty(len(combinations), dtype=object)
+        for position, combination in enumerate(combinations):
+            pattern = patterns[combination // len(orders)]
+            order = orders[combination % len(orders)]
+            bits = np.unpackbits(np.frombuffer(pattern, dtype=np.uint8))[: len(reasons)]
+            selected = [entry for entry, bit in zip(reasons, bits, strict=True) if bit]
+            if order is not None:
+                rank = {software: index for index, software in enumerate(order)}
+                selected.sort(key=lambda entry: rank.get(entry[2], len(rank)))
+            texts[position] = "; ".join(reason for reason, _mask, _software in selected) or "none"
+        return texts[codes]
+
+    def _software_orders(self):
+        if self.software_order is None:
+            return np.zeros(self.size, dtype=np.int64), [None]
+        index = {}
+        codes = np.fromiter(
+            (index.setdefault(tuple(entry), len(index)) for entry in self.software_order),
+            dtype=np.int64,
+            count=self.size,
+        )
+        return codes, list(index)
+
+
+def _compare(operator, values, threshold):
+    if operator in {"=", "=="}:
+        return values == threshold
+    if operator == "!=":
+        return values != threshold
+    if operator == "<":
+        return values < threshold
+    if operator == "<=":
+        return values <= threshold
+    if operator == ">":
+        return values > threshold
+    if operator == ">=":
+        return values >= threshold
+    raise ValueError(f"Unsupported operator: {operator}")
+
+
+def _coerce_numeric(value):
+    """Mirror the per-sample string-to-number coercion for one value."""
+    if not isinstance(value, str):
+        return value
+    stripped = value.strip()
+    try:
+        if "." in stripped or "e" in stripped.lower():
+            return float(stripped)
+        return int(stripped)
+    except ValueError:
+        return np.nan
@@ -0,0 +1,133 @@
+"""Aggregated logging for large batches.
+
+Collecting a sample logs every detected input file, every failed criterion
+and every metric that could not be evaluated. That is useful for one sample
+and costly for fifty thousand: most of the time goes into rendering lines
+nobody reads. Such per-sample events are logged with ``extra=event(...)``,
+which tags them with a ``(software, field, reason)`` key.
+
+In batch mode (``speccheck --batch-logs``) every record is handed to a
+``QueueHandler`` and processed on a background thread. There, tagged events
+are only counted, and the terminal receives untagged warnings and errors
+plus a summary of the most frequent events every ``SUMMARY_INTERVAL``
+seconds and of all events when the run ends. The full detail, at the
+configured level, goes to the ``--log-file`` if one is given.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import time
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+
+EVENT_ATTRIBUTE = "speccheck_event"
+EVENT_COUNT_ATTRIBUTE = "speccheck_event_count"
+SUMMARY_INTERVAL = 30.0
+PERIODIC_TOP_EVENTS = 5
+FINAL_TOP_EVENTS = 20
+
+_ACTIVE: tuple[QueueHandler, QueueListener, EventAggregator] | None = None
+
+
+def event(software, field, reason, count=1):
+    """Return the ``extra`` mapping that tags a log call as an aggregatable event.
+
+    ``count`` is the number of samples the record stands for.
+    """
+    return {EVENT_ATTRIBUTE: (software, field, reason), EVENT_COUNT_ATTRIBUTE: count}
+
+
+class EventAggregator(logging.Handler):
+    """Count tagged events and pass everything else at WARNING or above to ``target``."""
+
+    def __init__(self, target, interval=SUMMARY_INTERVAL):
+        super().__init__()
+        self.target = target
+        self.interval = interval
+        self.totals = Counter()
+        self.recent = Counter()
+        self._last_summary = time.monotonic()
+
+    def emit(self, record):
+        key = getattr(record, EVENT_ATTRIBUTE, None)
+        if key is None:
+            if record.levelno >= logging.WARNING:
+                self.target.handle(record)
+        else:
+            count = getattr(record, EVENT_COUNT_ATTRIBUTE, 1)
+            self.totals[key] += count
+            self.recent[key] += count
+        if time.monotonic() - self._last_summary >= self.interval:
+            self.summarize()
+
+    def summarize(self, final=False):
+        """Log the events counted since the last summary, or all of them when ``final``."""
+        counts = self.totals if final else self.recent
+        if counts:
+            top = FINAL_TOP_EVENTS if final else PERIODIC_TOP_EVENTS
+            period = "Run total" if final else f"Last {time.monotonic() - self._last_summary:.0f}s"
+            described = "; ".join(
+                f"{_describe(key)} x{count}" for key, count in counts.most_common(top)
+            )
+            message = f"{period}: {sum(counts.values())} event(s): {described}"
+            if len(counts) > top:
+                message += f"; {len(counts) - top} more kind(s) in the log file"
+            self.target.handle(
+                logging.makeLogRecord(
+                    {
+                        "name": "speccheck.batch",
+                        "levelno": logging.INFO,
+                        "levelname": "INFO",
+                        "msg": message,
+                    }
+                )
+            )
+        self.recent.clear()
+        self._last_summary = time.monotonic()
+
+
+def start_batch_logging(terminal_handler, file_handler=None, interval=SUMMARY_INTERVAL):
+    """Route root logging through a queue to an ``EventAggregator`` and ``file_handler``.
+
+    Returns the ``QueueHandler`` to install on the root logger. Any batch
+    logging started earlier is stopped first.
+    """
+    stop_batch_logging()
+    global _ACTIVE
+    records = queue.SimpleQueue()
+    aggregator = EventAggregator(terminal_handler, interval=interval)
+    handlers = [aggregator] if file_handler is None else [aggregator, file_handler]
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    queue_handler = QueueHandler(records)
+    # Only merge arguments into the message; the receiving handlers format.
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    _ACTIVE = (queue_handler, listener, aggregator)
+    return queue_handler
+
+
+def stop_batch_logging():
+    """Drain the queue and log the final event summary, if batch logging is active.
+
+    Handlers that were fed by the queue are attached to the root logger
+    directly, so later records are still written.
+    """
+    global _ACTIVE
+    if _ACTIVE is None:
+        return
+    queue_handler, listener, aggregator = _ACTIVE
+    _ACTIVE = None
+    listener.stop()
+    aggregator.summarize(final=True)
+    root = logging.getLogger()
+    if queue_handler in root.handlers:
+        root.removeHandler(queue_handler)
+        for handler in (aggregator.target, *listener.handlers[1:]):
+            root.addHandler(handler)
+
+
+def _describe(key):
+    software, field, reason = key
+    return f"{software}.{field}: {reason}" if field else f"{software}: {reason}"
@@ -9,26 +9,43 @@ Commands:
 
 Usage:
     speccheck collect [OPTIONS] FILEPATHS...
+    speccheck collect --stream [OPTIONS] < specs.ndjson
+    speccheck collect-batch [OPTIONS] SAMPLESHEET OUTPUT_DIR
+    speccheck collect-worker [OPTIONS] OUTPUT_TREE OUTPUT_DIR
+    speccheck serve --socket PATH [OPTIONS]
+    speccheck submit --socket PATH [OPTIONS] FILEPATHS...
+    speccheck recheck [OPTIONS] INPUT_DIR OUTPUT_DIR
     speccheck summary [OPTIONS] DIRECTORY
+    speccheck run [OPTIONS] OUTPUT_TREE
+    speccheck compact [OPTIONS] DIRECTORY
     speccheck check [OPTIONS]
 """
 
+import json
 import logging
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
 
 import typer
 from rich.console import Console
 from rich.logging import RichHandler
-from rich.table import Table
 
 from speccheck import __version__
-from speccheck.config import get_default_criteria_path
+from speccheck.archive import compact as compact_func
+from speccheck.batch_logging import start_batch_logging, stop_batch_logging
+from speccheck.config import get_default_criteria_path, get_default_template_path
+from speccheck.dispatch import ParserDispatcher
 from speccheck.main import check as check_func
 from speccheck.main import collect as collect_func
+from speccheck.main import collect_batch as collect_batch_func
 from speccheck.main import collect_ghru as collect_ghru_func
-from speccheck.main import summary as summary_func
+from speccheck.main import collect_worker as collect_worker_func
+from speccheck.quarantine import QuarantinedSamplesError
 from speccheck.registry import get_parser_classes
-from speccheck.report import get_default_template_path
+from speccheck.sinks import OUTPUT_FORMATS
 from speccheck.update_criteria import QUALIBACT_DEFAULT_URL
 from speccheck.util import get_all_files
 
@@ -36,13 +53,49 @@ app = typer.Typer(help="Process QC reports for genomic data")
 console = Console()
 
 
-def configure_logging(*, verbose=False, quiet=False, log_file=None):
-    """Configure concise terminal logs and an optional plain-text audit log."""
+# Workflows below import pandas, numpy or plotly; load them only when their
+# command runs so single-sample ``collect`` starts quickly.
+def _lazy(module, name):
+    """Return a function that imports ``module`` and calls its ``name`` when first used."""
+
+    def call(*args, **kwargs):
+        from importlib import import_module
+
+        return getattr(import_module(module), name)(*args, **kwargs)
+
+    return call
+
+
+collect_stream_func = _lazy("speccheck.stream_workflow", "collect_stream")
+serve_func = _lazy("speccheck.serve_workflow", "serve")
+send_requests_func = _lazy("speccheck.serve_workflow", "send_requests")
+send_spec_lines_func = _lazy("speccheck.serve_workflow", "send_spec_lines")
+recheck_func = _lazy("speccheck.recheck_workflow", "recheck")
+run_func = _lazy("speccheck.run_workflow", "run")
+summary_func = _lazy("speccheck.summary_workflow", "summary")
+
+
+def configure_logging(*, verbose=False, quiet=False, log_file=None, batch=False):
+    """Configure concise terminal logs and an optional plain-text audit log.
+
+    With ``batch``, per-sample events are counted and summarised on the
+    terminal instead of printed, and all records are handled on a background
+    thread (see ``speccheck.batch_logging``); call ``stop_batch_logging`` when
+    the run ends.
+    """
     level = logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO
     handlers = [RichHandler(console=console, show_time=True, show_level=True, show_path=False)]
     if log_file:
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
         handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    stop_batch_logging()
+    if batch:
+        formatter = logging.Formatter(
+            "%(asctime)s %(levelname)s %(message)s", datefmt="%Y-%m-%dT%H:%M:%S"
+        )
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        handlers = [start_batch_logging(*handlers)]
     logging.basicConfig(
         level=level,
         format="%(asctime)s %(levelname)s %(message)s",
@@ -61,6 +114,7 @@ def version_callback(value: bool):
 
 @app.callback()
 def main_callback(
+    ctx: typer.Context,
     version: bool = typer.Option(
         False,
         "--version",
@@ -73,6 +127,11 @@ def main_callback(
     log_file: str | None = typer.Option(
         None, "--log-file", help="Also write a timestamped plain-text run log"
     ),
+    batch_logs: bool = typer.Option(
+        False,
+        "--batch-logs",
+        help="Summarise per-sample log events periodically; full detail goes to --log-file",
+    ),
 ):
     """
     Process QC reports for genomic data.
@@ -81,12 +140,14 @@ def main_callback(
     """
     if verbose and quiet:
         raise typer.BadParameter("--verbose and --quiet cannot be used together")
-    configure_logging(verbose=verbose, quiet=quiet, log_file=log_file)
+    configure_logging(verbose=verbose, quiet=quiet, log_file=log_file, batch=batch_logs)
+    if batch_logs:
+        ctx.call_on_close(stop_batch_logging)
 
 
 @app.command()
 def collect(
-    filepaths: list[str] = typer.Argument(..., help="File paths with wildcards"),
+    filepaths: list[str] | None = typer.Argument(None, help="File paths with wildcards"),
     organism: str | None = typer.Option(
         None,
         "--organism",
@@ -123,6 +184,23 @@ def collect(
         "--fail-on-not-evaluated/--no-fail-on-not-evaluated",
         help="Treat missing expected metrics as failed parser/sample checks",
     ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Read NDJSON sample specs from stdin and write NDJSON results to stdout",
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        min=1,
+        help="Worker processes used to evaluate streamed samples",
+    ),
+    max_in_flight: int | None = typer.Option(
+        None,
+        "--max-in-flight",
+        min=1,
+        help="Most streamed samples evaluated ahead of output (default: 2 x workers)",
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
     version: bool = typer.Option(
         False,
@@ -136,6 +214,32 @@ def collect(
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    if stream:
+        if filepaths:
+            raise typer.BadParameter("File paths cannot be combined with --stream.")
+        # Results own stdout; keep log lines on stderr.
+        console.stderr = True
+        try:
+            _, failed = collect_stream_func(
+                sys.stdin,
+                sys.stdout,
+                criteria_file,
+                metadata,
+                allow_unknown_organism=allow_unknown_organism,
+                fail_on_not_evaluated=fail_on_not_evaluated,
+                assembly_type=assembly_type,
+                organism=organism,
+                workers=workers,
+                max_in_flight=max_in_flight,
+            )
+        finally:
+            console.stderr = False
+        if failed:
+            raise typer.Exit(code=1)
+        return
+    if not filepaths:
+        raise typer.BadParameter("Provide file paths to collect, or use --stream.")
+
     collect_func(
         organism,
         filepaths,
@@ -149,6 +253,143 @@ def collect(
     )
 
 
+@app.command("collect-batch")
+def collect_batch(
+    samplesheet: str = typer.Argument(
+        ..., help="CSV/TSV with sample_id, files, and optional assembly_type and organism"
+    ),
+    output_dir: str = typer.Argument(..., help="Directory for per-sample collected CSVs"),
+    organism: str | None = typer.Option(
+        None,
+        "--organism",
+        help="Organism for rows without one. If not given, inferred from parser outputs.",
+    ),
+    criteria_file: str = typer.Option(
+        get_default_criteria_path(),
+        "--criteria-file",
+        help="File with criteria for processing",
+    ),
+    metadata: str | None = typer.Option(
+        None,
+        "--metadata",
+        help="CSV file with additional sample metadata (must have sample_id column)",
+    ),
+    assembly_type: str = typer.Option(
+        "short",
+        "--assembly-type",
+        help="Criteria assembly mode for rows without one: all, short, long, or hybrid",
+    ),
+    allow_unknown_organism: bool = typer.Option(
+        False,
+        "--allow-unknown-organism",
+        help="Allow fallback criteria when organism cannot be inferred from parser outputs",
+    ),
+    fail_on_not_evaluated: bool = typer.Option(
+        False,
+        "--fail-on-not-evaluated/--no-fail-on-not-evaluated",
+        help="Treat missing expected metrics as failed parser/sample checks",
+    ),
+    output_format: str = typer.Option(
+        "csv",
+        "--output-format",
+        help="Per-sample CSVs (csv) or one batch results file: jsonl, parquet or sqlite",
+    ),
+    shards: int = typer.Option(
+        1,
+        "--shards",
+        min=1,
+        help="Split jsonl/parquet/sqlite results across this many files by sample ID",
+    ),
+    continue_on_error: bool = typer.Option(
+        False,
+        "--continue-on-error",
+        help="Quarantine failing samples and collect the rest; exits 1 if any sample failed",
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
+    version: bool = typer.Option(
+        False,
+        "--version",
+        callback=version_callback,
+        is_eager=True,
+        help="Show version and exit",
+    ),
+):
+    """Collect every sample in a samplesheet in one process."""
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    _check_output_format(output_format)
+
+    with _quarantine_exit():
+        collect_batch_func(
+            samplesheet,
+            output_dir,
+            criteria_file,
+            metadata,
+            allow_unknown_organism=allow_unknown_organism,
+            fail_on_not_evaluated=fail_on_not_evaluated,
+            assembly_type=assembly_type,
+            organism=organism,
+            output_format=output_format,
+            shards=shards,
+            continue_on_error=continue_on_error,
+        )
+
+
+@app.command()
+def recheck(
+    input_dir: str = typer.Argument(
+        ..., help="Directory with detailed.*.csv files from collect, or a compacted archive"
+    ),
+    output_dir: str = typer.Argument(..., help="Directory for re-evaluated per-sample CSVs"),
+    criteria_file: str = typer.Option(
+        get_default_criteria_path(),
+        "--criteria-file",
+        help="File with criteria for processing",
+    ),
+    organism: str | None = typer.Option(
+        None,
+        "--organism",
+        help="Organism for all samples. If not given, inferred from stored parser values.",
+    ),
+    metadata: str | None = typer.Option(
+        None,
+        "--metadata",
+        help="CSV file with sample metadata to use instead of the stored metadata columns",
+    ),
+    allow_unknown_organism: bool = typer.Option(
+        False,
+        "--allow-unknown-organism",
+        help="Allow fallback criteria when organism cannot be inferred from parser outputs",
+    ),
+    fail_on_not_evaluated: bool | None = typer.Option(
+        None,
+        "--fail-on-not-evaluated/--no-fail-on-not-evaluated",
+        help="Treat missing expected metrics as failed checks (default: as originally collected)",
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
+    version: bool = typer.Option(
+        False,
+        "--version",
+        callback=version_callback,
+        is_eager=True,
+        help="Show version and exit",
+    ),
+):
+    """Re-evaluate collected samples against new criteria without reparsing inputs."""
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    recheck_func(
+        input_dir,
+        output_dir,
+        criteria_file,
+        organism=organism,
+        metadata_file=metadata,
+        allow_unknown_organism=allow_unknown_organism,
+        fail_on_not_evaluated=fail_on_not_evaluated,
+    )
+
+
 @app.command()
 def summary(
     directory: str = typer.Argument(..., help="Directory with reports"),
@@ -256,6 +497,59 @@ def collect_pipeline(
         "--fail-on-not-evaluated/--no-fail-on-not-evaluated",
         help="Treat missing expected metrics as failed parser/sample checks",
     ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        min=1,
+        help="Number of worker processes used to collect samples in parallel",
+    ),
+    io_threads: int = typer.Option(
+        0,
+        "--io-threads",
+        min=0,
+        help="Read inputs with this many threads ahead of evaluation (0 reads them in turn)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Skip samples whose inputs, criteria and options are unchanged since the last run",
+    ),
+    hash_inputs: bool = typer.Option(
+        False,
+        "--hash-inputs",
+        help="Fingerprint input files by content hash instead of size and modification time",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Skip samples already finished by an interrupted run into the same output directory",
+    ),
+    shard: str | None = typer.Option(
+        None,
+        "--shard",
+        help="Collect only slice INDEX/COUNT (0-based) of the samples, split by sample ID hash",
+    ),
+    discovery_cache: str | None = typer.Option(
+        None,
+        "--discovery-cache",
+        help="JSON file that caches output-tree discovery for jobs sharing one tree",
+    ),
+    output_format: str = typer.Option(
+        "csv",
+        "--output-format",
+        help="Per-sample CSVs (csv) or one batch results file: jsonl, parquet or sqlite",
+    ),
+    shards: int = typer.Option(
+        1,
+        "--shards",
+        min=1,
+        help="Split jsonl/parquet/sqlite results across this many files by sample ID",
+    ),
+    continue_on_error: bool = typer.Option(
+        False,
+        "--continue-on-error",
+        help="Quarantine failing samples and collect the rest; exits 1 if any sample failed",
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
     version: bool = typer.Option(
         False,
@@ -268,6 +562,7 @@ def collect_pipeline(
     """Collect per-sample QC CSVs from a recognised pipeline output layout."""
     if layout != "ghru":
         raise typer.BadParameter("Only --layout ghru is currently supported.")
+    _check_output_format(output_format)
     _collect_pipeline_outputs(
         output_tree,
         output_dir,
@@ -278,6 +573,16 @@ def collect_pipeline(
         fail_on_not_evaluated=fail_on_not_evaluated,
         work_dir=work_dir,
         sample=sample,
+        workers=workers,
+        incremental=incremental,
+        hash_inputs=hash_inputs,
+        resume=resume,
+        output_format=output_format,
+        shards=shards,
+        continue_on_error=continue_on_error,
+        shard=_parse_shard(shard),
+        discovery_cache=discovery_cache,
+        io_threads=io_threads,
         verbose=verbose,
     )
 
@@ -293,22 +598,446 @@ def _collect_pipeline_outputs(
     fail_on_not_evaluated,
     work_dir,
     sample,
+    workers=1,
+    incremental=False,
+    hash_inputs=False,
+    resume=False,
+    output_format="csv",
+    shards=1,
+    continue_on_error=False,
+    shard=None,
+    discovery_cache=None,
+    io_threads=0,
     verbose=False,
 ):
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    collect_ghru_func(
-        output_tree,
-        output_dir,
-        criteria_file,
-        organism=organism,
-        metadata_file=metadata,
-        allow_unknown_organism=allow_unknown_organism,
-        fail_on_not_evaluated=fail_on_not_evaluated,
-        work_dir=work_dir,
-        sample_ids=sample,
-    )
+    with _quarantine_exit():
+        collect_ghru_func(
+            output_tree,
+            output_dir,
+            criteria_file,
+            organism=organism,
+            metadata_file=metadata,
+            allow_unknown_organism=allow_unknown_organism,
+            fail_on_not_evaluated=fail_on_not_evaluated,
+            work_dir=work_dir,
+            sample_ids=sample,
+            workers=workers,
+            incremental=incremental,
+            hash_inputs=hash_inputs,
+            resume=resume,
+            output_format=output_format,
+            shards=shards,
+            continue_on_error=continue_on_error,
+            shard=shard,
+            discovery_cache=discovery_cache,
+            io_threads=io_threads,
+        )
+
+
+def _parse_shard(text):
+    if text is None:
+        return None
+    index, _, count = text.partition("/")
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        raise typer.BadParameter("--shard must look like INDEX/COUNT, for example 0/8") from None
+    if not 0 <= shard[0] < shard[1]:
+        raise typer.BadParameter("--shard INDEX must be at least 0 and less than COUNT")
+    return shard
+
+
+@app.command("run")
+def run_command(
+    output_tree: str = typer.Argument(..., help="Pipeline output directory"),
+    output: str = typer.Option("qc_report", "--output", help="Output folder for the reports"),
+    layout: str = typer.Option(
+        "ghru",
+        "--layout",
+        help="Published pipeline layout to collect. Currently supported: ghru",
+    ),
+    sample: list[str] | None = typer.Option(
+        None,
+        "--sample",
+        help="Optional sample name(s) to restrict collection",
+    ),
+    organism: str | None = typer.Option(
+        None,
+        "--organism",
+        help="Optional organism override for all selected samples",
+    ),
+    criteria_file: str = typer.Option(
+        get_default_criteria_path(),
+        "--criteria-file",
+        help="File with criteria for processing",
+    ),
+    metadata: str | None = typer.Option(
+        None,
+        "--metadata",
+        help="CSV file with additional sample metadata (must have sample_id column)",
+    ),
+    work_dir: str | None = typer.Option(
+        None,
+        "--work-dir",
+        help="Optional Nextflow work directory to search for unpublished files",
+    ),
+    allow_unknown_organism: bool = typer.Option(
+        False,
+        "--allow-unknown-organism",
+        help="Allow fallback criteria when organism cannot be inferred from parser outputs",
+    ),
+    fail_on_not_evaluated: bool = typer.Option(
+        False,
+        "--fail-on-not-evaluated/--no-fail-on-not-evaluated",
+        help="Treat missing expected metrics as failed parser/sample checks",
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        min=1,
+        help="Number of worker processes used to collect samples in parallel",
+    ),
+    io_threads: int = typer.Option(
+        0,
+        "--io-threads",
+        min=0,
+        help="Read inputs with this many threads ahead of evaluation (0 reads them in turn)",
+    ),
+    discovery_cache: str | None = typer.Option(
+        None,
+        "--discovery-cache",
+        help="JSON file that caches output-tree discovery for jobs sharing one tree",
+    ),
+    continue_on_error: bool = typer.Option(
+        False,
+        "--continue-on-error",
+        help="Leave failing samples out of the reports; exits 1 if any sample failed",
+    ),
+    species: str = typer.Option("Speciator.speciesName", "--species", help="Field for species"),
+    templates: str = typer.Option(
+        get_default_template_path(), "--templates", help="Template HTML file"
+    ),
+    plot: bool = typer.Option(False, "--plot", help="Enable plotting"),
+    xlsx_output: str | None = typer.Option(
+        None,
+        "--xlsx-output",
+        help="Optional XLSX workbook path for merged summary output",
+    ),
+    interactive_tables: bool = typer.Option(
+        True,
+        "--interactive-tables/--no-interactive-tables",
+        help="Enable sortable and filterable report tables",
+    ),
+    qualifyr_style: bool = typer.Option(
+        False,
+        "--qualifyr-style/--no-qualifyr-style",
+        help="Render compact built-in summary tables in a qualifyr-like layout",
+    ),
+    qualibact_compat: bool = typer.Option(
+        False,
+        "--qualibact-compat/--no-qualibact-compat",
+        help="Add pinned QualiBact E. coli v1 PASS/WARN/FAIL compatibility columns",
+    ),
+    qualibact_warn_as_fail: bool = typer.Option(
+        False,
+        "--qualibact-warn-as-fail",
+        help="Treat QualiBact WARN tier as failing in all_checks_passed when compatibility mode is enabled",
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
+    version: bool = typer.Option(
+        False,
+        "--version",
+        callback=version_callback,
+        is_eager=True,
+        help="Show version and exit",
+    ),
+):
+    """Collect a pipeline output tree and write the summary reports without per-sample CSVs."""
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if layout != "ghru":
+        raise typer.BadParameter("Only --layout ghru is currently supported.")
+    with _quarantine_exit():
+        run_func(
+            output_tree,
+            output,
+            criteria_file,
+            templates,
+            organism=organism,
+            metadata_file=metadata,
+            allow_unknown_organism=allow_unknown_organism,
+            fail_on_not_evaluated=fail_on_not_evaluated,
+            work_dir=work_dir,
+            sample_ids=sample,
+            workers=workers,
+            io_threads=io_threads,
+            continue_on_error=continue_on_error,
+            discovery_cache=discovery_cache,
+            species=species,
+            plot=plot,
+            xlsx_output=xlsx_output,
+            interactive_tables=interactive_tables,
+            qualifyr_style=qualifyr_style,
+            qualibact_compat=qualibact_compat,
+            qualibact_warn_as_fail=qualibact_warn_as_fail,
+        )
+
+
+@app.command("collect-worker")
+def collect_worker(
+    output_tree: str = typer.Argument(..., help="GHRU pipeline output directory"),
+    output_dir: str = typer.Argument(..., help="Directory for per-sample collected CSVs"),
+    queue_dir: str | None = typer.Option(
+        None,
+        "--queue-dir",
+        help="Shared queue directory (default: OUTPUT_DIR/.speccheck_queue)",
+    ),
+    sample: list[str] | None = typer.Option(
+        None,
+        "--sample",
+        help="Optional sample name(s) to queue; used by the worker that fills the queue",
+    ),
+    organism: str | None = typer.Option(
+        None,
+        "--organism",
+        help="Optional organism override for all selected samples",
+    ),
+    criteria_file: str = typer.Option(
+        get_default_criteria_path(),
+        "--criteria-file",
+        help="File with criteria for processing",
+    ),
+    metadata: str | None = typer.Option(
+        None,
+        "--metadata",
+        help="CSV file with additional sample metadata (must have sample_id column)",
+    ),
+    work_dir: str | None = typer.Option(
+        None,
+        "--work-dir",
+        help="Optional Nextflow work directory to search for unpublished files",
+    ),
+    allow_unknown_organism: bool = typer.Option(
+        False,
+        "--allow-unknown-organism",
+        help="Allow fallback criteria when organism cannot be inferred from parser outputs",
+    ),
+    fail_on_not_evaluated: bool = typer.Option(
+        False,
+        "--fail-on-not-evaluated/--no-fail-on-not-evaluated",
+        help="Treat missing expected metrics as failed parser/sample checks",
+    ),
+    discovery_cache: str | None = typer.Option(
+        None,
+        "--discovery-cache",
+        help="JSON file that caches output-tree discovery for jobs sharing one tree",
+    ),
+    worker_id: str | None = typer.Option(
+        None,
+        "--worker-id",
+        help="Name recorded on claims and completion markers (default: HOST-PID)",
+    ),
+    claim_timeout: float = typer.Option(
+        600.0,
+        "--claim-timeout",
+        min=0.001,
+        help="Seconds without a heartbeat after which another worker reclaims a sample",
+    ),
+    poll_interval: float = typer.Option(
+        5.0,
+        "--poll-interval",
+        min=0.001,
+        help="Seconds between queue checks while other workers still hold claims",
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
+    version: bool = typer.Option(
+        False,
+        "--version",
+        callback=version_callback,
+        is_eager=True,
+        help="Show version and exit",
+    ),
+):
+    """Collect GHRU samples claimed from a queue shared by workers on many nodes."""
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    with _quarantine_exit():
+        collect_worker_func(
+            output_tree,
+            output_dir,
+            criteria_file,
+            queue_dir=queue_dir,
+            organism=organism,
+            metadata_file=metadata,
+            allow_unknown_organism=allow_unknown_organism,
+            fail_on_not_evaluated=fail_on_not_evaluated,
+            work_dir=work_dir,
+            sample_ids=sample,
+            discovery_cache=discovery_cache,
+            worker_id=worker_id,
+            claim_timeout=claim_timeout,
+            poll_interval=poll_interval,
+        )
+
+
+@contextmanager
+def _quarantine_exit():
+    """Turn quarantined samples into a logged summary and exit code 1."""
+    try:
+        yield
+    except QuarantinedSamplesError as exc:
+        stages = Counter(failure.stage for failure in exc.failures)
+        logging.error(
+            "%s (by stage: %s)",
+            exc,
+            ", ".join(f"{stage} {count}" for stage, count in sorted(stages.items())),
+        )
+        raise typer.Exit(code=1) from exc
+
+
+def _check_output_format(output_format):
+    if output_format not in OUTPUT_FORMATS:
+        raise typer.BadParameter(f"--output-format must be one of: {', '.join(OUTPUT_FORMATS)}")
+
+
+@app.command()
+def serve(
+    socket_path: str = typer.Option(..., "--socket", help="Unix socket path to listen on"),
+    criteria_file: str = typer.Option(
+        get_default_criteria_path(),
+        "--criteria-file",
+        help="Criteria file, reloaded whenever its content changes",
+    ),
+    metadata: str | None = typer.Option(
+        None,
+        "--metadata",
+        help="CSV file with additional sample metadata (must have sample_id column)",
+    ),
+    organism: str | None = typer.Option(
+        None, "--organism", help="Default organism for requests that do not name one"
+    ),
+    assembly_type: str = typer.Option(
+        "short",
+        "--assembly-type",
+        help="Default assembly type for requests that do not name one",
+    ),
+    allow_unknown_organism: bool = typer.Option(
+        False,
+        "--allow-unknown-organism",
+        help="Allow fallback criteria when organism cannot be inferred from parser outputs",
+    ),
+    fail_on_not_evaluated: bool = typer.Option(
+        False,
+        "--fail-on-not-evaluated/--no-fail-on-not-evaluated",
+        help="Treat missing expected metrics as failed parser/sample checks",
+    ),
+):
+    """Keep criteria loaded and collect samples sent by `speccheck submit`."""
+    try:
+        serve_func(
+            socket_path,
+            criteria_file,
+            metadata,
+            allow_unknown_organism=allow_unknown_organism,
+            fail_on_not_evaluated=fail_on_not_evaluated,
+            assembly_type=assembly_type,
+            organism=organism,
+        )
+    except FileExistsError as exc:
+        raise typer.BadParameter(str(exc)) from None
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def submit(
+    filepaths: list[str] | None = typer.Argument(None, help="File paths with wildcards"),
+    socket_path: str = typer.Option(..., "--socket", help="Socket of a running `speccheck serve`"),
+    sample: str | None = typer.Option(None, "--sample", help="Sample name"),
+    organism: str | None = typer.Option(None, "--organism", help="Organism name"),
+    assembly_type: str | None = typer.Option(
+        None, "--assembly-type", help="Criteria assembly mode: all, short, long, or hybrid"
+    ),
+    output_file: str | None = typer.Option(
+        None,
+        "--output-file",
+        help="Have the server write the sample's CSVs here instead of printing its report",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Forward NDJSON sample specs from stdin and write NDJSON results to stdout",
+    ),
+    command: str | None = typer.Option(
+        None, "--command", help="Send a server command instead: status or shutdown"
+    ),
+):
+    """Collect samples with a running `speccheck serve`."""
+    if command:
+        responses = send_requests_func(socket_path, [{"command": command}])
+    elif stream:
+        if filepaths:
+            raise typer.BadParameter("File paths cannot be combined with --stream.")
+        responses = send_spec_lines_func(socket_path, sys.stdin)
+    else:
+        if not filepaths or not sample:
+            raise typer.BadParameter("Provide --sample and file paths, or use --stream.")
+        request = {
+            "sample_id": sample,
+            "files": [os.path.abspath(path) for path in filepaths],
+            "organism": organism,
+            "assembly_type": assembly_type,
+        }
+        if output_file:
+            request["output_file"] = os.path.abspath(output_file)
+        responses = send_requests_func(socket_path, [request])
+
+    failed = 0
+    # Responses own stdout; keep log lines on stderr.
+    console.stderr = True
+    try:
+        for response in responses:
+            failed += not response["ok"]
+            if output_file and response["ok"]:
+                logging.info("Wrote results for %s to %s", sample, response["output_file"])
+                continue
+            if not response["ok"]:
+                logging.error(
+                    "%s: %s", response.get("sample_id") or command or "spec", response["error"]
+                )
+            sys.stdout.write(json.dumps(response) + "\n")
+    except (ConnectionRefusedError, FileNotFoundError):
+        raise typer.BadParameter(f"No speccheck server is listening on {socket_path}") from None
+    except ConnectionError as exc:
+        logging.error("%s", exc)
+        raise typer.Exit(code=1) from None
+    finally:
+        console.stderr = False
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def compact(
+    directory: str = typer.Argument(..., help="Directory with collected per-sample CSVs"),
+    archive: str | None = typer.Option(
+        None,
+        "--archive",
+        help="Archive path (default: DIRECTORY/speccheck_collected.zip)",
+    ),
+    remove: bool = typer.Option(
+        False, "--remove", help="Delete the packed CSVs once the archive is verified"
+    ),
+):
+    """Pack collected per-sample CSVs into one indexed archive."""
+    try:
+        compact_func(directory, archive, remove=remove)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from None
 
 
 @app.command()
@@ -342,6 +1071,8 @@ def check(
 @app.command("modules")
 def modules_command():
     """List input formats available in this installation."""
+    from rich.table import Table
+
     table = Table(title="Supported input modules")
     table.add_column("Software", style="cyan", no_wrap=True)
     table.add_column("Accepted input")
@@ -360,16 +1091,18 @@ def inspect_inputs(
     filepaths: list[str] = typer.Argument(..., help="Files or directories to inspect"),
 ):
     """Identify which files Speccheck recognises without writing output."""
+    from rich.table import Table
+
     table = Table(title="Input inspection")
     table.add_column("File")
     table.add_column("Detected module", style="cyan")
     recognised = 0
+    dispatcher = ParserDispatcher(get_parser_classes())
     for file_path in get_all_files(filepaths):
-        detected = []
-        for parser_class in get_parser_classes():
-            parser = parser_class(file_path)
-            if parser.has_valid_filename and parser.has_valid_fileformat:
-                detected.append(parser.software_name or parser.__class__.__name__)
+        detected = [
+            parser.software_name or parser.__class__.__name__
+            for parser in dispatcher.match(file_path)
+        ]
         if detected:
             recognised += 1
         table.add_row(file_path, ", ".join(detected) or "not recognised")
@@ -1,31 +1,45 @@
 import csv
 import logging
-import operator as op_from_module
 import os
-import re
 from collections.abc import Iterable
 
+from speccheck.atomic import atomic_write
+from speccheck.batch_logging import event
+from speccheck.dispatch import ParserDispatcher
+from speccheck.evaluation import compile_criterion
+from speccheck.modules.base import Parser
 
-def collect_files(all_files, module_list):
-    # Execute checks for each file using discovered modules
+
+def collect_files(all_files, module_list, contents=None):
+    # Execute checks for each file using discovered modules. ``contents`` maps
+    # file names to in-memory bytes that are parsed instead of reading disk.
+    contents = contents or {}
     recovered_values = {}
     recovered_sources = {}
+    dispatcher = ParserDispatcher(module_list)
     for filepath in all_files:
         logging.debug("Checking %s", filepath)
-        for module in module_list:
-            current_module = module(filepath)
-            if current_module.has_valid_filename and current_module.has_valid_fileformat:
-                module_name = getattr(current_module, "software_name", module.__name__)
-                logging.info("Detected %-10s %s", module_name, os.path.basename(filepath))
-                if module_name in recovered_values:
-                    previous = recovered_sources[module_name]
-                    raise ValueError(
-                        f"Multiple files matched parser {module_name}: {previous} and {filepath}. "
-                        "Provide one output per parser for each sample, or split samples before collect."
-                    )
-                # Fetch values and criteria
-                recovered_values[module_name] = current_module.fetch_values()
-                recovered_sources[module_name] = filepath
+        for current_module in dispatcher.match(filepath, contents.get(filepath)):
+            module_name = (
+                getattr(current_module, "software_name", None) or type(current_module).__name__
+            )
+            logging.info(
+                "Detected %-10s %s",
+                module_name,
+                os.path.basename(filepath),
+                extra=event(module_name, "", "detected"),
+            )
+            if module_name in recovered_values:
+                previous = recovered_sources[module_name]
+                raise ValueError(
+                    f"Multiple files matched parser {module_name}: {previous} and {filepath}. "
+                    "Provide one output per parser for each sample, or split samples before collect."
+                )
+            # Fetch values and criteria
+            recovered_values[module_name] = current_module.fetch_values()
+            recovered_sources[module_name] = filepath
+            if isinstance(current_module, Parser):
+                current_module.clear_cache()
     if not recovered_values:
         logging.warning("No files passed the checks.")
     return recovered_values
@@ -39,88 +53,8 @@ def criteria_applies_to_software(criteria_software, recovered_software):
 
 
 def check_criteria(field, result):
-    test_result = True
-    software = field["software"]
-
-    # --- Handle DepthParser hybrid output (short + long) ---
-    # Depth.fetch_values returns a dict (single read type) or list (hybrid).
-    if software.startswith("DepthParser"):
-        # Determine which type of read (short or long) to check
-        read_type = None
-        if software.endswith(".short"):
-            read_type = "short"
-        elif software.endswith(".long"):
-            read_type = "long"
-
-        # If it's hybrid (list), pick the matching read type
-        if isinstance(result, list):
-            matched = next(
-                (entry for entry in result if entry.get("Read_type", "").lower() == read_type), None
-            )
-            if not matched:
-                logging.warning("No matching read type (%s) found for DepthParser", read_type)
-                return False
-            field_value = matched[field["field"]]
-        else:
-            # Single short or long file
-            if read_type and result.get("Read_type", "").lower() != read_type:
-                logging.warning("Depth row read type does not match criteria type (%s)", read_type)
-                return False
-            field_value = result[field["field"]]
-    else:
-        field_value = result[field["field"]]
-
-    if field["operator"] == "regex":
-        if not re.match(field["value"], str(field_value)):
-            logging.warning(
-                "Failed check for %s: %s does not match regex %s",
-                field["software"],
-                field["field"],
-                field["value"],
-            )
-            test_result = False
-    else:
-        operator = field["operator"]
-        criteria_value = field["value"]
-        comparable_field_value = field_value
-
-        if isinstance(criteria_value, (int, float)) and isinstance(field_value, str):
-            stripped = field_value.strip()
-            try:
-                if "." in stripped or "e" in stripped.lower():
-                    comparable_field_value = float(stripped)
-                else:
-                    comparable_field_value = int(stripped)
-            except ValueError:
-                logging.warning(
-                    "Failed check for %s: %s value %r is not a numeric scalar for operator %s",
-                    field["software"],
-                    field["field"],
-                    field_value,
-                    field["operator"],
-                )
-                return False
-
-        if operator == "=":
-            operator = "=="
-        ops = {
-            "==": op_from_module.eq,
-            "!=": op_from_module.ne,
-            "<": op_from_module.lt,
-            "<=": op_from_module.le,
-            ">": op_from_module.gt,
-            ">=": op_from_module.ge,
-        }
-        if not ops[operator](comparable_field_value, criteria_value):
-            logging.warning(
-                "Failed check for %s: %s %s %s",
-                field["software"],
-                field["field"],
-                field["operator"],
-                field["value"],
-            )
-            test_result = False
-    return test_result
+    """Return whether one criteria row passes for a parser result."""
+    return compile_criterion(field).check(result)
 
 
 def _extract_accessions_from_genome_paths(raw: str | Iterable[str] | None):
@@ -161,6 +95,132 @@ def _extract_accessions_from_genome_paths(raw: str | Iterable[str] | None):
     return ";".join(cleaned)
 
 
+# Columns required in concise output and their explicit order
+CONCISE_COLUMNS = (
+    "sample_id",
+    "all_checks_passed",
+    "Speciator.all_checks_passed",
+    "Speciator.speciesName",
+    "Speciator.confidence",
+    "Depth.all_checks_passed",
+    "Depth.Depth",
+    "Depth.Read_type",
+    "Sylph.all_checks_passed",
+    "Sylph.top_species",
+    "Sylph.top_taxonomic_abundance",
+    "Sylph.top_adjusted_ani",
+    "Sylph.number_of_genomes",
+    "Sylph.species_name",
+    "Sylph.taxonomic_abundances",
+    "Quast.all_checks_passed",
+    "Quast.# contigs (>= 0 bp).check",
+    "Quast.# contigs (>= 0 bp)",
+    "Quast.# contigs",
+    "Quast.N50.check",
+    "Quast.N50",
+    "Quast.Total length (>= 0 bp).check",
+    "Quast.Total length (>= 0 bp)",
+    "Quast.Total length",
+    "Quast.GC (%).check",
+    "Quast.GC (%)",
+    "Quast.Largest contig",
+    "Checkm.all_checks_passed",
+    "Checkm.Completeness.check",
+    "Checkm.Completeness",
+    "Checkm.Contamination.check",
+    "Checkm.Contamination",
+    "Checkm.GC_Content",
+    "Checkm.Genome_Size",
+    "Checkm.Contig_N50",
+    "Checkm.Total_Contigs",
+    "Checkm.Total_Coding_Sequences",
+    "Checkm.GC",
+    "Checkm.Genome size (bp)",
+    "Checkm.N50 (scaffolds)",
+    "Checkm.# contigs",
+    "Sylph.genomes",
+)
+_CONCISE_COLUMN_SET = frozenset(CONCISE_COLUMNS)
+
+
+def format_cell(key, val):
+    """
+    Convert only QC result fields (*.all_checks_passed, *.check)
+    into PASSED / FAILED. Leave all other values unchanged.
+    """
+    if val is None:
+        return ""
+
+    key_is_status = key.endswith("all_checks_passed") or key.endswith(".check")
+
+    # Convert only the QC result fields
+    if key_is_status:
+        if isinstance(val, bool):
+            return "PASSED" if val else "FAILED"
+        if isinstance(val, str) and val.lower() in ("true", "false"):
+            return "PASSED" if val.lower() == "true" else "FAILED"
+
+    # Default behaviour for everything else
+    return str(val)
+
+
+def detailed_row(qc_report):
+    """Return the formatted detailed CSV row: IDs, pass flags, checks, then values."""
+    sample_id_cols = [key for key in qc_report if key in ("Sample", "sample_id")]
+    all_checks_passed_cols = sorted(key for key in qc_report if key.endswith("all_checks_passed"))
+    check_cols = sorted(key for key in qc_report if key.endswith(".check"))
+    other_cols = sorted(
+        key
+        for key in qc_report
+        if key not in sample_id_cols
+        and not key.endswith("all_checks_passed")
+        and not key.endswith(".check")
+    )
+    return {
+        key: format_cell(key, qc_report.get(key, ""))
+        for key in (*sample_id_cols, *all_checks_passed_cols, *check_cols, *other_cols)
+    }
+
+
+def concise_row(qc_report):
+    """Return the formatted concise CSV row for a full QC report, in column order."""
+    extra_check_columns = sorted(
+        key for key in qc_report if key.endswith(".check") and key not in _CONCISE_COLUMN_SET
+    )
+    metadata_columns = sorted(
+        key
+        for key in qc_report
+        if key not in _CONCISE_COLUMN_SET
+        and key not in {"Sample", "sample_id", "all_checks_passed"}
+        and "." not in key
+    )
+    return {
+        column: format_cell(column, qc_report.get(column, ""))
+        for column in (*CONCISE_COLUMNS, *extra_check_columns, *metadata_columns)
+    }
+
+
+def sanitize_report(qc_report):
+    """Return the report values as written to output, without mutating the caller's dict.
+
+    ``Sylph.genomes`` is reduced to accession IDs.
+    """
+    if "Sylph.genomes" not in qc_report:
+        return qc_report
+    qc_report = dict(qc_report)
+    qc_report["Sylph.genomes"] = _extract_accessions_from_genome_paths(
+        qc_report.get("Sylph.genomes")
+    )
+    return qc_report
+
+
+def detailed_output_path(output_file):
+    """Return the ``detailed.<basename>`` path written next to a concise CSV."""
+    detailed_dir = os.path.dirname(output_file)
+    base = os.path.basename(output_file)
+    return os.path.join(detailed_dir, f"detailed.{base}") if detailed_dir else f"detailed.{base}"
+
+
 def write_to_file(output_file, qc_report):
     """Write results to CSV.
 
@@ -175,158 +235,30 @@ def write_to_file(output_file, qc_report):
     if os.path.dirname(output_file):
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    def _format_cell(key, val):
-        """
-        Convert only QC result fields (*.all_checks_passed, *.check)
-        into PASSED / FAILED. Leave all other values unchanged.
-        """
-        if val is None:
-            return ""
-
-        key_is_status = key.endswith("all_checks_passed") or key.endswith(".check")
-
-        # Convert only the QC result fields
-        if key_is_status:
-            if isinstance(val, bool):
-                return "PASSED" if val else "FAILED"
-            if isinstance(val, str) and val.lower() in ("true", "false"):
-                return "PASSED" if val.lower() == "true" else "FAILED"
-
-        # Default behaviour for everything else
-        return str(val)
-
-    # Columns required in concise output and their explicit order
-    concise_columns = [
-        "sample_id",
-        "all_checks_passed",
-        "Speciator.all_checks_passed",
-        "Speciator.speciesName",
-        "Speciator.confidence",
-        "Depth.all_checks_passed",
-        "Depth.Depth",
-        "Depth.Read_type",
-        "Sylph.all_checks_passed",
-        "Sylph.top_species",
-        "Sylph.top_taxonomic_abundance",
-        "Sylph.top_adjusted_ani",
-        "Sylph.number_of_genomes",
-        "Sylph.species_name",
-        "Sylph.taxonomic_abundances",
-        "Quast.all_checks_passed",
-        "Quast.# contigs (>= 0 bp).check",
-        "Quast.# contigs (>= 0 bp)",
-        "Quast.# contigs",
-        "Quast.N50.check",
-        "Quast.N50",
-        "Quast.Total length (>= 0 bp).check",
-        "Quast.Total length (>= 0 bp)",
-        "Quast.Total length",
-        "Quast.GC (%).check",
-        "Quast.GC (%)",
-        "Quast.Largest contig",
-        "Checkm.all_checks_passed",
-        "Checkm.Completeness.check",
-        "Checkm.Completeness",
-        "Checkm.Contamination.check",
-        "Checkm.Contamination",
-        "Checkm.GC_Content",
-        "Checkm.Genome_Size",
-        "Checkm.Contig_N50",
-        "Checkm.Total_Contigs",
-        "Checkm.Total_Coding_Sequences",
-        "Checkm.GC",
-        "Checkm.Genome size (bp)",
-        "Checkm.N50 (scaffolds)",
-        "Checkm.# contigs",
-        "Sylph.genomes",
-    ]
-
     # Heuristic: determine if this is a full speccheck QC report
     looks_like_qc = any(
         k.startswith(("Speciator.", "Depth.", "Sylph.", "Quast.", "Checkm.")) for k in qc_report
     ) or ("sample_id" in qc_report and "all_checks_passed" in qc_report)
 
     if looks_like_qc:
-        # Sanitize Sylph.genomes to contain only accession IDs
-        if "Sylph.genomes" in qc_report:
-            qc_report = dict(qc_report)  # shallow copy to avoid mutating caller
-            qc_report["Sylph.genomes"] = _extract_accessions_from_genome_paths(
-                qc_report.get("Sylph.genomes")
-            )
+        qc_report = sanitize_report(qc_report)
         # 1) Write detailed CSV (legacy, all fields) as detailed.<basename>
-        detailed_dir = os.path.dirname(output_file)
-        base = os.path.basename(output_file)
-        detailed_path = (
-            os.path.join(detailed_dir, f"detailed.{base}") if detailed_dir else f"detailed.{base}"
-        )
-
-        sample_id_cols = [k for k in qc_report.keys() if k in ["Sample", "sample_id"]]
-        all_checks_passed_cols = sorted(
-            [k for k in qc_report.keys() if k.endswith("all_checks_passed")]
-        )
-        check_cols = sorted([k for k in qc_report.keys() if k.endswith(".check")])
-        other_cols = sorted(
-            [
-                k
-                for k in qc_report.keys()
-                if k not in sample_id_cols
-                and not k.endswith("all_checks_passed")
-                and not k.endswith(".check")
-            ]
-        )
-        detailed_keys = sample_id_cols + all_checks_passed_cols + check_cols + other_cols
-
-        with open(detailed_path, "w", encoding="utf-8", newline="") as f_det:
-            writer = csv.DictWriter(f_det, fieldnames=detailed_keys)
-            writer.writeheader()
-            writer.writerow(
-                {key: _format_cell(key, qc_report.get(key, "")) for key in detailed_keys}
-            )
+        detailed_path = detailed_output_path(output_file)
+        _write_row(detailed_path, detailed_row(qc_report))
         logging.info("Detailed results written to %s", detailed_path)
 
-        extra_check_columns = sorted(
-            [key for key in qc_report if key.endswith(".check") and key not in concise_columns]
-        )
-        metadata_columns = sorted(
-            [
-                key
-                for key in qc_report
-                if key not in concise_columns
-                and key not in extra_check_columns
-                and key not in {"Sample", "sample_id", "all_checks_passed"}
-                and "." not in key
-            ]
-        )
-        concise_fieldnames = concise_columns + extra_check_columns + metadata_columns
-
         # 2) Write concise CSV with stable QC columns plus sample metadata.
-        with open(output_file, "w", encoding="utf-8", newline="") as f_out:
-            writer = csv.DictWriter(f_out, fieldnames=concise_fieldnames)
-            writer.writeheader()
-            writer.writerow(
-                {col: _format_cell(col, qc_report.get(col, "")) for col in concise_fieldnames}
-            )
+        _write_row(output_file, concise_row(qc_report))
         logging.info("Concise results written to %s", output_file)
         return
 
     # Legacy/simple behavior (e.g., unit tests): keep original, minimal writer
-    sample_id_cols = [k for k in qc_report.keys() if k in ["Sample", "sample_id"]]
-    all_checks_passed_cols = sorted(
-        [k for k in qc_report.keys() if k.endswith("all_checks_passed")]
-    )
-    check_cols = sorted([k for k in qc_report.keys() if k.endswith(".check")])
-    other_cols = sorted(
-        [
-            k
-            for k in qc_report.keys()
-            if k not in sample_id_cols
-            and not k.endswith("all_checks_passed")
-            and not k.endswith(".check")
-        ]
-    )
-    ordered_keys = sample_id_cols + all_checks_passed_cols + check_cols + other_cols
-    with open(output_file, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=ordered_keys)
+    _write_row(output_file, detailed_row(qc_report))
+    logging.info("Results written to %s", output_file)
+
+
+def _write_row(path, row):
+    with atomic_write(path, newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(row))
         writer.writeheader()
-        writer.writerow({key: _format_cell(key, qc_report.get(key, "")) for key in ordered_keys})
-        logging.info("Results written to %s", output_file)
+        writer.writerow(row)
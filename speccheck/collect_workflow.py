@@ -2,30 +2,30 @@
 
 from __future__ import annotations
 
-import hashlib
 import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
 from dataclasses import field as dataclass_field
 
-import pandas as pd
-
 from speccheck import __version__
-from speccheck.collect import (
-    check_criteria,
-    collect_files,
-    criteria_applies_to_software,
-    write_to_file,
-)
-from speccheck.criteria import get_criteria_layers, get_species_field, validate_criteria
-from speccheck.ghru import discover_ghru_sample_files
+from speccheck.batch_logging import event
+from speccheck.collect import collect_files, detailed_output_path, write_to_file
+from speccheck.criteria import get_criteria_layers, load_criteria_store, validate_criteria
+from speccheck.evaluation import EvaluationPlan
+from speccheck.ghru import load_ghru_sample_files
+from speccheck.manifest import CollectJournal, CollectManifest, sample_fingerprint
+from speccheck.metadata import MetadataIndex, load_metadata_index
+from speccheck.quarantine import SampleFailure, collection_stage, raise_for_failures
 from speccheck.registry import add_metric_aliases
+from speccheck.samplesheet import read_samplesheet
+from speccheck.sinks import OUTPUT_FORMATS, ResultSink, shard_for
 from speccheck.update_criteria import get_threshold_source_for_species
 from speccheck.util import get_all_files, load_modules_with_checks
 
 ASSEMBLY_TYPES = frozenset({"all", "short", "long", "hybrid"})
-STATUS_RANK = {"PASS": 0, "WARN": 1, "FAIL": 2, "NOT_EVALUATED": 3}  # nosec B105
 
 
 @dataclass
@@ -34,10 +34,11 @@ class CollectionContext:
 
     criteria_file: str
     criteria_sha256: str
-    metadata: dict
+    metadata: dict | MetadataIndex
     species_fields: list[dict]
     criteria_layers: dict[str, dict] = dataclass_field(default_factory=dict)
     threshold_sources: dict[str, dict] = dataclass_field(default_factory=dict)
+    evaluation_plans: dict[tuple[str, str], EvaluationPlan] = dataclass_field(default_factory=dict)
 
 
 def collect(
@@ -52,40 +53,78 @@ def collect(
     fail_on_not_evaluated=False,
     _context=None,
 ):
-    """Collect parser values, evaluate criteria, and write one sample report."""
+    """Collect parser values, evaluate criteria, and write one sample report.
+
+    Returns ``output_file``, or None when no input file matched a parser and
+    nothing was written.
+    """
+    qc_report = collect_report(
+        organism,
+        input_filepaths,
+        criteria_file,
+        sample_id,
+        metadata_file=metadata_file,
+        allow_unknown_organism=allow_unknown_organism,
+        assembly_type=assembly_type,
+        fail_on_not_evaluated=fail_on_not_evaluated,
+        _context=_context,
+    )
+    if qc_report is None:
+        return None
+    logging.info("Writing results to %s", os.path.abspath(output_file))
+    with collection_stage("write"):
+        write_to_file(output_file, qc_report)
+    logging.info("All checks completed for %s", sample_id)
+    return output_file
+
+
+def collect_report(
+    organism,
+    input_filepaths,
+    criteria_file,
+    sample_id,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    assembly_type="short",
+    fail_on_not_evaluated=False,
+    input_contents=None,
+    _context=None,
+):
+    """Collect parser values and evaluate criteria for one sample.
+
+    ``input_contents`` maps file names to in-memory bytes parsed alongside
+    ``input_filepaths``. Returns the detailed report dict that ``collect``
+    writes, or ``None`` when no input file was recognised.
+    """
     _validate_sample_request(sample_id, assembly_type)
     context = _context or _prepare_collection_context(criteria_file, metadata_file)
     if os.path.abspath(criteria_file) != context.criteria_file:
         raise ValueError(
             "Collection context criteria file does not match the requested criteria file"
         )
-    all_files = get_all_files(input_filepaths)
-    recovered_values = collect_files(all_files, load_modules_with_checks())
+    with collection_stage("parse"):
+        all_files = get_all_files(input_filepaths) + list(input_contents or ())
+        recovered_values = collect_files(
+            all_files, load_modules_with_checks(), contents=input_contents
+        )
     if not recovered_values:
         logging.warning("No files passed the checks.")
-        return
+        return None
     _add_parser_aliases(recovered_values)
 
-    organism = _resolve_organism(
-        organism,
-        recovered_values,
-        context.species_fields,
-        allow_unknown=allow_unknown_organism,
-    )
+    with collection_stage("organism"):
+        organism = _resolve_organism(
+            organism,
+            recovered_values,
+            context.species_fields,
+            allow_unknown=allow_unknown_organism,
+        )
     logging.info("Finished checking %d files for %s", len(all_files), organism)
     logging.info("Found software: %s", ", ".join(recovered_values))
 
-    criteria_layers = _criteria_layers_for(context, organism)
-    baseline_criteria = _filter_criteria_for_assembly_type(
-        criteria_layers["baseline"], assembly_type
-    )
-    species_criteria = _filter_criteria_for_assembly_type(criteria_layers["species"], assembly_type)
-    qc_report = _evaluate_sample(
-        recovered_values,
-        baseline_criteria,
-        species_criteria,
-        fail_on_not_evaluated=fail_on_not_evaluated,
-    )
+    with collection_stage("evaluate"):
+        plan = _evaluation_plan_for(context, organism, assembly_type)
+        qc_report = plan.evaluate(recovered_values, fail_on_not_evaluated=fail_on_not_evaluated)
     qc_report.update(
         _collection_provenance(
             sample_id=sample_id,
@@ -97,7 +136,7 @@ def collect(
             not_evaluated_count=qc_report.pop("_not_evaluated_count"),
             fail_on_not_evaluated=fail_on_not_evaluated,
             threshold_source=_threshold_source_for(context, organism),
-            baseline_overridden_count=criteria_layers.get("baseline_overridden_count", 0),
+            baseline_overridden_count=plan.baseline_overridden_count,
         )
     )
     if metadata_file and sample_id in context.metadata:
@@ -113,10 +152,9 @@ def collect(
         qc_report["speccheck_warning_count"],
         qc_report["speccheck_failure_count"],
         qc_report["speccheck_not_evaluated_count"],
+        extra=event("QC result", "", qc_report["speccheck_overall_status"]),
     )
-    logging.info("Writing results to %s", os.path.abspath(output_file))
-    write_to_file(output_file, qc_report)
-    logging.info("All checks completed for %s", sample_id)
+    return qc_report
 
 
 def collect_ghru(
@@ -129,11 +167,204 @@ def collect_ghru(
     fail_on_not_evaluated=False,
     work_dir=None,
     sample_ids=None,
+    workers=1,
+    incremental=False,
+    hash_inputs=False,
+    output_format="csv",
+    shards=1,
+    resume=False,
+    continue_on_error=False,
+    shard=None,
+    discovery_cache=None,
+    io_threads=0,
 ):
-    """Collect one CSV per sample directly from a GHRU output directory."""
+    """Collect one CSV per sample directly from a GHRU output directory.
+
+    Returns the collected CSV paths in sample order. Quarantined samples and
+    samples whose files matched no parser have no CSV and are left out.
+
+    With ``workers`` greater than one, samples are collected in a process pool.
+    Each worker receives the prepared collection context once, and worker log
+    records are replayed in sample order so logs match a serial run. With
+    ``io_threads``, each sample's input files are read by a pool of that many
+    threads ahead of evaluation and reports are written by a separate thread,
+    so that slow shared filesystems do not leave the evaluation idle (see
+    ``speccheck.pipeline``). Results are unchanged.
+
+    Every run records per-sample input fingerprints in a manifest in
+    ``output_dir``. With ``incremental``, samples whose inputs, criteria,
+    options, metadata row and both collected CSVs are unchanged are not collected
+    again. ``hash_inputs`` fingerprints input files by content rather than
+    modification time.
+
+    Finished samples are also appended to a journal in ``output_dir`` as the
+    run progresses. With ``resume``, samples that a killed run already
+    finished, with the same fingerprint and unmodified outputs, are not
+    collected again. The journal is removed when a run completes.
+
+    With ``continue_on_error``, a sample that raises is quarantined and the
+    rest are still collected; see ``speccheck.quarantine``.
+
+    ``shard`` is an ``(index, count)`` pair: only samples whose stable sample
+    ID hash falls in slice ``index`` of ``count`` are collected, so that
+    ``count`` independent jobs cover the tree without overlap. Each slice
+    keeps its own journal, quarantine report and result files. Discovery is
+    shared between such jobs through ``discovery_cache`` (see
+    ``speccheck.ghru.load_ghru_sample_files``).
+
+    With an ``output_format`` other than ``csv``, reports are written to
+    ``shards`` JSONL, Parquet or SQLite result files instead (see
+    ``speccheck.sinks``) and their paths are returned; no manifest is kept.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if io_threads < 0:
+        raise ValueError("io_threads must not be negative")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of: {', '.join(OUTPUT_FORMATS)}")
+    if incremental and output_format != "csv":
+        raise ValueError("Incremental collection requires CSV output")
+    if resume and output_format != "csv":
+        raise ValueError("Resuming collection requires CSV output")
+    if shard is not None and not 0 <= shard[0] < shard[1]:
+        raise ValueError("shard must be INDEX/COUNT with 0 <= INDEX < COUNT")
     os.makedirs(output_dir, exist_ok=True)
-    context = _prepare_collection_context(criteria_file, metadata_file)
-    sample_map = discover_ghru_sample_files(ghru_output_dir, work_dir=work_dir)
+    sample_map, selected_samples = _select_ghru_samples(
+        ghru_output_dir, sample_ids, work_dir=work_dir, discovery_cache=discovery_cache
+    )
+    part = ""
+    if shard is not None:
+        index, count = shard
+        part = f".part-{index:05d}-of-{count:05d}"
+        in_shard = [
+            sample_id for sample_id in selected_samples if shard_for(sample_id, count) == index
+        ]
+        logging.info(
+            "Shard %d/%d: collecting %d of %d sample(s)",
+            index,
+            count,
+            len(in_shard),
+            len(selected_samples),
+        )
+        selected_samples = in_shard
+    context = _prepare_collection_context(criteria_file, metadata_file, selected_samples)
+    for sample_id in selected_samples:
+        if not sample_map[sample_id].assembly_type:
+            raise ValueError(f"Could not infer assembly type for sample {sample_id}")
+
+    options = GhruCollectOptions(
+        output_dir=output_dir,
+        criteria_file=criteria_file,
+        organism=organism,
+        metadata_file=metadata_file,
+        allow_unknown_organism=allow_unknown_organism,
+        fail_on_not_evaluated=fail_on_not_evaluated,
+        output_format=output_format,
+        continue_on_error=continue_on_error,
+    )
+    failures = []
+    if output_format != "csv":
+        paths = _collect_ghru_to_sink(
+            [sample_map[sample_id] for sample_id in selected_samples],
+            options,
+            context,
+            failures,
+            workers=workers,
+            shards=shards,
+            part=part,
+            io_threads=io_threads,
+        )
+        if continue_on_error:
+            raise_for_failures(output_dir, failures, part=part)
+        return paths
+
+    manifest = CollectManifest.load(output_dir)
+    journal = CollectJournal.open(output_dir, resume=resume, part=part)
+    fingerprints = {
+        sample_id: _ghru_sample_fingerprint(
+            sample_map[sample_id], options, context, hash_inputs=hash_inputs
+        )
+        for sample_id in selected_samples
+    }
+    samples = []
+    resumed = 0
+    for sample_id in selected_samples:
+        sample = sample_map[sample_id]
+        output_file = _ghru_output_file(sample, options)
+        if resume and journal.is_complete(
+            sample_id, fingerprints[sample_id], _ghru_output_files(output_file)
+        ):
+            logging.debug("Skipping sample %s finished by the interrupted run", sample_id)
+            manifest.record(sample_id, fingerprints[sample_id], _ghru_output_files(output_file))
+            resumed += 1
+            continue
+        if incremental and manifest.is_current(
+            sample_id, fingerprints[sample_id], _ghru_output_files(output_file)
+        ):
+            logging.debug("Skipping unchanged sample %s", sample_id)
+            continue
+        samples.append(sample)
+    if resume:
+        logging.info(
+            "Resuming collect: %d of %d sample(s) already finished",
+            resumed,
+            len(selected_samples),
+        )
+    if incremental:
+        logging.info(
+            "Incremental collect: %d of %d sample(s) changed",
+            len(samples),
+            len(selected_samples),
+        )
+
+    unwritten = set()
+    try:
+        for sample, output_file in _collect_ghru_samples(
+            samples, options, context, workers, io_threads
+        ):
+            if isinstance(output_file, SampleFailure):
+                failures.append(output_file)
+                continue
+            if output_file is None:
+                unwritten.add(sample.sample_id)
+                continue
+            manifest.record(
+                sample.sample_id,
+                fingerprints[sample.sample_id],
+                _ghru_output_files(output_file),
+            )
+            journal.record(
+                sample.sample_id,
+                fingerprints[sample.sample_id],
+                _ghru_output_files(output_file),
+            )
+    finally:
+        # Keep fingerprints for samples that finished even if a later one failed.
+        manifest.save()
+        journal.close()
+    journal.remove()
+
+    unwritten.update(failure.sample_id for failure in failures)
+    written = [
+        _ghru_output_file(sample_map[sample_id], options)
+        for sample_id in selected_samples
+        if sample_id not in unwritten
+    ]
+    logging.info(
+        "Wrote %d collected CSV file(s) to %s",
+        len(samples) - len(unwritten),
+        os.path.abspath(output_dir),
+    )
+    if continue_on_error:
+        raise_for_failures(output_dir, failures, part=part)
+    return written
+
+
+def _select_ghru_samples(ghru_output_dir, sample_ids=None, *, work_dir=None, discovery_cache=None):
+    """Discover a GHRU tree and return ``(sample map, sorted sample IDs to collect)``."""
+    sample_map = load_ghru_sample_files(
+        ghru_output_dir, work_dir=work_dir, cache_file=discovery_cache
+    )
     selected_samples = sorted(sample_ids) if sample_ids else sorted(sample_map)
     missing_samples = [sample_id for sample_id in selected_samples if sample_id not in sample_map]
     if missing_samples:
@@ -141,38 +372,297 @@ def collect_ghru(
             "Requested sample(s) were not found in the GHRU output tree: "
             + ", ".join(missing_samples)
         )
+    return sample_map, selected_samples
+
+
+def _ghru_output_files(output_file):
+    return [output_file, detailed_output_path(output_file)]
+
+
+def _collect_ghru_to_sink(
+    samples, options, context, failures, *, workers, shards, part="", io_threads=0
+):
+    with ResultSink(options.output_dir, options.output_format, shards, part=part) as sink:
+        for _sample, qc_report in _collect_ghru_samples(
+            samples, options, context, workers, io_threads
+        ):
+            if isinstance(qc_report, SampleFailure):
+                failures.append(qc_report)
+            elif qc_report is not None:
+                sink.write(qc_report)
+    return sink.paths
+
+
+def _collect_ghru_samples(samples, options, context, workers, io_threads=0):
+    """Yield ``(sample, result)`` in sample order, serially or from a process pool.
+
+    With ``io_threads``, input reads, evaluation and writes are overlapped
+    across samples by ``speccheck.pipeline.collect_staged``.
+    """
+    workers = min(workers, len(samples)) or 1
+    if io_threads and samples:
+        from speccheck.pipeline import collect_staged
 
-    written = []
-    for sample_id in selected_samples:
-        sample = sample_map[sample_id]
-        if not sample.assembly_type:
-            raise ValueError(f"Could not infer assembly type for sample {sample_id}")
-        output_file = os.path.join(output_dir, f"{sample_id}.csv")
         logging.info(
-            "Collecting GHRU outputs for %s (%s assembly) from %d file(s)",
-            sample_id,
-            sample.assembly_type,
-            len(sample.files),
+            "Collecting %d sample(s) with %d I/O thread(s) and %d evaluation worker(s)",
+            len(samples),
+            io_threads,
+            workers,
         )
-        collect(
-            organism,
+        yield from collect_staged(samples, options, context, workers=workers, io_threads=io_threads)
+        return
+    if workers == 1:
+        for sample in samples:
+            yield sample, _collect_ghru_sample(sample, options, context)
+        return
+    logging.info("Collecting %d sample(s) with %d worker processes", len(samples), workers)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_collection_worker,
+        initargs=(context, logging.getLogger().getEffectiveLevel()),
+    ) as executor:
+        for sample, outcome in zip(
+            samples,
+            executor.map(_collect_ghru_sample_in_worker, samples, [options] * len(samples)),
+            strict=True,
+        ):
+            yield sample, _replay_worker_result(outcome)
+
+
+def collect_batch(
+    samplesheet,
+    output_dir,
+    criteria_file,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=False,
+    assembly_type="short",
+    organism=None,
+    output_format="csv",
+    shards=1,
+    continue_on_error=False,
+):
+    """Collect every sample listed in a samplesheet inside one process.
+
+    Criteria validation, metadata loading and compiled evaluation plans are
+    shared through a single collection context, so per-sample cost is only
+    parsing and evaluation. ``assembly_type`` and ``organism`` are defaults
+    for rows that leave those columns empty. Returns the per-sample CSV paths
+    in samplesheet order, or the result file paths when ``output_format`` is
+    ``jsonl``, ``parquet`` or ``sqlite`` (see ``speccheck.sinks``).
+    With ``continue_on_error``, failing samples are quarantined instead of
+    stopping the run (see ``speccheck.quarantine``).
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of: {', '.join(OUTPUT_FORMATS)}")
+    rows = read_samplesheet(samplesheet)
+    for row in rows:
+        _validate_sample_request(row.sample_id, row.assembly_type or assembly_type)
+    os.makedirs(output_dir, exist_ok=True)
+    context = _prepare_collection_context(
+        criteria_file, metadata_file, [row.sample_id for row in rows]
+    )
+    sink = ResultSink(output_dir, output_format, shards) if output_format != "csv" else None
+    written = []
+    failures = []
+    with sink or nullcontext():
+        for row in rows:
+            output_file = os.path.join(output_dir, f"{row.sample_id}.csv")
+            logging.info("Collecting %s from %d file pattern(s)", row.sample_id, len(row.files))
+            arguments = (row.organism or organism, list(row.files), criteria_file)
+            options = {
+                "metadata_file": metadata_file,
+                "allow_unknown_organism": allow_unknown_organism,
+                "assembly_type": row.assembly_type or assembly_type,
+                "fail_on_not_evaluated": fail_on_not_evaluated,
+                "_context": context,
+            }
+            try:
+                if sink is None:
+                    collect(*arguments, output_file, row.sample_id, **options)
+                    written.append(output_file)
+                    continue
+                qc_report = collect_report(*arguments, row.sample_id, **options)
+            except Exception as exc:
+                if not continue_on_error:
+                    raise
+                failures.append(SampleFailure.from_exception(row.sample_id, exc, row.files))
+                continue
+            if qc_report is not None:
+                sink.write(qc_report)
+    logging.info(
+        "Collected %d sample(s) from %s into %s",
+        len(rows),
+        samplesheet,
+        os.path.abspath(output_dir),
+    )
+    if continue_on_error:
+        raise_for_failures(output_dir, failures)
+    return written if sink is None else sink.paths
+
+
+@dataclass(frozen=True)
+class GhruCollectOptions:
+    """Per-run options shared by every sample collected from a GHRU tree."""
+
+    output_dir: str
+    criteria_file: str
+    organism: str | None = None
+    metadata_file: str | None = None
+    allow_unknown_organism: bool = False
+    fail_on_not_evaluated: bool = False
+    # Any format other than ``csv`` returns each sample's report to the caller.
+    output_format: str = "csv"
+    continue_on_error: bool = False
+    # Return each sample's report instead of writing its CSVs, as ``run`` does.
+    return_reports: bool = False
+
+    @property
+    def writes_csv(self):
+        return self.output_format == "csv" and not self.return_reports
+
+
+def _ghru_output_file(sample, options):
+    return os.path.join(options.output_dir, f"{sample.sample_id}.csv")
+
+
+def _ghru_sample_fingerprint(sample, options, context, *, hash_inputs=False):
+    return sample_fingerprint(
+        sample.files,
+        assembly_type=sample.assembly_type,
+        criteria_sha256=context.criteria_sha256,
+        options={
+            "organism": options.organism,
+            "allow_unknown_organism": options.allow_unknown_organism,
+            "fail_on_not_evaluated": options.fail_on_not_evaluated,
+            "metadata_file": bool(options.metadata_file),
+        },
+        metadata_row=context.metadata.get(sample.sample_id),
+        hash_contents=hash_inputs,
+    )
+
+
+def _collect_ghru_sample(sample, options, context):
+    """Collect one sample: return its CSV path, or its report when using a result sink.
+
+    Either is None when no input file matched a parser, so nothing was written.
+
+    With ``options.continue_on_error`` a failing sample returns a ``SampleFailure``.
+    """
+    try:
+        return _collect_ghru_sample_output(sample, options, context)
+    except Exception as exc:
+        if not options.continue_on_error:
+            raise
+        return SampleFailure.from_exception(sample.sample_id, exc, sample.files)
+
+
+def _collect_ghru_sample_output(sample, options, context):
+    output_file = _ghru_output_file(sample, options)
+    logging.info(
+        "Collecting GHRU outputs for %s (%s assembly) from %d file(s)",
+        sample.sample_id,
+        sample.assembly_type,
+        len(sample.files),
+    )
+    if not options.writes_csv:
+        return collect_report(
+            options.organism,
             sample.files,
-            criteria_file,
-            output_file,
-            sample_id,
-            metadata_file=metadata_file,
-            allow_unknown_organism=allow_unknown_organism,
+            options.criteria_file,
+            sample.sample_id,
+            metadata_file=options.metadata_file,
+            allow_unknown_organism=options.allow_unknown_organism,
             assembly_type=sample.assembly_type,
-            fail_on_not_evaluated=fail_on_not_evaluated,
+            fail_on_not_evaluated=options.fail_on_not_evaluated,
             _context=context,
         )
-        written.append(output_file)
+    return collect(
+        options.organism,
+        sample.files,
+        options.criteria_file,
+        output_file,
+        sample.sample_id,
+        metadata_file=options.metadata_file,
+        allow_unknown_organism=options.allow_unknown_organism,
+        assembly_type=sample.assembly_type,
+        fail_on_not_evaluated=options.fail_on_not_evaluated,
+        _context=context,
+    )
 
-    logging.info("Wrote %d collected CSV file(s) to %s", len(written), os.path.abspath(output_dir))
-    return written
 
+_WORKER_CONTEXT: CollectionContext | None = None
+
+
+class _LogRecordBuffer(logging.Handler):
+    """Hold a worker's log records so the parent can replay them in order."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+
+def _init_collection_worker(context, log_level):
+    global _WORKER_CONTEXT
+    _WORKER_CONTEXT = context
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(log_level)
+
+
+def _collect_ghru_sample_in_worker(sample, options):
+    return _call_buffering_logs(_collect_ghru_sample, sample, options, _WORKER_CONTEXT)
+
+
+def _call_buffering_logs(function, *args):
+    """Call ``function`` in a worker process and return ``(result, error, log records)``.
+
+    An exception is returned rather than raised, so that the records logged
+    before it still reach the parent; see ``_replay_worker_result``.
+    """
+    buffer = _LogRecordBuffer()
+    root = logging.getLogger()
+    root.addHandler(buffer)
+    try:
+        return function(*args), None, buffer.records
+    except Exception as exc:  # noqa: BLE001 - re-raised by _replay_worker_result
+        return None, exc, buffer.records
+    finally:
+        root.removeHandler(buffer)
 
-def _prepare_collection_context(criteria_file, metadata_file=None):
+
+def _replay_worker_result(outcome):
+    """Replay the log records of a ``_call_buffering_logs`` outcome, then return or raise."""
+    result, error, records = outcome
+    _replay_log_records(records)
+    if error is not None:
+        raise error
+    return result
+
+
+def _replay_log_records(records):
+    for record in records:
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+
+
+def _prepare_collection_context(criteria_file, metadata_file=None, sample_ids=None):
+    """Validate criteria and open metadata once for a collection run.
+
+    Without ``sample_ids`` the metadata stays an on-disk index and rows are
+    read on demand; batch runs pass the samples they will collect so their
+    rows are joined in one pass and held as a plain dict.
+    """
     if not os.path.isfile(criteria_file):
         raise FileNotFoundError(f"Criteria file not found: {criteria_file}")
     errors, warnings = validate_criteria(criteria_file)
@@ -182,12 +672,12 @@ def _prepare_collection_context(criteria_file, metadata_file=None):
         for error in errors:
             logging.error("%s", error)
         sys.exit(1)
-    absolute_criteria_file = os.path.abspath(criteria_file)
+    store = load_criteria_store(criteria_file)
     return CollectionContext(
-        criteria_file=absolute_criteria_file,
-        criteria_sha256=_file_sha256(absolute_criteria_file),
-        metadata=_load_metadata(metadata_file),
-        species_fields=get_species_field(absolute_criteria_file),
+        criteria_file=store.path,
+        criteria_sha256=store.sha256,
+        metadata=_load_metadata(metadata_file, sample_ids),
+        species_fields=store.species_fields(),
     )
 
 
@@ -198,19 +688,14 @@ def _validate_sample_request(sample_id, assembly_type):
         raise ValueError("assembly_type must be one of: all, short, long, hybrid")
 
 
-def _load_metadata(metadata_file):
+def _load_metadata(metadata_file, sample_ids=None):
     if not metadata_file:
         return {}
-    if not os.path.isfile(metadata_file):
-        raise FileNotFoundError(f"Metadata file not found: {metadata_file}")
-    metadata_df = pd.read_csv(metadata_file)
-    if "sample_id" not in metadata_df.columns:
-        raise ValueError("Metadata file must contain a 'sample_id' column")
-    if metadata_df["sample_id"].duplicated().any():
-        raise ValueError("Metadata file contains duplicate sample_id values")
-    metadata_df.set_index("sample_id", inplace=True)
-    logging.info("Loaded metadata for %d samples from %s", len(metadata_df), metadata_file)
-    return metadata_df.to_dict("index")
+    index = load_metadata_index(metadata_file)
+    logging.info("Loaded metadata for %d samples from %s", len(index), metadata_file)
+    if sample_ids is None:
+        return index
+    return index.rows_for(sample_ids)
 
 
 def _resolve_organism(organism, recovered_values, species_fields, *, allow_unknown):
@@ -236,84 +721,6 @@ def _resolve_organism(organism, recovered_values, species_fields, *, allow_unkno
     return "Unknown"
 
 
-def _evaluate_sample(
-    recovered_values,
-    baseline_criteria,
-    species_criteria,
-    *,
-    fail_on_not_evaluated,
-):
-    qc_report = {}
-    baseline_checks_passed = True
-    species_checks_available = bool(species_criteria)
-    species_checks_passed = True if species_checks_available else "NOT_AVAILABLE"
-    not_evaluated_count = 0
-    warning_reasons = []
-    failure_reasons = []
-
-    for software, result in recovered_values.items():
-        logging.info("Running checks for %s", software)
-        _add_parsed_values(qc_report, software, result)
-        baseline_result, baseline_missing, baseline_warnings, baseline_failures = (
-            _evaluate_criteria_group(
-                baseline_criteria,
-                software,
-                result,
-                qc_report,
-                fail_on_not_evaluated=fail_on_not_evaluated,
-            )
-        )
-        species_result, species_missing, species_warnings, species_failures = (
-            _evaluate_criteria_group(
-                species_criteria,
-                software,
-                result,
-                qc_report,
-                fail_on_not_evaluated=fail_on_not_evaluated,
-            )
-        )
-        not_evaluated_count += baseline_missing + species_missing
-        warning_reasons.extend(baseline_warnings + species_warnings)
-        failure_reasons.extend(baseline_failures + species_failures)
-        qc_report[f"{software}.all_checks_passed"] = baseline_result and species_result
-        baseline_checks_passed = baseline_checks_passed and baseline_result
-        if species_checks_available:
-            species_checks_passed = species_checks_passed and species_result
-
-    parser_statuses = [
-        value for key, value in qc_report.items() if key.endswith(".all_checks_passed")
-    ]
-    qc_report["all_checks_passed"] = all(parser_statuses)
-    qc_report["speccheck_baseline_checks_passed"] = baseline_checks_passed
-    qc_report["speccheck_species_checks_passed"] = species_checks_passed
-    qc_report["speccheck_species_checks_available"] = species_checks_available
-    qc_report["speccheck_warning_count"] = len(warning_reasons)
-    qc_report["speccheck_failure_count"] = len(failure_reasons)
-    qc_report["speccheck_warning_reasons"] = "; ".join(warning_reasons) or "none"
-    qc_report["speccheck_failure_reasons"] = "; ".join(failure_reasons) or "none"
-    qc_report["speccheck_overall_status"] = (
-        "FAIL"
-        if failure_reasons or (fail_on_not_evaluated and not_evaluated_count)
-        else "WARN"
-        if warning_reasons
-        else "PASS"
-    )
-    qc_report["_not_evaluated_count"] = not_evaluated_count
-    return qc_report
-
-
-def _add_parsed_values(qc_report, software, result):
-    if isinstance(result, list):
-        for entry in result:
-            read_type = entry.get("Read_type", "").lower()
-            for name, value in entry.items():
-                if name not in {"Read_type", "Sample_id"}:
-                    qc_report[f"{software}.{read_type}.{name}"] = value
-        return
-    for name, value in result.items():
-        qc_report[f"{software}.{name}"] = value
-
-
 def _collection_provenance(
     *,
     sample_id,
@@ -349,79 +756,24 @@ def _criteria_layers_for(context, organism):
     return context.criteria_layers[organism]
 
 
+def _evaluation_plan_for(context, organism, assembly_type):
+    key = (organism, assembly_type)
+    if key not in context.evaluation_plans:
+        criteria_layers = _criteria_layers_for(context, organism)
+        context.evaluation_plans[key] = EvaluationPlan.build(
+            _filter_criteria_for_assembly_type(criteria_layers["baseline"], assembly_type),
+            _filter_criteria_for_assembly_type(criteria_layers["species"], assembly_type),
+            baseline_overridden_count=criteria_layers.get("baseline_overridden_count", 0),
+        )
+    return context.evaluation_plans[key]
+
+
 def _threshold_source_for(context, organism):
     if organism not in context.threshold_sources:
         context.threshold_sources[organism] = get_threshold_source_for_species(organism)
     return context.threshold_sources[organism]
 
 
-def _result_has_field(result, field):
-    field_name = field["field"]
-    software = field["software"]
-    if software.startswith("DepthParser"):
-        expected_read_type = software.rsplit(".", 1)[-1].lower() if "." in software else None
-        if isinstance(result, list):
-            return any(
-                entry.get("Read_type", "").lower() == expected_read_type and field_name in entry
-                for entry in result
-            )
-        return result.get("Read_type", "").lower() == expected_read_type and field_name in result
-    if isinstance(result, list):
-        return any(field_name in entry for entry in result)
-    return field_name in result
-
-
-def _evaluate_criteria_group(
-    criteria,
-    software,
-    result,
-    qc_report,
-    *,
-    fail_on_not_evaluated=False,
-):
-    group_passed = True
-    not_evaluated_count = 0
-    warning_reasons = []
-    failure_reasons = []
-    for field in criteria:
-        if not criteria_applies_to_software(field["software"], software):
-            continue
-        column = f"{field['software']}.{field['field']}.check"
-        status_column = f"{field['software']}.{field['field']}.status"
-        already_seen = column in qc_report
-        qc_report.setdefault(column, True)
-        qc_report.setdefault(status_column, "PASS")
-        if _result_has_field(result, field):
-            test_result = check_criteria(field, result)
-            if test_result:
-                continue
-            severity = field.get("severity", "fail").upper()
-            reason = (
-                f"{field['software']}.{field['field']} "
-                f"{field['operator']}{field['value']} ({field.get('source', 'custom')})"
-            )
-            if severity == "WARN":
-                warning_reasons.append(reason)
-            else:
-                failure_reasons.append(reason)
-                group_passed = False
-                qc_report[column] = False
-            if STATUS_RANK[severity] > STATUS_RANK[qc_report[status_column]]:
-                qc_report[status_column] = severity
-        elif not already_seen:
-            qc_report[column] = "NOT_EVALUATED"
-            qc_report[status_column] = "NOT_EVALUATED"
-            group_passed = group_passed and not fail_on_not_evaluated
-            not_evaluated_count += 1
-            logging.warning(
-                "Criteria field %s.%s was not evaluated because the parsed %s output did not contain that metric.",
-                field["software"],
-                field["field"],
-                software,
-            )
-    return group_passed, not_evaluated_count, warning_reasons, failure_reasons
-
-
 def _filter_criteria_for_assembly_type(criteria, assembly_type):
     """Keep criteria rows that apply to the requested assembly type."""
     allowed = {"all"}
@@ -432,14 +784,6 @@ def _filter_criteria_for_assembly_type(criteria, assembly_type):
     return [field for field in criteria if field.get("assembly_type", "all") in allowed]
 
 
-def _file_sha256(path):
-    digest = hashlib.sha256()
-    with open(path, "rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
 def _add_parser_aliases(recovered_values):
     """Add registered metric aliases without changing parser ownership."""
     for software, values in recovered_values.items():
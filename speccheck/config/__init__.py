@@ -1,8 +1,19 @@
 from pathlib import Path
 
 PACKAGE_DIR = Path(__file__).resolve().parent.parent
+TEMPLATE_DIR = PACKAGE_DIR / "templates"
+DEFAULT_TEMPLATE_PATH = TEMPLATE_DIR / "report.html"
+DEFAULT_STYLE_PATH = TEMPLATE_DIR / "report.css"
 
 
 def get_default_criteria_path():
     packaged_criteria = PACKAGE_DIR / "config" / "criteria.csv"
     return str(packaged_criteria)
+
+
+def get_default_template_path():
+    return str(DEFAULT_TEMPLATE_PATH)
+
+
+def get_default_style_path():
+    return str(DEFAULT_STYLE_PATH)
@@ -0,0 +1,147 @@
+"""Persistent cache of compiled configuration.
+
+Parsing and validating the criteria CSV and the QualiBact snapshot is pure
+start-up cost that every short-lived ``speccheck`` process pays again. The
+compiled forms are pickled under a user cache directory, keyed by the sha256
+of the source file, the speccheck version, and a fingerprint of the code that
+built them, so an edited file or an upgraded install never reuses stale data.
+
+Release builds also ship pre-compiled entries for the packaged defaults in
+``speccheck/config/compiled`` (see ``scripts/build_config_cache.py``); those
+are consulted before the user cache and are never written at runtime.
+
+Unpickling runs code, so a user cache entry is only loaded when the current
+user owns both the entry and its directory and neither is writable by group
+or others. A cache directory shared with other users is therefore ignored,
+and compiled configuration is rebuilt in every process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle  # nosec B403 - user cache entries are checked by _is_private before loading
+import stat
+from pathlib import Path
+
+from speccheck import __version__
+from speccheck.atomic import atomic_write
+
+CACHE_DIR_ENV = "SPECCHECK_CACHE_DIR"
+DISABLE_ENV = "SPECCHECK_NO_CACHE"
+CACHE_FORMAT = 1
+PACKAGED_CACHE_DIR = Path(__file__).resolve().parent / "config" / "compiled"
+
+
+def cache_enabled() -> bool:
+    """Return False when ``SPECCHECK_NO_CACHE`` is set to a truthy value."""
+    return os.environ.get(DISABLE_ENV, "").strip().lower() not in {"1", "true", "yes"}
+
+
+def user_cache_dir() -> Path:
+    """Return the per-user directory for compiled configuration entries."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "speccheck"
+
+
+def source_fingerprint(*modules) -> str:
+    """Return a short digest of the source of the modules that build an entry."""
+    digest = hashlib.sha256()
+    for module in modules:
+        path = getattr(module, "__file__", None)
+        try:
+            with open(path, "rb") as handle:
+                digest.update(handle.read())
+        except (OSError, TypeError):
+            digest.update(getattr(module, "__name__", "").encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_key(kind, sha256, fingerprint="") -> str:
+    """Return the file name for one compiled entry."""
+    return f"{kind}-{sha256[:32]}-{__version__}-{fingerprint or 'none'}-v{CACHE_FORMAT}.pickle"
+
+
+def load_compiled(kind, sha256, build, *, fingerprint=""):
+    """Return a compiled object from the cache, building and storing it on a miss.
+
+    ``build`` is called with no arguments when neither the packaged nor the
+    user cache holds an entry for ``sha256``. Unreadable or corrupt entries
+    count as misses, and failures to write the cache are logged and ignored so
+    a read-only home directory never breaks a run.
+    """
+    if not cache_enabled():
+        return build()
+    name = cache_key(kind, sha256, fingerprint)
+    cached = _read_entry(PACKAGED_CACHE_DIR / name)
+    if cached is None:
+        cached = _read_entry(user_cache_dir() / name, private=True)
+    if cached is not None:
+        return cached
+    compiled = build()
+    write_entry(user_cache_dir() / name, compiled)
+    return compiled
+
+
+def _read_entry(path, private=False):
+    try:
+        with open(path, "rb") as handle:
+            if private and not _is_private(path, handle):
+                return None
+            return pickle.load(handle)  # nosec B301 - see module docstring
+    except FileNotFoundError:
+        return None
+    except Exception as exc:  # noqa: BLE001 - any unreadable entry is a cache miss
+        logging.debug("Ignoring unreadable config cache entry %s: %s", path, exc)
+        return None
+
+
+_WARNED_DIRECTORIES = set()
+
+
+def _is_private(path, handle):
+    """Return whether only the current user can have written the open entry at ``path``."""
+    if not hasattr(os, "getuid"):  # pragma: no cover - Windows
+        return True
+    uid = os.getuid()
+    directory = os.path.dirname(os.path.abspath(path))
+    for what, info in (("entry", os.fstat(handle.fileno())), ("directory", os.stat(directory))):
+        if info.st_uid == uid and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            continue
+        if directory not in _WARNED_DIRECTORIES:
+            _WARNED_DIRECTORIES.add(directory)
+            logging.warning(
+                "Ignoring config cache in %s: the %s %s is not private to the current user",
+                directory,
+                what,
+                path if what == "entry" else directory,
+            )
+        return False
+    return True
+
+
+def write_entry(path, compiled) -> bool:
+    """Atomically write one entry; concurrent writers of the same key are safe.
+
+    The entry is written to a temporary file in the target directory and
+    renamed into place, so readers only ever see complete files and the last
+    of several identical concurrent writes simply wins. Entries are never
+    group- or world-writable, and a missing cache directory is created private.
+    """
+    path = Path(path)
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with atomic_write(path, "wb", fsync=False) as stream:
+            if hasattr(os, "fchmod"):
+                # Only loaded when nobody else can write it; see _is_private.
+                mode = os.fstat(stream.fileno()).st_mode
+                os.fchmod(stream.fileno(), stat.S_IMODE(mode) & ~(stat.S_IWGRP | stat.S_IWOTH))
+            pickle.dump(compiled, stream, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as exc:
+        logging.debug("Could not write config cache entry %s: %s", path, exc)
+        return False
+    return True
@@ -7,10 +7,15 @@ baseline rows for the same software/field pair.
 """
 
 import csv
+import hashlib
+import io
 import logging
 import os
 import re
+import sys
+from functools import lru_cache
 
+from speccheck.config_cache import load_compiled, source_fingerprint
 from speccheck.registry import get_parser_classes
 
 REQUIRED_HEADERS = [
@@ -23,36 +28,135 @@ REQUIRED_HEADERS = [
     "special_field",
 ]
 OPTIONAL_HEADERS = {"severity", "source"}
+NORMALIZED_KEYS = (
+    "assembly_type",
+    "software",
+    "field",
+    "operator",
+    "value",
+    "severity",
+    "source",
+    "special_field",
+)
 VALID_SEVERITIES = {"warn", "fail"}
 
 
-def validate_criteria(criteria_file):
-    """Return criteria CSV validation errors and warnings."""
-    valid_software = {parser.software_name or parser.__name__ for parser in get_parser_classes()}
-    valid_software.add("DepthParser")
-    valid_operators = {">", "<", ">=", "<=", "=", "regex"}
-    errors = []
-    warnings = []
+class CriteriaStore:
+    """A criteria CSV read once and indexed by species.
 
-    # Check if file exists
-    if not os.path.isfile(criteria_file):
-        errors.append(f"File not found: {criteria_file}")
-        return errors, warnings
+    The store keeps the raw rows for validation, the file digest for
+    provenance, and normalized rows grouped by species so baseline layers and
+    species overrides are computed without rescanning the file. Row dicts are
+    only materialized for species that are actually requested.
+    """
 
-    # Check if file is a valid CSV
-    try:
-        with open(criteria_file, encoding="utf-8") as f:
-            csv.Sniffer().sniff(f.read(1024))
-            f.seek(0)
-    except csv.Error:
-        errors.append(f"File is not a valid CSV: {criteria_file}")
-        return errors, warnings
+    def __init__(self, path, data: bytes, sha256=None):
+        self.path = path
+        self.sha256 = sha256 or hashlib.sha256(data).hexdigest()
+        text = data.decode("utf-8")
+        self._sample = text[:2048]
+        reader = csv.DictReader(io.StringIO(text))
+        self.fieldnames = list(reader.fieldnames or [])
+        self._rows = list(reader)
+        self.species_names = frozenset(row.get("species") for row in self.rows)
+        self._species_rows = None
+        self._by_species = {}
+        self._layers = {}
+        self._validation = {}
+        self._species_fields = None
+        try:
+            csv.Sniffer().sniff(self._sample[:1024])
+        except csv.Error:
+            self.is_csv = False
+        else:
+            self.is_csv = True
+
+    @property
+    def rows(self):
+        """Raw CSV rows, re-read from ``path`` if a compiled store dropped them."""
+        if self._rows is None:
+            with open(self.path, "rb") as handle:
+                data = handle.read()
+            text = data.decode("utf-8")
+            self._sample = text[:2048]
+            self._rows = list(csv.DictReader(io.StringIO(text)))
+        return self._rows
+
+    @property
+    def sample(self):
+        """The leading text of the file used for CSV dialect sniffing."""
+        if self._sample is None:
+            self.rows  # noqa: B018 - reloads the sample alongside the rows
+        return self._sample
+
+    def compile(self):
+        """Precompute validation and indexes, then drop the raw rows.
+
+        A compiled store is what the persistent config cache pickles; it
+        answers lookups without re-reading or re-validating the CSV.
+        """
+        if self.is_csv:
+            errors, _warnings = self.validate()
+            if not any(error.startswith("Invalid headers") for error in errors):
+                self._index_rows()
+                try:
+                    self.species_fields()
+                except csv.Error:
+                    pass
+        self._rows = None
+        self._sample = None
+        self._by_species = {}
+        self._layers = {}
+        return self
+
+    def _index_rows(self):
+        if self._species_rows is None:
+            species_rows: dict[str, list[tuple]] = {}
+            for row in self.rows:
+                normalized = _normalize_criteria_row(row)
+                species_rows.setdefault(row["species"], []).append(
+                    tuple(normalized[key] for key in NORMALIZED_KEYS)
+                )
+            self._species_rows = {species: tuple(rows) for species, rows in species_rows.items()}
+        return self._species_rows
+
+    def rows_for(self, species):
+        """Return normalized criteria rows whose species column equals ``species``."""
+        return [dict(row) for row in self._cached_rows_for(species)]
+
+    def _cached_rows_for(self, species):
+        # Shared by every caller of this store; hand out copies only.
+        if species not in self._by_species:
+            self._by_species[species] = [
+                dict(zip(NORMALIZED_KEYS, row, strict=True))
+                for row in self._index_rows().get(species, ())
+            ]
+        return self._by_species[species]
+
+    def validate(self):
+        """Return criteria validation errors and warnings."""
+        valid_software = {
+            parser.software_name or parser.__name__ for parser in get_parser_classes()
+        }
+        valid_software.add("DepthParser")
+        key = frozenset(valid_software)
+        if key not in self._validation:
+            self._validation[key] = self._validate(valid_software)
+        errors, warnings = self._validation[key]
+        return list(errors), list(warnings)
 
-    with open(criteria_file, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    def _validate(self, valid_software):
+        valid_operators = {">", "<", ">=", "<=", "=", "regex"}
+        errors = []
+        warnings = []
+
+        # Check if file is a valid CSV
+        if not self.is_csv:
+            errors.append(f"File is not a valid CSV: {self.path}")
+            return errors, warnings
 
         # Validate headers
-        fieldnames = reader.fieldnames or []
+        fieldnames = self.fieldnames
         missing_headers = [header for header in REQUIRED_HEADERS if header not in fieldnames]
         unexpected_headers = set(fieldnames).difference(REQUIRED_HEADERS, OPTIONAL_HEADERS)
         if missing_headers or unexpected_headers:
@@ -64,7 +168,7 @@ def validate_criteria(criteria_file):
             return errors, warnings
 
         # Validate rows
-        for i, row in enumerate(reader, start=2):
+        for i, row in enumerate(self.rows, start=2):
             # Validate required fields
             if not row["species"] or not row["software"] or not row["field"]:
                 errors.append(f"Row {i}: Missing required fields")
@@ -103,81 +207,122 @@ def validate_criteria(criteria_file):
                     f"Row {i}: Invalid severity '{row.get('severity')}'. Expected warn or fail"
                 )
 
-    return errors, warnings
+        return errors, warnings
+
+    def species_fields(self):
+        """Return parser fields marked as organism/species inference fields."""
+        if self._species_fields is None:
+            try:
+                csv.Sniffer().sniff(self.sample)
+            except csv.Error as exc:
+                raise csv.Error(f"File is not a valid CSV: {self.path}") from exc
+            rows = []
+            for row in self.rows:
+                if row.get("special_field") == "species_field" and row.get("operator") == "regex":
+                    entry = {
+                        "software": row.get("software"),
+                        "field": row.get("field"),
+                    }
+                    # check if entry already in rows
+                    if entry not in rows:
+                        rows.append(entry)
+            self._species_fields = rows
+        return [dict(entry) for entry in self._species_fields]
+
+    def criteria(self, species=None):
+        """Return baseline criteria plus optional species-specific criteria."""
+        baseline = self.rows_for("all")
+        if not species:
+            return baseline
+        merge_criteria = self.rows_for(species)
+        if not merge_criteria:
+            logging.warning(
+                "No species-specific criteria found for %s. Using baseline criteria only.",
+                species,
+            )
+            return baseline
+        return baseline + merge_criteria
+
+    def layers(self, species=None):
+        """Return criteria split into baseline and species-specific layers."""
+        species = species if species and species != "all" else None
+        if species not in self._layers:
+            baseline = self._cached_rows_for("all")
+            species_specific = self._cached_rows_for(species) if species else []
+            overridden_metrics = {
+                (criterion["software"], criterion["field"]) for criterion in species_specific
+            }
+            applicable_baseline = [
+                criterion
+                for criterion in baseline
+                if (criterion["software"], criterion["field"]) not in overridden_metrics
+            ]
+            self._layers[species] = {
+                "baseline": applicable_baseline,
+                "species": list(species_specific),
+                "baseline_overridden_count": len(baseline) - len(applicable_baseline),
+            }
+        layers = self._layers[species]
+        return {
+            "baseline": [dict(criterion) for criterion in layers["baseline"]],
+            "species": [dict(criterion) for criterion in layers["species"]],
+            "baseline_overridden_count": layers["baseline_overridden_count"],
+        }
+
+
+def load_criteria_store(criteria_file) -> CriteriaStore:
+    """Return the indexed criteria store for a file, parsing it once per process.
+
+    Stores are cached by path, modification time and size, so an edited file
+    is re-read while repeated lookups for the same file are free. Across
+    processes, the compiled store is reused from the persistent config cache
+    when the file's sha256 matches.
+    """
+    path = os.path.abspath(criteria_file)
+    stat = os.stat(path)
+    return _load_criteria_store(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _load_criteria_store(path, _mtime_ns, _size):
+    with open(path, "rb") as handle:
+        data = handle.read()
+    sha256 = hashlib.sha256(data).hexdigest()
+    store = load_compiled(
+        "criteria",
+        sha256,
+        lambda: CriteriaStore(path, data, sha256=sha256).compile(),
+        fingerprint=source_fingerprint(sys.modules[__name__]),
+    )
+    # Identical content may have been compiled from another location.
+    store.path = path
+    return store
+
+
+def validate_criteria(criteria_file):
+    """Return criteria CSV validation errors and warnings."""
+    # Check if file exists
+    if not os.path.isfile(criteria_file):
+        return [f"File not found: {criteria_file}"], []
+    store = load_criteria_store(criteria_file)
+    if not store.is_csv:
+        return [f"File is not a valid CSV: {criteria_file}"], []
+    return store.validate()
 
 
 def get_species_field(criteria_file):
     """Return parser fields marked as organism/species inference fields."""
-    rows = []
-
-    with open(criteria_file, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        try:
-            csv.Sniffer().sniff(f.read(2048))
-            f.seek(0)
-        except csv.Error as exc:
-            raise csv.Error(f"File is not a valid CSV: {criteria_file}") from exc
-        for row in reader:
-            if row.get("special_field") == "species_field" and row.get("operator") == "regex":
-                entry = {
-                    "software": row.get("software"),
-                    "field": row.get("field"),
-                }
-                # check if entry already in rows
-                if entry not in rows:
-                    rows.append(entry)
-    return rows
+    return load_criteria_store(criteria_file).species_fields()
 
 
 def get_criteria(criteria_file, species=None):
     """Return baseline criteria plus optional species-specific criteria."""
-    criteria = []
-    with open(criteria_file, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        merge_criteria = []
-        for row in reader:
-            new_criteria = _normalize_criteria_row(row)
-
-            if row["species"] == "all":
-                criteria.append(new_criteria)
-            if species and row["species"] == species:
-                merge_criteria.append(new_criteria)
-    if not species:
-        return criteria
-    if not merge_criteria:
-        logging.warning(
-            "No species-specific criteria found for %s. Using baseline criteria only.", species
-        )
-        return criteria
-    return criteria + merge_criteria
+    return load_criteria_store(criteria_file).criteria(species)
 
 
 def get_criteria_layers(criteria_file, species=None):
     """Return criteria split into baseline and species-specific layers."""
-    baseline = []
-    species_specific = []
-    with open(criteria_file, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            new_criteria = _normalize_criteria_row(row)
-
-            if row["species"] == "all":
-                baseline.append(new_criteria)
-            elif species and row["species"] == species:
-                species_specific.append(new_criteria)
-    overridden_metrics = {
-        (criterion["software"], criterion["field"]) for criterion in species_specific
-    }
-    applicable_baseline = [
-        criterion
-        for criterion in baseline
-        if (criterion["software"], criterion["field"]) not in overridden_metrics
-    ]
-    return {
-        "baseline": applicable_baseline,
-        "species": species_specific,
-        "baseline_overridden_count": len(baseline) - len(applicable_baseline),
-    }
+    return load_criteria_store(criteria_file).layers(species)
 
 
 def _normalize_criteria_row(row):
@@ -0,0 +1,99 @@
+"""Route input files to parsers with one bounded read per file.
+
+Parsers declare the filename endings they accept and a cheap header signature.
+The dispatcher uses the endings as an index, reads a bounded prefix of each
+candidate file once, and only runs the full ``has_valid_fileformat`` check for
+parsers whose signature matches that prefix. When the prefix covers the whole
+file it also seeds the parser's parse cache, so small inputs are opened once.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+from speccheck.modules.base import Parser
+
+SNIFF_BYTES = 64 * 1024
+
+
+def _read_head(file_path, size):
+    with open(file_path, "rb") as handle:
+        return handle.read(size)
+
+
+def _whole_text(data, size):
+    """Return the decoded file when the sniffed prefix already holds all of it."""
+    if len(data) >= size:
+        return None
+    return _decode_text(data)
+
+
+def _decode_text(data):
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    # Match the universal-newline translation of text-mode reads.
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class ParserDispatcher:
+    """Filename/extension index over parser classes with header sniffing."""
+
+    def __init__(self, parser_classes, sniff_bytes=SNIFF_BYTES):
+        self.parser_classes = tuple(parser_classes)
+        self.sniff_bytes = sniff_bytes
+        self._by_suffix: dict[str, list[int]] = {}
+        self._unindexed: list[int] = []
+        for position, parser_class in enumerate(self.parser_classes):
+            suffixes = getattr(parser_class, "filename_suffixes", ())
+            if not suffixes:
+                self._unindexed.append(position)
+            for suffix in suffixes:
+                self._by_suffix.setdefault(suffix.lower(), []).append(position)
+
+    def candidates(self, file_path):
+        """Return parser classes indexed for this filename, in registry order."""
+        name = os.path.basename(str(file_path)).lower()
+        positions = set(self._unindexed)
+        for suffix, indexed in self._by_suffix.items():
+            if name.endswith(suffix):
+                positions.update(indexed)
+        return [self.parser_classes[position] for position in sorted(positions)]
+
+    def match(self, file_path, content=None):
+        """Return parser instances that accept ``file_path``.
+
+        ``content`` supplies the file's bytes from memory; ``file_path`` is then
+        only used as the file name and nothing is read from disk. An input
+        file that cannot be read raises ``OSError``.
+        """
+        parsers = [parser_class(file_path) for parser_class in self.candidates(file_path)]
+        parsers = [parser for parser in parsers if parser.has_valid_filename]
+        if not parsers:
+            return []
+        header = None
+        text = None
+        if content is not None:
+            text = _decode_text(content)
+            if text is None:
+                logging.debug("Could not decode %s as UTF-8 for parser detection", file_path)
+                return []
+            header = content[: self.sniff_bytes].decode("utf-8", errors="replace")
+        matched = []
+        for parser in parsers:
+            matches_header = getattr(type(parser), "matches_header", None)
+            if matches_header is not None:
+                if header is None:
+                    data = _read_head(file_path, self.sniff_bytes)
+                    header = data.decode("utf-8", errors="replace")
+                    text = _whole_text(data, self.sniff_bytes)
+                if not matches_header(header):
+                    continue
+            if text is not None and isinstance(parser, Parser):
+                # Small files are fully read while sniffing; reuse that read.
+                parser.prime_text(text)
+            if parser.has_valid_fileformat:
+                matched.append(parser)
+        return matched
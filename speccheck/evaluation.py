@@ -0,0 +1,319 @@
+"""Compiled criteria evaluation.
+
+Criteria rows are compiled once per (organism, assembly type) into an
+``EvaluationPlan``: rows are indexed by the parser software they apply to,
+regexes are precompiled, and operators are bound to callables. Evaluating a
+sample then only touches the rows relevant to each recovered parser.
+"""
+
+from __future__ import annotations
+
+import logging
+import operator as op_from_module
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+from speccheck.batch_logging import event
+
+STATUS_RANK = {"PASS": 0, "WARN": 1, "FAIL": 2, "NOT_EVALUATED": 3}  # nosec B105
+OPERATORS = {
+    "=": op_from_module.eq,
+    "==": op_from_module.eq,
+    "!=": op_from_module.ne,
+    "<": op_from_module.lt,
+    "<=": op_from_module.le,
+    ">": op_from_module.gt,
+    ">=": op_from_module.ge,
+}
+
+
+@dataclass(frozen=True)
+class CompiledCriterion:
+    """One criteria row with its comparison bound to a callable."""
+
+    field: Mapping
+    software: str
+    name: str
+    column: str
+    status_column: str
+    severity: str
+    reason: str
+    read_type: str | None
+    test: Callable[[object], bool]
+
+    @property
+    def is_depth(self) -> bool:
+        return self.software.startswith("DepthParser")
+
+    def has_value(self, result) -> bool:
+        """Return whether a parser result contains the metric this row checks."""
+        if self.is_depth:
+            if isinstance(result, list):
+                return any(
+                    entry.get("Read_type", "").lower() == self.read_type and self.name in entry
+                    for entry in result
+                )
+            return result.get("Read_type", "").lower() == self.read_type and self.name in result
+        if isinstance(result, list):
+            return any(self.name in entry for entry in result)
+        return self.name in result
+
+    def check(self, result) -> bool:
+        """Return whether a parser result satisfies this row."""
+        if self.is_depth:
+            # Depth.fetch_values returns a dict (single read type) or list (hybrid).
+            if isinstance(result, list):
+                matched = next(
+                    (
+                        entry
+                        for entry in result
+                        if entry.get("Read_type", "").lower() == self.read_type
+                    ),
+                    None,
+                )
+                if not matched:
+                    logging.warning(
+                        "No matching read type (%s) found for DepthParser",
+                        self.read_type,
+                        extra=event(self.software, self.name, "no matching read type"),
+                    )
+                    return False
+                return self.test(matched[self.name])
+            if self.read_type and result.get("Read_type", "").lower() != self.read_type:
+                logging.warning(
+                    "Depth row read type does not match criteria type (%s)",
+                    self.read_type,
+                    extra=event(self.software, self.name, "read type mismatch"),
+                )
+                return False
+        return self.test(result[self.name])
+
+
+def compile_criterion(field) -> CompiledCriterion:
+    """Compile one normalized criteria row."""
+    software = field["software"]
+    read_type = None
+    if software.startswith("DepthParser"):
+        read_type = software.rsplit(".", 1)[-1].lower() if "." in software else None
+    severity = field.get("severity", "fail").upper()
+    return CompiledCriterion(
+        field=field,
+        software=software,
+        name=field["field"],
+        column=f"{software}.{field['field']}.check",
+        status_column=f"{software}.{field['field']}.status",
+        severity=severity,
+        reason=(
+            f"{software}.{field['field']} "
+            f"{field['operator']}{field['value']} ({field.get('source', 'custom')})"
+        ),
+        read_type=read_type,
+        test=_compile_test(field),
+    )
+
+
+def _compile_test(field):
+    software = field["software"]
+    name = field["field"]
+    operator = field["operator"]
+    criteria_value = field["value"]
+
+    if operator == "regex":
+        pattern = re.compile(str(criteria_value))
+
+        def regex_test(field_value):
+            if pattern.match(str(field_value)):
+                return True
+            logging.warning(
+                "Failed check for %s: %s does not match regex %s",
+                software,
+                name,
+                criteria_value,
+                extra=event(software, name, f"does not match {criteria_value}"),
+            )
+            return False
+
+        return regex_test
+
+    compare = OPERATORS[operator]
+    numeric_threshold = isinstance(criteria_value, (int, float))
+
+    def compare_test(field_value):
+        if numeric_threshold and isinstance(field_value, str):
+            stripped = field_value.strip()
+            try:
+                if "." in stripped or "e" in stripped.lower():
+                    field_value = float(stripped)
+                else:
+                    field_value = int(stripped)
+            except ValueError:
+                logging.warning(
+                    "Failed check for %s: %s value %r is not a numeric scalar for operator %s",
+                    software,
+                    name,
+                    field_value,
+                    operator,
+                    extra=event(software, name, "not numeric"),
+                )
+                return False
+        if compare(field_value, criteria_value):
+            return True
+        logging.warning(
+            "Failed check for %s: %s %s %s",
+            software,
+            name,
+            operator,
+            criteria_value,
+            extra=event(software, name, f"failed {operator} {criteria_value}"),
+        )
+        return False
+
+    return compare_test
+
+
+def _index_by_software(criteria):
+    """Index compiled rows by every recovered parser name they apply to."""
+    index: dict[str, list[CompiledCriterion]] = {}
+    for field in criteria:
+        criterion = compile_criterion(field)
+        index.setdefault(criterion.software, []).append(criterion)
+        if criterion.is_depth:
+            index.setdefault("Depth", []).append(criterion)
+    return {software: tuple(rows) for software, rows in index.items()}
+
+
+@dataclass(frozen=True)
+class EvaluationPlan:
+    """Compiled baseline and species criteria for one organism and assembly type."""
+
+    baseline: Mapping[str, tuple[CompiledCriterion, ...]]
+    species: Mapping[str, tuple[CompiledCriterion, ...]]
+    species_checks_available: bool
+    baseline_overridden_count: int = 0
+
+    @classmethod
+    def build(cls, baseline_criteria, species_criteria, baseline_overridden_count=0):
+        """Compile criteria rows already filtered for an assembly type."""
+        return cls(
+            baseline=_index_by_software(baseline_criteria),
+            species=_index_by_software(species_criteria),
+            species_checks_available=bool(species_criteria),
+            baseline_overridden_count=baseline_overridden_count,
+        )
+
+    def evaluate(self, recovered_values, *, fail_on_not_evaluated=False):
+        """Return parsed values, check/status columns, and sample-level QC fields."""
+        qc_report = {}
+        baseline_checks_passed = True
+        species_checks_available = self.species_checks_available
+        species_checks_passed = True if species_checks_available else "NOT_AVAILABLE"
+        not_evaluated_count = 0
+        warning_reasons = []
+        failure_reasons = []
+
+        for software, result in recovered_values.items():
+            logging.info("Running checks for %s", software)
+            add_parsed_values(qc_report, software, result)
+            baseline_result, baseline_missing = _evaluate_rows(
+                self.baseline.get(software, ()),
+                software,
+                result,
+                qc_report,
+                warning_reasons,
+                failure_reasons,
+                fail_on_not_evaluated=fail_on_not_evaluated,
+            )
+            species_result, species_missing = _evaluate_rows(
+                self.species.get(software, ()),
+                software,
+                result,
+                qc_report,
+                warning_reasons,
+                failure_reasons,
+                fail_on_not_evaluated=fail_on_not_evaluated,
+            )
+            not_evaluated_count += baseline_missing + species_missing
+            qc_report[f"{software}.all_checks_passed"] = baseline_result and species_result
+            baseline_checks_passed = baseline_checks_passed and baseline_result
+            if species_checks_available:
+                species_checks_passed = species_checks_passed and species_result
+
+        parser_statuses = [
+            value for key, value in qc_report.items() if key.endswith(".all_checks_passed")
+        ]
+        qc_report["all_checks_passed"] = all(parser_statuses)
+        qc_report["speccheck_baseline_checks_passed"] = baseline_checks_passed
+        qc_report["speccheck_species_checks_passed"] = species_checks_passed
+        qc_report["speccheck_species_checks_available"] = species_checks_available
+        qc_report["speccheck_warning_count"] = len(warning_reasons)
+        qc_report["speccheck_failure_count"] = len(failure_reasons)
+        qc_report["speccheck_warning_reasons"] = "; ".join(warning_reasons) or "none"
+        qc_report["speccheck_failure_reasons"] = "; ".join(failure_reasons) or "none"
+        qc_report["speccheck_overall_status"] = (
+            "FAIL"
+            if failure_reasons or (fail_on_not_evaluated and not_evaluated_count)
+            else "WARN"
+            if warning_reasons
+            else "PASS"
+        )
+        qc_report["_not_evaluated_count"] = not_evaluated_count
+        return qc_report
+
+
+def _evaluate_rows(
+    criteria,
+    software,
+    result,
+    qc_report,
+    warning_reasons,
+    failure_reasons,
+    *,
+    fail_on_not_evaluated=False,
+):
+    group_passed = True
+    not_evaluated_count = 0
+    for criterion in criteria:
+        column = criterion.column
+        status_column = criterion.status_column
+        already_seen = column in qc_report
+        qc_report.setdefault(column, True)
+        qc_report.setdefault(status_column, "PASS")
+        if criterion.has_value(result):
+            if criterion.check(result):
+                continue
+            severity = criterion.severity
+            if severity == "WARN":
+                warning_reasons.append(criterion.reason)
+            else:
+                failure_reasons.append(criterion.reason)
+                group_passed = False
+                qc_report[column] = False
+            if STATUS_RANK[severity] > STATUS_RANK[qc_report[status_column]]:
+                qc_report[status_column] = severity
+        elif not already_seen:
+            qc_report[column] = "NOT_EVALUATED"
+            qc_report[status_column] = "NOT_EVALUATED"
+            group_passed = group_passed and not fail_on_not_evaluated
+            not_evaluated_count += 1
+            logging.warning(
+                "Criteria field %s.%s was not evaluated because the parsed %s output did not contain that metric.",
+                criterion.software,
+                criterion.name,
+                software,
+                extra=event(criterion.software, criterion.name, "not evaluated"),
+            )
+    return group_passed, not_evaluated_count
+
+
+def add_parsed_values(qc_report, software, result):
+    """Flatten one parser result into ``software.field`` report columns."""
+    if isinstance(result, list):
+        for entry in result:
+            read_type = entry.get("Read_type", "").lower()
+            for name, value in entry.items():
+                if name not in {"Read_type", "Sample_id"}:
+                    qc_report[f"{software}.{read_type}.{name}"] = value
+        return
+    for name, value in result.items():
+        qc_report[f"{software}.{name}"] = value
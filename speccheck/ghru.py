@@ -1,12 +1,16 @@
+import json
 import logging
 import os
 import re
 from dataclasses import dataclass, field
 
+from speccheck.atomic import atomic_write, file_lock
+
 _ASSEMBLY_RE = re.compile(r"^(?P<sample>.+)\.(?P<assembly>short|long|hybrid)\.tsv$")
 _QUAST_RE = re.compile(r"^ori_(?P<sample>.+)\.(?P<assembly>short|long|hybrid)\.report\.tsv$")
 _SYLPH_RE = re.compile(r"^(?P<sample>.+)_slyph_report\.tsv$")
 _ARIBA_RE = re.compile(r"^(?P<sample>.+)_mlst_report\.details\.tsv$")
+DISCOVERY_CACHE_FORMAT = 1
 _DEPTH_RE = re.compile(
     r"^(?P<sample>.+)\.(?P<assembly>short|long|hybrid)(?P<read_type>short_reads|long_reads)?\.depth\.tsv$"
 )
@@ -102,3 +106,81 @@ def discover_ghru_sample_files(
                 sample.sample_id,
             )
     return sample_map
+
+
+def load_ghru_sample_files(
+    output_dir: str, work_dir: str | None = None, cache_file: str | None = None
+) -> dict[str, GhruSampleFiles]:
+    """Discover GHRU outputs, sharing the result through ``cache_file``.
+
+    Jobs that collect slices of one output tree can point at the same cache on
+    a shared filesystem: the first job walks the tree and writes the cache
+    under an advisory lock, and the rest read it. The cache is reused while it
+    names the same directories and the modification times of the output
+    directory, its immediate subdirectories and the work directory are
+    unchanged; files added deeper in a work directory are not detected.
+    """
+    if not cache_file or not os.path.isdir(output_dir):
+        return discover_ghru_sample_files(output_dir, work_dir=work_dir)
+    key = _discovery_key(output_dir, work_dir)
+    sample_map = _read_discovery_cache(cache_file, key)
+    if sample_map is not None:
+        return sample_map
+    cache_dir = os.path.dirname(os.path.abspath(cache_file))
+    os.makedirs(cache_dir, exist_ok=True)
+    with file_lock(cache_file):
+        # Another job may have written the cache while this one waited.
+        sample_map = _read_discovery_cache(cache_file, key)
+        if sample_map is not None:
+            return sample_map
+        sample_map = discover_ghru_sample_files(output_dir, work_dir=work_dir)
+        with atomic_write(cache_file) as handle:
+            json.dump(
+                {
+                    **key,
+                    "samples": {
+                        sample_id: {"assembly_type": sample.assembly_type, "files": sample.files}
+                        for sample_id, sample in sample_map.items()
+                    },
+                },
+                handle,
+            )
+        logging.info("Wrote GHRU discovery cache %s", cache_file)
+    return sample_map
+
+
+def _discovery_key(output_dir, work_dir):
+    output_dir = os.path.abspath(output_dir)
+    work_dir = os.path.abspath(work_dir) if work_dir else None
+    directories = [output_dir]
+    with os.scandir(output_dir) as entries:
+        directories.extend(sorted(entry.path for entry in entries if entry.is_dir()))
+    if work_dir and os.path.isdir(work_dir):
+        directories.append(work_dir)
+    return {
+        "format": DISCOVERY_CACHE_FORMAT,
+        "output_dir": output_dir,
+        "work_dir": work_dir,
+        "directories": [[path, os.stat(path).st_mtime_ns] for path in directories],
+    }
+
+
+def _read_discovery_cache(cache_file, key):
+    try:
+        with open(cache_file, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logging.warning("Ignoring unreadable GHRU discovery cache %s: %s", cache_file, exc)
+        return None
+    if not isinstance(data, dict) or any(data.get(name) != value for name, value in key.items()):
+        logging.info("GHRU discovery cache %s is out of date; rediscovering", cache_file)
+        return None
+    logging.info("Reusing GHRU discovery cache %s", cache_file)
+    return {
+        sample_id: GhruSampleFiles(
+            sample_id=sample_id, assembly_type=entry["assembly_type"], files=list(entry["files"])
+        )
+        for sample_id, entry in data["samples"].items()
+    }
@@ -4,9 +4,9 @@ Workflow implementations live in focused modules. Imports from
 ``speccheck.main`` remain supported for existing users and scripts.
 """
 
-import csv
 import logging
 import os
+from typing import TYPE_CHECKING
 
 from speccheck.collect_workflow import _add_parser_aliases as _add_parser_aliases
 from speccheck.collect_workflow import (
@@ -14,12 +14,47 @@ from speccheck.collect_workflow import (
 )
 from speccheck.collect_workflow import (
     collect,
+    collect_batch,
     collect_ghru,
 )
-from speccheck.summary_workflow import summary
+from speccheck.criteria import load_criteria_store
 from speccheck.update_criteria import QUALIBACT_DEFAULT_URL, update_criteria_file
+from speccheck.worker_workflow import collect_worker
 
-__all__ = ["check", "collect", "collect_ghru", "summary"]
+if TYPE_CHECKING:
+    from speccheck.recheck_workflow import recheck
+    from speccheck.run_workflow import run
+    from speccheck.stream_workflow import collect_stream
+    from speccheck.summary_workflow import summary
+
+__all__ = [
+    "check",
+    "collect",
+    "collect_batch",
+    "collect_ghru",
+    "collect_stream",
+    "collect_worker",
+    "recheck",
+    "run",
+    "summary",
+]
+
+# Workflows that need pandas, numpy or plotly are imported on first use so
+# ``collect`` does not pay for them.
+_LAZY_WORKFLOWS = {
+    "collect_stream": "speccheck.stream_workflow",
+    "recheck": "speccheck.recheck_workflow",
+    "run": "speccheck.run_workflow",
+    "summary": "speccheck.summary_workflow",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_WORKFLOWS:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY_WORKFLOWS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def check(criteria_file, update=False, update_url=QUALIBACT_DEFAULT_URL):
@@ -44,11 +79,10 @@ def check(criteria_file, update=False, update_url=QUALIBACT_DEFAULT_URL):
         "species",
         "special_field",
     }
-    with open(criteria_file, encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        missing_columns = required_columns.difference(reader.fieldnames or ())
-        errors.extend(f"Missing required column: {column}" for column in sorted(missing_columns))
-        has_baseline = any(row.get("species") == "all" for row in reader)
+    store = load_criteria_store(criteria_file)
+    missing_columns = required_columns.difference(store.fieldnames)
+    errors.extend(f"Missing required column: {column}" for column in sorted(missing_columns))
+    has_baseline = "all" in store.species_names
 
     if not has_baseline:
         errors.append("No criteria found for species 'all'.")
@@ -0,0 +1,226 @@
+"""Input-fingerprint manifest and resume journal for pipeline collection.
+
+``collect_ghru`` records, per sample, what each collected CSV was built from:
+the input files with their size and modification time (or content sha256),
+the criteria sha256, the speccheck version, and the options and metadata row
+that shape the output. A rerun with ``incremental`` enabled skips samples
+whose fingerprint and concise and detailed CSVs are unchanged.
+
+The manifest is only written when a run ends. While a run is in progress,
+each finished sample is also appended to a journal, so a run that is killed
+outright (out of memory, pre-empted) can be resumed from its last finished
+sample. The journal is removed once the run completes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+
+from speccheck import __version__
+from speccheck.atomic import atomic_write, file_lock, fsync_enabled
+
+MANIFEST_NAME = ".speccheck_manifest.json"
+MANIFEST_FORMAT = 2
+JOURNAL_NAME = ".speccheck_journal.jsonl"
+
+
+def file_fingerprint(path, *, hash_contents=False):
+    """Return the identity of one input file.
+
+    With ``hash_contents`` the sha256 replaces the modification time, so a
+    file that was rewritten with identical bytes still counts as unchanged.
+    """
+    stat = os.stat(path)
+    fingerprint = {"path": os.path.abspath(path), "size": stat.st_size}
+    if hash_contents:
+        fingerprint["sha256"] = file_sha256(path)
+    else:
+        fingerprint["mtime_ns"] = stat.st_mtime_ns
+    return fingerprint
+
+
+def file_sha256(path):
+    """Return the hex sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def output_stat(path):
+    """Return the size and modification time that identify a written output file."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def sample_fingerprint(
+    input_files,
+    *,
+    assembly_type,
+    criteria_sha256,
+    options,
+    metadata_row=None,
+    hash_contents=False,
+):
+    """Return everything a collected CSV depends on, as JSON-compatible data."""
+    metadata_text = json.dumps(metadata_row or {}, sort_keys=True, default=str)
+    return {
+        "files": [
+            file_fingerprint(path, hash_contents=hash_contents) for path in sorted(input_files)
+        ],
+        "assembly_type": assembly_type,
+        "criteria_sha256": criteria_sha256,
+        "speccheck_version": __version__,
+        "options": options,
+        "metadata_sha256": hashlib.sha256(metadata_text.encode("utf-8")).hexdigest(),
+    }
+
+
+class CollectManifest:
+    """Per-sample fingerprints stored alongside collected CSVs."""
+
+    def __init__(self, path, samples=None):
+        self.path = path
+        self.samples = samples or {}
+        self._recorded = set()
+
+    @classmethod
+    def load(cls, output_dir):
+        """Read the manifest in ``output_dir``; a missing or unreadable one is empty."""
+        path = os.path.join(output_dir, MANIFEST_NAME)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable collect manifest %s: %s", path, exc)
+            return cls(path)
+        if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+            logging.info("Ignoring collect manifest %s with an unsupported format", path)
+            return cls(path)
+        return cls(path, dict(data.get("samples", {})))
+
+    def is_current(self, sample_id, fingerprint, output_files):
+        """Return whether every one of ``output_files`` was written from exactly ``fingerprint``."""
+        entry = self.samples.get(sample_id)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+        try:
+            outputs = {os.path.abspath(path): output_stat(path) for path in output_files}
+        except OSError:
+            return False
+        return entry.get("outputs") == outputs
+
+    def record(self, sample_id, fingerprint, output_files):
+        """Remember that ``output_files`` were just written from ``fingerprint``."""
+        self._recorded.add(sample_id)
+        self.samples[sample_id] = {
+            "fingerprint": fingerprint,
+            "outputs": {os.path.abspath(path): output_stat(path) for path in output_files},
+        }
+
+    def save(self):
+        """Merge this run's samples into the manifest on disk and write it atomically.
+
+        Runs sharing an output directory each update only the samples they
+        recorded, under an advisory lock, so concurrent runs keep each other's
+        entries.
+        """
+        with file_lock(self.path):
+            samples = CollectManifest.load(os.path.dirname(self.path) or ".").samples
+            samples.update({sample_id: self.samples[sample_id] for sample_id in self._recorded})
+            with atomic_write(self.path) as stream:
+                json.dump(
+                    {"format": MANIFEST_FORMAT, "samples": samples},
+                    stream,
+                    indent=1,
+                    sort_keys=True,
+                )
+        self.samples = samples
+
+
+class CollectJournal:
+    """Append-only log of the samples an unfinished run has completed.
+
+    Each line holds a sample's fingerprint and the size and modification time
+    of every file written for it, which cost one ``stat`` per file rather than
+    a reread. A line cut short by a killed process is ignored on load.
+    """
+
+    def __init__(self, path, samples=None):
+        self.path = path
+        self.samples = samples or {}
+        self._handle = None
+
+    @classmethod
+    def open(cls, output_dir, resume=False, part=""):
+        """Return the journal for ``output_dir``, keeping its entries only with ``resume``.
+
+        ``part`` names a separate journal for one of several jobs sharing ``output_dir``.
+        """
+        stem, suffix = os.path.splitext(JOURNAL_NAME)
+        path = os.path.join(output_dir, f"{stem}{part}{suffix}")
+        if not resume:
+            if os.path.exists(path):
+                os.unlink(path)
+            return cls(path)
+        samples = {}
+        try:
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                        samples[entry["sample_id"]] = entry
+                    except (ValueError, KeyError, TypeError):
+                        logging.debug("Ignoring incomplete journal line in %s", path)
+        except FileNotFoundError:
+            logging.info("No interrupted run to resume in %s", os.path.dirname(path) or ".")
+        return cls(path, samples)
+
+    def is_complete(self, sample_id, fingerprint, output_files):
+        """Return whether ``sample_id`` finished from ``fingerprint`` with intact outputs."""
+        entry = self.samples.get(sample_id)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+        outputs = {os.path.abspath(path): path for path in output_files}
+        if set(entry.get("outputs", {})) != set(outputs):
+            return False
+        try:
+            return all(
+                output_stat(path) == entry["outputs"][abs_path]
+                for abs_path, path in outputs.items()
+            )
+        except OSError:
+            return False
+
+    def record(self, sample_id, fingerprint, output_files):
+        """Append a completed sample and flush it before the next sample starts."""
+        entry = {
+            "sample_id": sample_id,
+            "fingerprint": fingerprint,
+            "outputs": {os.path.abspath(path): output_stat(path) for path in output_files},
+        }
+        if self._handle is None:
+            self._handle = open(self.path, "a", encoding="utf-8")
+        self._handle.write(json.dumps(entry, sort_keys=True) + "\n")
+        self._handle.flush()
+        if fsync_enabled():
+            os.fsync(self._handle.fileno())
+        self.samples[sample_id] = entry
+
+    def close(self):
+        """Close the journal, keeping it for a later resume."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def remove(self):
+        """Close and delete the journal once the run has finished."""
+        self.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
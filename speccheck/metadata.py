@@ -0,0 +1,152 @@
+"""Indexed access to sample metadata CSVs.
+
+Metadata sheets can hold hundreds of thousands of samples while a collect run
+needs only a few rows. ``MetadataIndex`` maps each ``sample_id`` to the byte
+range of its record, plus the column types pandas infers for the whole file,
+so one row can be fetched with a single seek and still convert exactly as a
+full ``pandas.read_csv`` would. The index is built once per file content and
+kept in the persistent config cache.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import logging
+import os
+import sys
+from functools import lru_cache
+
+from speccheck.config_cache import load_compiled, source_fingerprint
+
+SAMPLE_ID_COLUMN = "sample_id"
+
+
+class MetadataIndex:
+    """``sample_id`` → byte range index over one metadata CSV."""
+
+    def __init__(self, path, header, dtypes, offsets):
+        self.path = path
+        self.header = header
+        self.dtypes = dtypes
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, path, data: bytes):
+        """Scan ``data`` once, recording each record's byte range and column types."""
+        import pandas as pd
+
+        header_end = _record_end(data, 0)
+        header = data[:header_end]
+        columns = next(csv.reader(io.StringIO(header.decode("utf-8-sig"))), [])
+        if SAMPLE_ID_COLUMN not in columns:
+            raise ValueError("Metadata file must contain a 'sample_id' column")
+        key_position = columns.index(SAMPLE_ID_COLUMN)
+
+        offsets = {}
+        start = header_end
+        while start < len(data):
+            end = _record_end(data, start)
+            record = data[start:end]
+            if record.strip():
+                fields = next(csv.reader(io.StringIO(record.decode("utf-8"))), [])
+                sample_id = fields[key_position] if key_position < len(fields) else ""
+                if sample_id in offsets:
+                    raise ValueError("Metadata file contains duplicate sample_id values")
+                offsets[sample_id] = (start, end)
+            start = end
+
+        frame = pd.read_csv(io.BytesIO(data))
+        dtypes = {column: str(dtype) for column, dtype in frame.dtypes.items()}
+        dtypes[SAMPLE_ID_COLUMN] = "object"
+        return cls(path, header, dtypes, offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, sample_id):
+        return str(sample_id) in self.offsets
+
+    def __getitem__(self, sample_id):
+        rows = self.rows_for([sample_id])
+        if not rows:
+            raise KeyError(sample_id)
+        return rows[str(sample_id)]
+
+    def get(self, sample_id, default=None):
+        """Return one sample's metadata row, or ``default`` when it is not listed."""
+        return self[sample_id] if sample_id in self else default
+
+    def rows_for(self, sample_ids):
+        """Return ``{sample_id: row}`` for the listed samples present in the file.
+
+        Requested records are read in file order through one handle and
+        converted in a single parse, so batch runs join only the rows they
+        need instead of materializing the whole sheet.
+        """
+        import pandas as pd
+
+        ranges = sorted(
+            self.offsets[str(sample_id)] for sample_id in set(sample_ids) if sample_id in self
+        )
+        if not ranges:
+            return {}
+        chunks = [self.header]
+        with open(self.path, "rb") as handle:
+            for start, end in ranges:
+                handle.seek(start)
+                record = handle.read(end - start)
+                chunks.append(record if record.endswith(b"\n") else record + b"\n")
+        frame = pd.read_csv(io.BytesIO(b"".join(chunks)), dtype=self.dtypes)
+        frame.set_index(SAMPLE_ID_COLUMN, inplace=True)
+        return frame.to_dict("index")
+
+
+def load_metadata_index(metadata_file) -> MetadataIndex:
+    """Return the index for a metadata CSV, building it once per file content."""
+    if not os.path.isfile(metadata_file):
+        raise FileNotFoundError(f"Metadata file not found: {metadata_file}")
+    path = os.path.abspath(metadata_file)
+    stat = os.stat(path)
+    return _load_metadata_index(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_metadata_index(path, _mtime_ns, _size):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+
+    def build():
+        with open(path, "rb") as handle:
+            return MetadataIndex.build(path, handle.read())
+
+    index = load_compiled(
+        "metadata",
+        digest.hexdigest(),
+        build,
+        fingerprint=source_fingerprint(sys.modules[__name__]),
+    )
+    index.path = path
+    logging.info("Indexed metadata for %d samples from %s", len(index), path)
+    return index
+
+
+def _record_end(data, start):
+    """Return the offset just past the CSV record starting at ``start``.
+
+    A record ends at the first newline outside a quoted field, so quoted
+    values may contain newlines.
+    """
+    quotes = 0
+    position = start
+    while True:
+        newline = data.find(b"\n", position)
+        if newline < 0:
+            return len(data)
+        quotes += data.count(b'"', position, newline)
+        position = newline + 1
+        if quotes % 2 == 0:
+            return position
@@ -1,12 +1,21 @@
 import csv
+import io
 
-from speccheck.modules.base import Parser
+from speccheck.modules.base import Parser, first_line
 
 
 class Ariba(Parser):
     software_name = "Ariba"
     description = "ARIBA MLST/contamination summary"
     supported_filenames = "TSV with gene, allele, coverage, and heterozygosity columns"
+    filename_suffixes = (".tsv",)
+    required_headers = ["gene", "allele", "cov", "pc", "ctgs", "depth", "hetmin", "hets"]
+
+    @classmethod
+    def matches_header(cls, header):
+        line = first_line(header)
+        # Check if the first line is the header and has the required headers
+        return "\t" in line and line.strip().split("\t") == cls.required_headers
 
     @property
     def has_valid_filename(self):
@@ -14,24 +23,10 @@ class Ariba(Parser):
 
     @property
     def has_valid_fileformat(self):
-
-        required_headers = ["gene", "allele", "cov", "pc", "ctgs", "depth", "hetmin", "hets"]
-        with open(self.file_path, encoding="utf-8") as file:
-            first_line = file.readline()
-            if "\t" not in first_line:
-                return False
-
-        with open(self.file_path, encoding="utf-8") as file:
-            lines = file.readlines()
-            lines = [line for line in lines if line.strip()]
-        # Check if the first line is the header and has the required headers
-        if first_line.strip().split("\t") != required_headers:
-            return False
-
-        return True
+        return self.matches_header(self.read_text())
 
     def fetch_values(self):
-        with open(self.file_path, encoding="utf-8") as file:
+        with io.StringIO(self.read_text()) as file:
             reader = csv.DictReader(file, delimiter="\t")
             result = {"passed": 0, "total": 0, "percent": 0, "not_called": 0}
             for row in reader:
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import csv
+import io
 from abc import ABC, abstractmethod
+from pathlib import Path
 
 
 def parse_scalar(value):
@@ -19,15 +21,56 @@ def parse_scalar(value):
         return text
 
 
+def first_line(header: str) -> str:
+    """Return the first line of a sniffed file prefix without its line ending."""
+    return header.partition("\n")[0].rstrip("\r")
+
+
 class Parser(ABC):
     """Contract implemented by every Speccheck input parser."""
 
     software_name: str | None = None
     description = ""
     supported_filenames = ""
+    # Lower-case filename endings used to index parsers during dispatch. Parsers
+    # that leave this empty are offered every file.
+    filename_suffixes: tuple[str, ...] = ()
 
     def __init__(self, file_path):
         self.file_path = str(file_path)
+        self._parse_cache = {}
+
+    def cached(self, key, loader):
+        """Return ``loader()``, computing it at most once per parser instance.
+
+        Detection and extraction share this cache so a file is read and parsed
+        once. ``collect_files`` clears it after ``fetch_values`` to keep memory flat.
+        """
+        cache = self.__dict__.setdefault("_parse_cache", {})
+        if key not in cache:
+            cache[key] = loader()
+        return cache[key]
+
+    def read_text(self) -> str:
+        """Return the file content as text, reading it from disk once."""
+        return self.cached("text", lambda: Path(self.file_path).read_text(encoding="utf-8"))
+
+    def prime_text(self, text: str) -> None:
+        """Seed the text cache with content already read by the caller."""
+        self.__dict__.setdefault("_parse_cache", {})["text"] = text
+
+    def clear_cache(self) -> None:
+        """Drop cached file content and parse results."""
+        self.__dict__.get("_parse_cache", {}).clear()
+
+    @classmethod
+    def matches_header(cls, header: str) -> bool:
+        """Return whether a bounded file prefix could belong to this parser.
+
+        This is a cheap necessary check run before ``has_valid_fileformat``; it
+        must never reject a file the full validation would accept.
+        """
+        return True
 
     @property
     @abstractmethod
@@ -49,16 +92,28 @@ class SingleRowTsvParser(Parser):
 
     required_headers: tuple[str, ...] = ()
     exact_headers = True
+    filename_suffixes = (".tsv",)
+
+    @classmethod
+    def matches_header(cls, header: str) -> bool:
+        line = first_line(header)
+        return all(name in line for name in cls.required_headers)
 
     @property
     def has_valid_filename(self) -> bool:
         return self.file_path.endswith(".tsv")
 
+    def _table(self) -> tuple[list[str], list[dict]]:
+        def load():
+            reader = csv.DictReader(io.StringIO(self.read_text()), delimiter="\t")
+            return reader.fieldnames or [], list(reader)
+
+        return self.cached("table", load)
+
     @property
     def has_valid_fileformat(self) -> bool:
         try:
-            with open(self.file_path, encoding="utf-8", newline="") as handle:
-                headers = csv.DictReader(handle, delimiter="\t").fieldnames or []
+            headers, _rows = self._table()
         except (OSError, UnicodeError, csv.Error):
             return False
         if self.exact_headers:
@@ -66,8 +121,7 @@ class SingleRowTsvParser(Parser):
         return set(self.required_headers).issubset(headers)
 
     def fetch_values(self) -> dict:
-        with open(self.file_path, encoding="utf-8", newline="") as handle:
-            rows = list(csv.DictReader(handle, delimiter="\t"))
+        _headers, rows = self._table()
         if len(rows) != 1:
             raise ValueError("The file must contain exactly one row of values.")
         return {key: parse_scalar(value) for key, value in rows[0].items() if value is not None}
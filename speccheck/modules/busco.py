@@ -17,6 +17,7 @@ class Busco(Parser):
     software_name = "Busco"
     description = "BUSCO complete, duplicated, fragmented, and missing orthologue percentages"
     supported_filenames = "short_summary*.txt produced by BUSCO"
+    filename_suffixes = (".txt",)
 
     @property
     def has_valid_filename(self) -> bool:
@@ -24,7 +25,7 @@ class Busco(Parser):
         return name.startswith("short_summary") and name.endswith(".txt")
 
     def _text(self) -> str:
-        return Path(self.file_path).read_text(encoding="utf-8")
+        return self.read_text()
 
     @property
     def has_valid_fileformat(self) -> bool:
@@ -1,6 +1,7 @@
 import csv
+import io
 
-from speccheck.modules.base import Parser
+from speccheck.modules.base import Parser, first_line
 
 
 class Depth(Parser):
@@ -15,6 +16,13 @@ class Depth(Parser):
     software_name = "Depth"
     description = "GHRU short-, long-, or hybrid-read assembly depth"
     supported_filenames = "TSV containing Sample_id, Read_type, and Depth"
+    filename_suffixes = (".tsv",)
+    required_headers = ("Sample_id", "Read_type", "Depth")
+
+    @classmethod
+    def matches_header(cls, header):
+        line = first_line(header)
+        return all(name in line for name in cls.required_headers)
 
     @property
     def has_valid_filename(self):
@@ -24,59 +32,60 @@ class Depth(Parser):
     @property
     def has_valid_fileformat(self):
         """Check if file has required headers"""
-        required_headers = ["Sample_id", "Read_type", "Depth"]
         try:
-            with open(self.file_path, encoding="utf-8") as file:
-                reader = csv.DictReader(file, delimiter="\t")
-                headers = reader.fieldnames
-                if not headers:
-                    return False
-                return all(h in headers for h in required_headers)
+            headers, _rows = self._table()
         except (OSError, csv.Error):
             return False
+        if not headers:
+            return False
+        return all(h in headers for h in self.required_headers)
+
+    def _table(self):
+        def load():
+            reader = csv.DictReader(io.StringIO(self.read_text()), delimiter="\t")
+            return reader.fieldnames, list(reader)
+
+        return self.cached("table", load)
 
     def fetch_values(self):
         """Read the file and return parsed rows (dict or list)."""
-        with open(self.file_path, encoding="utf-8") as file:
-            reader = csv.DictReader(file, delimiter="\t")
-            rows = list(reader)
-
-            # Check for empty file
-            if not rows:
-                raise ValueError("The file is empty.")
-
-            parsed_rows = []
-
-            for row in rows:
-                parsed_row = {}
-                for key, value in row.items():
-                    if value is None or value.strip() == "":
-                        parsed_row[key] = None
-                        continue
-                    value = value.strip()
-
-                    if key == "Depth":
-                        try:
-                            parsed_row[key] = float(value)
-                        except ValueError:
-                            parsed_row[key] = value
-                    else:
+        _headers, rows = self._table()
+        # Check for empty file
+        if not rows:
+            raise ValueError("The file is empty.")
+
+        parsed_rows = []
+
+        for row in rows:
+            parsed_row = {}
+            for key, value in row.items():
+                if value is None or value.strip() == "":
+                    parsed_row[key] = None
+                    continue
+                value = value.strip()
+
+                if key == "Depth":
+                    try:
+                        parsed_row[key] = float(value)
+                    except ValueError:
                         parsed_row[key] = value
+                else:
+                    parsed_row[key] = value
 
-                parsed_rows.append(parsed_row)
+            parsed_rows.append(parsed_row)
 
-            # Validate based on row count and read types
-            if len(parsed_rows) == 1:
-                read_type = parsed_rows[0].get("Read_type", "").lower()
-                if read_type not in ("short", "long"):
-                    raise ValueError("Invalid Read_type. Must be 'short' or 'long'.")
-                return parsed_rows[0]
+        # Validate based on row count and read types
+        if len(parsed_rows) == 1:
+            read_type = parsed_rows[0].get("Read_type", "").lower()
+            if read_type not in ("short", "long"):
+                raise ValueError("Invalid Read_type. Must be 'short' or 'long'.")
+            return parsed_rows[0]
 
-            elif len(parsed_rows) == 2:
-                read_types = {r.get("Read_type", "").lower() for r in parsed_rows}
-                if read_types != {"short", "long"}:
-                    raise ValueError("Hybrid file must contain one 'short' and one 'long' row.")
-                return parsed_rows
+        elif len(parsed_rows) == 2:
+            read_types = {r.get("Read_type", "").lower() for r in parsed_rows}
+            if read_types != {"short", "long"}:
+                raise ValueError("Hybrid file must contain one 'short' and one 'long' row.")
+            return parsed_rows
 
-            else:
-                raise ValueError("File must contain either one or two rows (short/long or hybrid).")
+        else:
+            raise ValueError("File must contain either one or two rows (short/long or hybrid).")
@@ -12,14 +12,18 @@ class Fastp(Parser):
     software_name = "Fastp"
     description = "fastp short-read quality metrics before and after filtering"
     supported_filenames = "*.json containing fastp summary.before_filtering/after_filtering"
+    filename_suffixes = (".json",)
+
+    @classmethod
+    def matches_header(cls, header: str) -> bool:
+        return header.lstrip().startswith("{")
 
     @property
     def has_valid_filename(self) -> bool:
         return self.file_path.lower().endswith(".json")
 
     def _load(self):
-        with open(self.file_path, encoding="utf-8") as handle:
-            return json.load(handle)
+        return self.cached("report", lambda: json.loads(self.read_text()))
 
     @property
     def has_valid_fileformat(self) -> bool:
@@ -16,6 +16,8 @@ file_path : str
     Path to the QUAST file to be processed.
 """
 
+import io
+
 from speccheck.modules.base import Parser, parse_scalar
 
 
@@ -33,6 +35,13 @@ class Quast(Parser):
     software_name = "Quast"
     description = "QUAST transposed assembly report"
     supported_filenames = "*report.tsv with one metric/value pair per row"
+    filename_suffixes = ("report.tsv",)
+
+    @classmethod
+    def matches_header(cls, header):
+        # Every QUAST row is a metric/value pair, so the first row must be one too.
+        line = next((line for line in header.splitlines() if line.strip()), "")
+        return line.count("\t") == 1
 
     @property
     def has_valid_filename(self):
@@ -41,7 +50,7 @@ class Quast(Parser):
     @property
     def has_valid_fileformat(self):
         try:
-            values = self.fetch_values()
+            values = self._values()
         except ValueError:
             return False
         required_keys = {
@@ -54,11 +63,14 @@ class Quast(Parser):
         return required_keys.issubset(values)
 
     def fetch_values(self):
-        with open(self.file_path, encoding="utf-8") as file:
-            lines = file.readlines()
+        return dict(self._values())
+
+    def _values(self):
+        return self.cached("values", self._parse)
 
+    def _parse(self):
         values = {}
-        for line in lines:
+        for line in io.StringIO(self.read_text()).readlines():
             if not line.strip():
                 continue
             parts = line.rstrip("\n").split("\t")
@@ -1,13 +1,38 @@
 import csv
+import io
 import re
 
-from speccheck.modules.base import Parser
+from speccheck.modules.base import Parser, first_line
 
 
 class Sylph(Parser):
     software_name = "Sylph"
     description = "Sylph taxonomic abundance and ANI profile"
     supported_filenames = "Sylph profile TSV"
+    filename_suffixes = (".tsv",)
+    required_headers = [
+        "Sample_file",
+        "Genome_file",
+        "Taxonomic_abundance",
+        "Sequence_abundance",
+        "Adjusted_ANI",
+        "Eff_cov",
+        "ANI_5-95_percentile",
+        "Eff_lambda",
+        "Lambda_5-95_percentile",
+        "Median_cov",
+        "Mean_cov_geq1",
+        "Containment_ind",
+        "Naive_ANI",
+        "kmers_reassigned",
+        "Contig_name",
+    ]
+
+    @classmethod
+    def matches_header(cls, header):
+        line = first_line(header)
+        # Check if the first line is the header and has the required headers
+        return "\t" in line and line.strip().split("\t") == cls.required_headers
 
     @property
     def has_valid_filename(self):
@@ -15,40 +40,10 @@ class Sylph(Parser):
 
     @property
     def has_valid_fileformat(self):
-
-        required_headers = [
-            "Sample_file",
-            "Genome_file",
-            "Taxonomic_abundance",
-            "Sequence_abundance",
-            "Adjusted_ANI",
-            "Eff_cov",
-            "ANI_5-95_percentile",
-            "Eff_lambda",
-            "Lambda_5-95_percentile",
-            "Median_cov",
-            "Mean_cov_geq1",
-            "Containment_ind",
-            "Naive_ANI",
-            "kmers_reassigned",
-            "Contig_name",
-        ]
-        with open(self.file_path, encoding="utf-8") as file:
-            first_line = file.readline()
-            if "\t" not in first_line:
-                return False
-
-        with open(self.file_path, encoding="utf-8") as file:
-            lines = file.readlines()
-            lines = [line for line in lines if line.strip()]
-        # Check if the first line is the header and has the required headers
-        if first_line.strip().split("\t") != required_headers:
-            return False
-
-        return True
+        return self.matches_header(self.read_text())
 
     def fetch_values(self):
-        with open(self.file_path, encoding="utf-8") as file:
+        with io.StringIO(self.read_text()) as file:
             reader = csv.DictReader(file, delimiter="\t")
             result = {
                 "genomes": "",
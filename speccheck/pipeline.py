@@ -0,0 +1,222 @@
+"""Staged collection for high-latency filesystems.
+
+Collecting a sample reads its input files, parses and evaluates them, and
+writes two CSVs. Run one sample after another, the CPU waits on every
+``open()`` of an NFS or Lustre file and the disk waits on every evaluation.
+``collect_staged`` overlaps the three steps across samples with an asyncio
+pipeline::
+
+    read (thread pool) -> parse + evaluate (thread or process pool) -> write (thread)
+
+Stages are connected by bounded queues, so at most ``max_in_flight`` samples'
+input bytes are held in memory at once, and results are yielded in sample
+order exactly as ``collect_workflow._collect_ghru_samples`` yields them. With
+one evaluation worker, log lines from different samples may interleave;
+worker processes' logs are replayed in sample order as usual.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from speccheck import collect_workflow
+from speccheck.collect import write_to_file
+from speccheck.quarantine import SampleFailure, collection_stage
+from speccheck.util import get_all_files
+
+_DONE = object()
+
+
+def collect_staged(samples, options, context, *, workers=1, io_threads=4, max_in_flight=None):
+    """Yield ``(sample, result)`` in sample order with reads, evaluation and writes overlapped.
+
+    ``result`` is the CSV path, or the report when ``options`` selects a result
+    sink, or a ``SampleFailure`` with ``options.continue_on_error``. It is None
+    when no input file matched a parser and nothing was written.
+    """
+    if io_threads < 1:
+        raise ValueError("io_threads must be at least 1")
+    max_in_flight = max_in_flight or 2 * (io_threads + workers)
+    results = queue.Queue(maxsize=max_in_flight)
+    stop = threading.Event()
+
+    def run():
+        try:
+            asyncio.run(
+                _run_stages(
+                    samples, options, context, workers, io_threads, max_in_flight, results, stop
+                )
+            )
+        except BaseException as exc:  # noqa: BLE001 - re-raised in the consuming thread
+            _put(results, exc, stop)
+        _put(results, _DONE, stop)
+
+    thread = threading.Thread(target=run, name="speccheck-pipeline", daemon=True)
+    thread.start()
+    try:
+        while (item := results.get()) is not _DONE:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+async def _run_stages(samples, options, context, workers, io_threads, max_in_flight, results, stop):
+    loop = asyncio.get_running_loop()
+    read_queue = asyncio.Queue(maxsize=max_in_flight)
+    evaluate_queue = asyncio.Queue(maxsize=max_in_flight)
+    with (
+        ThreadPoolExecutor(io_threads, thread_name_prefix="speccheck-read") as readers,
+        _evaluation_executor(context, workers) as evaluators,
+        ThreadPoolExecutor(1, thread_name_prefix="speccheck-write") as writer,
+    ):
+        # Worker processes hold their own copy of the context from the initializer.
+        evaluate, evaluate_context = (
+            (_evaluate_in_worker, None) if workers > 1 else (_evaluate_in_thread, context)
+        )
+
+        async def read_stage():
+            for sample in samples:
+                reading = loop.run_in_executor(readers, _read_inputs, sample, options)
+                await read_queue.put((sample, reading))
+            await read_queue.put(None)
+
+        async def evaluate_one(sample, reading):
+            contents = await reading
+            if isinstance(contents, SampleFailure):
+                return contents, None, []
+            return await loop.run_in_executor(
+                evaluators, evaluate, sample, options, contents, evaluate_context
+            )
+
+        async def evaluate_stage():
+            while (item := await read_queue.get()) is not None:
+                sample, reading = item
+                # Errors travel with the task and are raised in sample order;
+                # those of samples abandoned after an earlier failure are dropped.
+                evaluating = asyncio.ensure_future(evaluate_one(sample, reading))
+                evaluating.add_done_callback(_ignore_abandoned)
+                await evaluate_queue.put((sample, evaluating))
+            await evaluate_queue.put(None)
+
+        async def write_stage():
+            while (item := await evaluate_queue.get()) is not None:
+                sample, evaluating = item
+                result = collect_workflow._replay_worker_result(await evaluating)
+                if options.writes_csv and not isinstance(result, SampleFailure):
+                    result = await loop.run_in_executor(
+                        writer, _write_output, sample, options, result
+                    )
+                await loop.run_in_executor(None, _put, results, (sample, result), stop)
+                if stop.is_set():
+                    return
+
+        upstream = [asyncio.ensure_future(read_stage()), asyncio.ensure_future(evaluate_stage())]
+        try:
+            await write_stage()
+        finally:
+            # Stop reading ahead once the consumer has gone or a sample failed.
+            for task in upstream:
+                task.cancel()
+            await asyncio.gather(*upstream, return_exceptions=True)
+            while not evaluate_queue.empty():
+                if (item := evaluate_queue.get_nowait()) is not None:
+                    item[1].cancel()
+
+
+def _evaluation_executor(context, workers):
+    if workers > 1:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=collect_workflow._init_collection_worker,
+            initargs=(context, logging.getLogger().getEffectiveLevel()),
+        )
+    return ThreadPoolExecutor(1, thread_name_prefix="speccheck-evaluate")
+
+
+def _ignore_abandoned(task):
+    if not task.cancelled():
+        task.exception()
+
+
+def _put(results, item, stop):
+    while not stop.is_set():
+        try:
+            results.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _read_inputs(sample, options):
+    """Return ``{absolute path: bytes}`` for a sample's inputs, in collection order."""
+    try:
+        with collection_stage("read"):
+            contents = {}
+            for path in get_all_files(sample.files):
+                with open(path, "rb") as handle:
+                    contents[path] = handle.read()
+            return contents
+    except Exception as exc:
+        if not options.continue_on_error:
+            raise
+        return SampleFailure.from_exception(sample.sample_id, exc, sample.files)
+
+
+def _evaluate(sample, options, contents, context):
+    logging.info(
+        "Collecting GHRU outputs for %s (%s assembly) from %d file(s)",
+        sample.sample_id,
+        sample.assembly_type,
+        len(sample.files),
+    )
+    try:
+        return collect_workflow.collect_report(
+            options.organism,
+            [],
+            options.criteria_file,
+            sample.sample_id,
+            metadata_file=options.metadata_file,
+            allow_unknown_organism=options.allow_unknown_organism,
+            assembly_type=sample.assembly_type,
+            fail_on_not_evaluated=options.fail_on_not_evaluated,
+            input_contents=contents,
+            _context=context,
+        )
+    except Exception as exc:
+        if not options.continue_on_error:
+            raise
+        return SampleFailure.from_exception(sample.sample_id, exc, sample.files)
+
+
+def _evaluate_in_thread(sample, options, contents, context):
+    return _evaluate(sample, options, contents, context), None, []
+
+
+def _evaluate_in_worker(sample, options, contents, _context):
+    return collect_workflow._call_buffering_logs(
+        _evaluate, sample, options, contents, collect_workflow._WORKER_CONTEXT
+    )
+
+
+def _write_output(sample, options, qc_report):
+    output_file = collect_workflow._ghru_output_file(sample, options)
+    if qc_report is None:
+        return None
+    try:
+        logging.info("Writing results to %s", os.path.abspath(output_file))
+        with collection_stage("write"):
+            write_to_file(output_file, qc_report)
+        logging.info("All checks completed for %s", sample.sample_id)
+    except Exception as exc:
+        if not options.continue_on_error:
+            raise
+        return SampleFailure.from_exception(sample.sample_id, exc, sample.files)
+    return output_file
@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
+import sys
 from dataclasses import dataclass
 from functools import lru_cache
 
 import pandas as pd
 
+from speccheck.config_cache import load_compiled, source_fingerprint
 from speccheck.update_criteria import QUALIBACT_SNAPSHOT_PATH
 
 QUALIBACT_ECOLI_V1_SOURCE = (
@@ -71,8 +75,19 @@ def _number(value):
 @lru_cache(maxsize=1)
 def load_thresholds() -> dict[str, tuple[TierThreshold, ...]]:
     """Load the packaged, release-pinned QualiBact threshold snapshot."""
+    with open(QUALIBACT_SNAPSHOT_PATH, "rb") as handle:
+        data = handle.read()
+    return load_compiled(
+        "qualibact",
+        hashlib.sha256(data).hexdigest(),
+        lambda: _parse_thresholds(data.decode("utf-8")),
+        fingerprint=source_fingerprint(sys.modules[__name__]),
+    )
+
+
+def _parse_thresholds(text) -> dict[str, tuple[TierThreshold, ...]]:
     grouped: dict[str, list[TierThreshold]] = {}
-    with open(QUALIBACT_SNAPSHOT_PATH, encoding="utf-8") as handle:
+    with io.StringIO(text, newline="") as handle:
         for row in csv.DictReader(handle):
             columns = METRIC_COLUMNS.get(row["metric"])
             if columns is None:
@@ -0,0 +1,111 @@
+"""Per-sample failure capture for batch collection.
+
+By default one sample that raises, for example on a malformed ``Depth`` file
+or ambiguous parser matches, stops a whole ``collect-batch`` or
+``collect-pipeline`` run. With ``continue_on_error`` the failure is recorded
+instead and the remaining samples are collected. Failures are written to
+``speccheck_quarantine.csv`` in the output directory, one row per sample with
+the collection stage that failed, the exception and the sample's input files,
+and the run ends with ``QuarantinedSamplesError``.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+from speccheck.atomic import atomic_write
+
+QUARANTINE_STEM = "speccheck_quarantine"
+QUARANTINE_COLUMNS = ("sample_id", "stage", "exception", "message", "input_files")
+_STAGE_ATTRIBUTE = "speccheck_stage"
+
+
+@contextmanager
+def collection_stage(name):
+    """Label exceptions raised in the block with the collection stage ``name``."""
+    try:
+        yield
+    except Exception as exc:
+        if not hasattr(exc, _STAGE_ATTRIBUTE):
+            try:
+                setattr(exc, _STAGE_ATTRIBUTE, name)
+            except AttributeError:
+                logging.debug("Cannot label %s with collection stage %s", type(exc), name)
+        raise
+
+
+@dataclass(frozen=True)
+class SampleFailure:
+    """One quarantined sample."""
+
+    sample_id: str
+    stage: str
+    exception: str
+    message: str
+    input_files: tuple[str, ...]
+
+    @classmethod
+    def from_exception(cls, sample_id, exc, input_files):
+        failure = cls(
+            sample_id=sample_id,
+            stage=getattr(exc, _STAGE_ATTRIBUTE, "collect"),
+            exception=type(exc).__name__,
+            message=str(exc),
+            input_files=tuple(str(path) for path in input_files),
+        )
+        logging.error(
+            "Quarantined sample %s: %s failed with %s: %s",
+            sample_id,
+            failure.stage,
+            failure.exception,
+            failure.message,
+        )
+        logging.debug("Traceback for quarantined sample %s", sample_id, exc_info=exc)
+        return failure
+
+
+class QuarantinedSamplesError(RuntimeError):
+    """Raised after a ``continue_on_error`` run in which some samples failed."""
+
+    def __init__(self, failures, report_path):
+        self.failures = list(failures)
+        self.report_path = report_path
+        super().__init__(
+            f"{len(self.failures)} sample(s) failed and were quarantined; see {report_path}"
+        )
+
+
+def is_quarantine_report(filename):
+    """Return whether ``filename`` is a quarantine report."""
+    return filename.startswith(QUARANTINE_STEM) and filename.endswith(".csv")
+
+
+def write_quarantine_report(output_dir, failures, part=""):
+    """Write ``failures`` to the quarantine report; remove a stale one when empty.
+
+    ``part`` names a separate report for one of several jobs sharing ``output_dir``.
+    """
+    path = os.path.join(output_dir, f"{QUARANTINE_STEM}{part}.csv")
+    if not failures:
+        if os.path.exists(path):
+            os.unlink(path)
+        return None
+    with atomic_write(path, newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=QUARANTINE_COLUMNS)
+        writer.writeheader()
+        for failure in failures:
+            row = asdict(failure)
+            row["input_files"] = ";".join(failure.input_files)
+            writer.writerow(row)
+    return path
+
+
+def raise_for_failures(output_dir, failures, part=""):
+    """Write the quarantine report and raise if any sample failed."""
+    report_path = write_quarantine_report(output_dir, failures, part=part)
+    if failures:
+        raise QuarantinedSamplesError(failures, report_path)
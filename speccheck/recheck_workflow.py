@@ -0,0 +1,236 @@
+"""Recheck workflow: re-evaluate stored parsed values against new criteria.
+
+``collect`` writes every parsed metric into ``detailed.<sample>.csv``. When
+only the criteria change (for example after ``speccheck check --update``),
+those values are enough to evaluate the cohort again without reparsing any
+tool output. Samples are grouped by organism and assembly type and evaluated
+column-wise, then written back in the same per-sample layout as ``collect``.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import math
+import os
+
+import numpy as np
+
+from speccheck.archive import CollectedArchive, is_archive_file
+from speccheck.batch_evaluation import evaluate_frame, reports_frame, software_order
+from speccheck.collect import write_to_file
+from speccheck.collect_workflow import (
+    _collection_provenance,
+    _evaluation_plan_for,
+    _prepare_collection_context,
+    _resolve_organism,
+    _threshold_source_for,
+)
+from speccheck.registry import get_parser_classes
+
+DETAILED_PREFIX = "detailed."
+_RESULT_SUFFIXES = (".check", ".status", ".all_checks_passed")
+
+
+def recheck(
+    input_dir,
+    output_dir,
+    criteria_file,
+    organism=None,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=None,
+):
+    """Re-evaluate ``detailed.*.csv`` files in ``input_dir`` with ``criteria_file``.
+
+    The organism is re-resolved from species fields unless ``organism`` is
+    given, the assembly type and input file count are kept from the stored
+    provenance, and ``fail_on_not_evaluated`` defaults to each sample's stored
+    setting. Metadata columns are carried over unless ``metadata_file`` is
+    given, in which case they are replaced from it. Returns the written
+    per-sample CSV paths.
+    """
+    stored = read_detailed_reports(input_dir)
+    if not stored:
+        raise ValueError(f"No detailed.*.csv files found under {os.path.abspath(input_dir)}")
+    os.makedirs(output_dir, exist_ok=True)
+    software_names = _parser_software_names()
+    stored_samples = {}
+    for name, row in stored:
+        sample = _stored_sample(name, row, software_names)
+        if not sample["recovered"]:
+            logging.warning("No parsed values found in %s; skipping", name)
+            continue
+        stored_samples[name] = sample
+    context = _prepare_collection_context(
+        criteria_file,
+        metadata_file,
+        [sample["sample_id"] for sample in stored_samples.values()],
+    )
+
+    groups = {}
+    samples = {}
+    for name, sample in stored_samples.items():
+        sample_organism = _resolve_organism(
+            organism,
+            sample["recovered"],
+            context.species_fields,
+            allow_unknown=allow_unknown_organism,
+        )
+        strict = fail_on_not_evaluated
+        if strict is None:
+            strict = sample["fail_on_not_evaluated"]
+        sample["organism"] = sample_organism
+        sample["strict"] = strict
+        samples[name] = sample
+        groups.setdefault((sample_organism, sample["assembly_type"], strict), []).append(name)
+
+    written = []
+    for (group_organism, assembly_type, strict), names in groups.items():
+        plan = _evaluation_plan_for(context, group_organism, assembly_type)
+        recovered = {name: samples[name]["recovered"] for name in names}
+        evaluated = evaluate_frame(
+            plan,
+            reports_frame(recovered),
+            software_order=software_order(recovered),
+            fail_on_not_evaluated=strict,
+        )
+        threshold_source = _threshold_source_for(context, group_organism)
+        for name, values in zip(names, evaluated.to_dict(orient="records"), strict=True):
+            sample = samples[name]
+            qc_report = {
+                column: _python_value(value)
+                for column, value in values.items()
+                if not _is_missing(value)
+            }
+            qc_report.update(
+                _collection_provenance(
+                    sample_id=sample["sample_id"],
+                    organism=group_organism,
+                    assembly_type=assembly_type,
+                    criteria_file=criteria_file,
+                    criteria_sha256=context.criteria_sha256,
+                    input_file_count=sample["input_file_count"],
+                    not_evaluated_count=qc_report["speccheck_not_evaluated_count"],
+                    fail_on_not_evaluated=strict,
+                    threshold_source=threshold_source,
+                    baseline_overridden_count=plan.baseline_overridden_count,
+                )
+            )
+            if metadata_file:
+                qc_report.update(context.metadata.get(sample["sample_id"], {}))
+            else:
+                qc_report.update(sample["metadata"])
+            output_file = os.path.join(output_dir, name[len(DETAILED_PREFIX) :])
+            write_to_file(output_file, qc_report)
+            logging.info(
+                "Rechecked %s: %s", sample["sample_id"], qc_report["speccheck_overall_status"]
+            )
+            written.append(output_file)
+
+    logging.info(
+        "Rechecked %d sample(s) against %s (sha256 %s)",
+        len(written),
+        context.criteria_file,
+        context.criteria_sha256,
+    )
+    return sorted(written)
+
+
+def read_detailed_reports(directory):
+    """Return ``(file name, row)`` for each ``detailed.*.csv`` directly in ``directory``.
+
+    Detailed CSVs packed by ``compact`` into archives in ``directory`` are
+    read as well; ``directory`` may also be such an archive.
+    """
+    if os.path.isfile(directory) and is_archive_file(directory):
+        return _read_archived_reports(directory)
+    reports = []
+    for name in sorted(os.listdir(directory)):
+        if is_archive_file(name):
+            reports.extend(_read_archived_reports(os.path.join(directory, name)))
+            continue
+        if not (name.startswith(DETAILED_PREFIX) and name.endswith(".csv")):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8", newline="") as handle:
+            for row in csv.DictReader(handle):
+                reports.append((name, row))
+                break
+    return reports
+
+
+def _parser_software_names():
+    return {parser.software_name or parser.__name__ for parser in get_parser_classes()}
+
+
+def _stored_sample(name, row, software_names):
+    """Split one detailed row into parsed values, metadata and stored provenance."""
+    recovered = {}
+    metadata = {}
+    for column, value in row.items():
+        software, _, field = column.partition(".")
+        if software in software_names and field:
+            if not column.endswith(_RESULT_SUFFIXES):
+                recovered.setdefault(software, {})[field] = value
+        elif column not in {"sample_id", "all_checks_passed"} and not column.startswith(
+            "speccheck_"
+        ):
+            metadata[column] = value
+    recovered = {
+        software: _unflatten_read_types(recovered[software])
+        for software in _stored_software_order(row, recovered)
+    }
+    return {
+        "sample_id": row.get("sample_id") or name[len(DETAILED_PREFIX) : -len(".csv")],
+        "recovered": recovered,
+        "metadata": metadata,
+        "assembly_type": row.get("speccheck_assembly_type") or "short",
+        "fail_on_not_evaluated": row.get("speccheck_fail_on_not_evaluated") == "True",
+        "input_file_count": int(row.get("speccheck_input_file_count") or 0),
+    }
+
+
+def _stored_software_order(row, recovered):
+    """Return parsers in their original recovery order as far as it is known.
+
+    Detailed CSVs store columns alphabetically, but stored reasons list
+    parsers in the order they were evaluated; parsers not named there follow
+    in column order.
+    """
+    order = []
+    for column in ("speccheck_failure_reasons", "speccheck_warning_reasons"):
+        for reason in (row.get(column) or "").split("; "):
+            software = reason.partition(".")[0]
+            if software.startswith("DepthParser"):
+                software = "Depth"
+            if software in recovered and software not in order:
+                order.append(software)
+    return order + [software for software in recovered if software not in order]
+
+
+def _unflatten_read_types(values):
+    """Rebuild per-read-type results flattened as ``<read_type>.<field>``."""
+    if "Read_type" in values or not all("." in field for field in values):
+        return values
+    entries = {}
+    for field, value in values.items():
+        read_type, _, name = field.partition(".")
+        entries.setdefault(read_type, {"Read_type": read_type})[name] = value
+    return list(entries.values())
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _python_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _read_archived_reports(path):
+    with CollectedArchive(path) as archive:
+        return [
+            (name, row)
+            for name in archive.detailed_names()
+            if (row := archive.read_row(name)) is not None
+        ]
@@ -11,8 +11,7 @@ from __future__ import annotations
 from collections.abc import Mapping, MutableMapping
 from functools import lru_cache
 from importlib.metadata import entry_points
-
-import pandas as pd
+from typing import TYPE_CHECKING
 
 from speccheck.modules.ariba import Ariba
 from speccheck.modules.base import Parser
@@ -23,21 +22,21 @@ from speccheck.modules.fastp import Fastp
 from speccheck.modules.quast import Quast
 from speccheck.modules.speciator import Speciator
 from speccheck.modules.sylph import Sylph
-from speccheck.plot_modules.plot_ariba import Plot_Ariba
-from speccheck.plot_modules.plot_checkm import Plot_Checkm
-from speccheck.plot_modules.plot_quast import Plot_Quast
-from speccheck.plot_modules.plot_speciator import Plot_Speciator
-from speccheck.plot_modules.plot_sylph import Plot_Sylph
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 PARSER_CLASSES = (Ariba, Busco, Checkm, Depth, Fastp, Quast, Speciator, Sylph)
 PARSER_ENTRY_POINT_GROUP = "speccheck.parsers"
 
-PLOT_CLASSES = {
-    "Ariba": Plot_Ariba,
-    "Checkm": Plot_Checkm,
-    "Quast": Plot_Quast,
-    "Speciator": Plot_Speciator,
-    "Sylph": Plot_Sylph,
+# Plot modules import plotly, so they are resolved on first use rather than
+# whenever the registry is imported.
+PLOT_MODULES = {
+    "Ariba": ("speccheck.plot_modules.plot_ariba", "Plot_Ariba"),
+    "Checkm": ("speccheck.plot_modules.plot_checkm", "Plot_Checkm"),
+    "Quast": ("speccheck.plot_modules.plot_quast", "Plot_Quast"),
+    "Speciator": ("speccheck.plot_modules.plot_speciator", "Plot_Speciator"),
+    "Sylph": ("speccheck.plot_modules.plot_sylph", "Plot_Sylph"),
 }
 
 METRIC_EQUIVALENTS: Mapping[str, tuple[tuple[str, ...], ...]] = {
@@ -67,6 +66,24 @@ def get_parser_classes() -> tuple[type[Parser], ...]:
     return tuple(parsers)
 
 
+@lru_cache(maxsize=1)
+def get_plot_classes() -> dict[str, type]:
+    """Return plotting classes by software name, importing them on first use."""
+    from importlib import import_module
+
+    return {
+        software: getattr(import_module(module_name), class_name)
+        for software, (module_name, class_name) in PLOT_MODULES.items()
+    }
+
+
+def __getattr__(name):
+    # ``PLOT_CLASSES`` stays importable for existing callers.
+    if name == "PLOT_CLASSES":
+        return get_plot_classes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def add_metric_aliases(values: MutableMapping, software: str) -> None:
     """Populate equivalent metric names from the first available value."""
     for equivalent_names in METRIC_EQUIVALENTS.get(software, ()):
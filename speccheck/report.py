@@ -5,7 +5,8 @@ import pandas as pd
 from jinja2 import Template
 
 from speccheck import __version__ as VERSION
-from speccheck.registry import PLOT_CLASSES, add_frame_metric_aliases
+from speccheck.config import DEFAULT_STYLE_PATH, get_default_template_path
+from speccheck.registry import add_frame_metric_aliases, get_plot_classes
 from speccheck.report_tables import (
     build_concise_report_frame,
     build_full_detail_table,
@@ -21,19 +22,6 @@ from speccheck.report_tables import (
     summary_table,
 )
 
-PACKAGE_DIR = Path(__file__).resolve().parent
-TEMPLATE_DIR = PACKAGE_DIR / "templates"
-DEFAULT_TEMPLATE_PATH = TEMPLATE_DIR / "report.html"
-DEFAULT_STYLE_PATH = TEMPLATE_DIR / "report.css"
-
-
-def get_default_template_path():
-    return str(DEFAULT_TEMPLATE_PATH)
-
-
-def get_default_style_path():
-    return str(DEFAULT_STYLE_PATH)
-
 
 def get_embedded_report_styles(template_path=None):
     style_path = DEFAULT_STYLE_PATH
@@ -53,7 +41,7 @@ def make_footer():
 
 def load_modules_with_checks():
     """Return the explicitly supported plotting classes."""
-    module_dict = dict(PLOT_CLASSES)
+    module_dict = dict(get_plot_classes())
     loaded_classes = ", ".join(cls.__name__ for cls in module_dict.values())
     logging.debug("Loaded modules: %s", loaded_classes)
     return module_dict
@@ -0,0 +1,107 @@
+"""Fused run: collect a GHRU output tree and summarise it in one process.
+
+``collect-pipeline`` followed by ``summary`` writes two CSVs per sample, walks
+the output directory again and reads every CSV back with pandas. ``run``
+hands each evaluated report straight to the summary stage instead, so the
+cohort reports are written without per-sample files; they are the same
+reports ``summary`` writes for the same samples.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+from speccheck.collect_workflow import (
+    GhruCollectOptions,
+    _collect_ghru_samples,
+    _prepare_collection_context,
+    _select_ghru_samples,
+)
+from speccheck.quarantine import SampleFailure, raise_for_failures
+from speccheck.summary_workflow import merge_summary_reports, write_summary_reports
+
+
+def run(
+    ghru_output_dir,
+    output,
+    criteria_file,
+    template,
+    organism=None,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=False,
+    work_dir=None,
+    sample_ids=None,
+    workers=1,
+    io_threads=0,
+    continue_on_error=False,
+    discovery_cache=None,
+    species="Speciator.speciesName",
+    plot=False,
+    xlsx_output=None,
+    interactive_tables=True,
+    qualifyr_style=False,
+    qualibact_compat=False,
+    qualibact_warn_as_fail=False,
+):
+    """Collect every sample in a GHRU tree and write the summary reports to ``output``.
+
+    Collection options behave as for ``collect_ghru`` and report options as
+    for ``summary``. With ``continue_on_error``, failing samples are left out
+    of the reports, listed in a quarantine report in ``output``, and
+    ``QuarantinedSamplesError`` is raised once the reports are written.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if io_threads < 0:
+        raise ValueError("io_threads must not be negative")
+    os.makedirs(output, exist_ok=True)
+    sample_map, selected_samples = _select_ghru_samples(
+        ghru_output_dir, sample_ids, work_dir=work_dir, discovery_cache=discovery_cache
+    )
+    context = _prepare_collection_context(criteria_file, metadata_file, selected_samples)
+    for sample_id in selected_samples:
+        if not sample_map[sample_id].assembly_type:
+            raise ValueError(f"Could not infer assembly type for sample {sample_id}")
+    options = GhruCollectOptions(
+        output_dir=output,
+        criteria_file=criteria_file,
+        organism=organism,
+        metadata_file=metadata_file,
+        allow_unknown_organism=allow_unknown_organism,
+        fail_on_not_evaluated=fail_on_not_evaluated,
+        continue_on_error=continue_on_error,
+        return_reports=True,
+    )
+
+    qc_reports = []
+    failures = []
+    samples = [sample_map[sample_id] for sample_id in selected_samples]
+    for _sample, qc_report in _collect_ghru_samples(samples, options, context, workers, io_threads):
+        if isinstance(qc_report, SampleFailure):
+            failures.append(qc_report)
+        elif qc_report is not None:
+            qc_reports.append(qc_report)
+
+    merged_data = merge_summary_reports(qc_reports)
+    if merged_data:
+        write_summary_reports(
+            merged_data,
+            output,
+            species,
+            template,
+            plot=plot,
+            xlsx_output=xlsx_output,
+            interactive_tables=interactive_tables,
+            qualifyr_style=qualifyr_style,
+            qualibact_compat=qualibact_compat,
+            qualibact_warn_as_fail=qualibact_warn_as_fail,
+        )
+        logging.info(
+            "Wrote reports for %d sample(s) to %s", len(merged_data), os.path.abspath(output)
+        )
+    else:
+        logging.error("No samples were collected; no reports written.")
+    if continue_on_error:
+        raise_for_failures(output, failures)
@@ -0,0 +1,66 @@
+"""Samplesheet parsing for batch collection.
+
+A samplesheet is a CSV (or TSV, by ``.tsv`` extension) with one row per
+sample. ``sample_id`` and ``files`` are required; ``files`` holds one or more
+file paths, directories, or glob patterns separated by ``;``. Relative
+patterns are resolved against the samplesheet's directory. ``assembly_type``
+and ``organism`` are optional and fall back to the command-line defaults.
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+
+REQUIRED_COLUMNS = ("sample_id", "files")
+OPTIONAL_COLUMNS = ("assembly_type", "organism")
+FILE_SEPARATOR = ";"
+
+
+@dataclass(frozen=True)
+class SamplesheetRow:
+    sample_id: str
+    files: tuple[str, ...]
+    assembly_type: str | None = None
+    organism: str | None = None
+
+
+def read_samplesheet(path):
+    """Return samplesheet rows in file order, rejecting malformed sheets."""
+    delimiter = "\t" if str(path).lower().endswith(".tsv") else ","
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle, delimiter=delimiter)
+        fieldnames = [name.strip() for name in reader.fieldnames or []]
+        missing = [column for column in REQUIRED_COLUMNS if column not in fieldnames]
+        if missing:
+            raise ValueError(
+                f"Samplesheet {path} is missing required column(s): {', '.join(missing)}"
+            )
+        reader.fieldnames = fieldnames
+        rows = []
+        seen = set()
+        for line_number, row in enumerate(reader, start=2):
+            sample_id = (row.get("sample_id") or "").strip()
+            patterns = [
+                pattern.strip()
+                for pattern in (row.get("files") or "").split(FILE_SEPARATOR)
+                if pattern.strip()
+            ]
+            if not sample_id and not patterns:
+                continue
+            if not sample_id:
+                raise ValueError(f"Samplesheet row {line_number}: missing sample_id")
+            if not patterns:
+                raise ValueError(f"Samplesheet row {line_number}: no files for {sample_id}")
+            if sample_id in seen:
+                raise ValueError(f"Samplesheet row {line_number}: duplicate sample_id {sample_id}")
+            seen.add(sample_id)
+            rows.append(
+                SamplesheetRow(
+                    sample_id=sample_id,
+                    files=tuple(os.path.join(base_dir, pattern) for pattern in patterns),
+                    assembly_type=(row.get("assembly_type") or "").strip() or None,
+                    organism=(row.get("organism") or "").strip() or None,
+                )
+            )
+    return rows
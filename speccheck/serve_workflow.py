@@ -0,0 +1,278 @@
+"""Warm collection daemon on a Unix socket, and its client.
+
+``serve`` validates the criteria and opens metadata once, then answers
+requests on a local Unix socket for as long as it runs, so each sample costs
+only its own parsing and evaluation rather than interpreter start-up,
+imports and criteria loading. Requests use the ``collect --stream`` spec
+format, one JSON object per line, with two additions::
+
+    {"sample_id": "S1", "files": ["/abs/S1/*.txt"], "output_file": "/abs/S1.csv"}
+    {"command": "status"}
+
+With ``output_file`` the server also writes the sample's concise and detailed
+CSVs exactly as ``collect`` would. Each line is answered by one JSON line in
+the ``collect --stream`` result format; ``status`` reports the loaded
+criteria, and ``shutdown`` stops the server. A connection may carry any
+number of requests; paths are resolved by the server, so clients send
+absolute paths.
+
+Before every request the server checks the criteria file. When its sha256
+has changed, the criteria are validated and swapped in; an edit that fails
+validation is logged and the previous criteria stay in use.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from collections import deque
+
+from speccheck import __version__
+from speccheck.collect_workflow import _prepare_collection_context
+from speccheck.criteria import load_criteria_store, validate_criteria
+from speccheck.stream_workflow import _collect_stream_record, _read_specs
+
+SERVER_COMMANDS = ("status", "shutdown")
+
+
+def serve(
+    socket_path,
+    criteria_file,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=False,
+    assembly_type="short",
+    organism=None,
+    ready=None,
+):
+    """Serve collection requests on ``socket_path`` until a ``shutdown`` request.
+
+    Connections are handled in threads that share one collection context.
+    The socket is created with mode 0600, so only the server's user can
+    connect.
+    ``ready``, if given, is a ``threading.Event`` set once the socket accepts
+    connections. Raises ``FileExistsError`` if another server is already
+    listening on ``socket_path`` or it is not a socket; a stale socket file
+    is replaced.
+    """
+    _remove_stale_socket(socket_path)
+    context = _WarmContext(criteria_file, metadata_file)
+    defaults = {
+        "criteria_file": criteria_file,
+        "metadata_file": metadata_file,
+        "allow_unknown_organism": allow_unknown_organism,
+        "fail_on_not_evaluated": fail_on_not_evaluated,
+        "assembly_type": assembly_type,
+        "organism": organism,
+    }
+    server = _CollectServer(socket_path, _RequestHandler)
+    server.context = context
+    server.defaults = defaults
+    try:
+        logging.info("Serving collection requests on %s", socket_path)
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+    logging.info("Stopped serving on %s", socket_path)
+
+
+def send_requests(socket_path, requests, timeout=None):
+    """Send request dicts to a server and yield its response dicts in order.
+
+    Requests are sent from a background thread while responses are read, so
+    any number of them can be pipelined over one connection.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path)
+
+        def send():
+            try:
+                for request in requests:
+                    connection.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            finally:
+                try:
+                    connection.shutdown(socket.SHUT_WR)
+                except OSError:
+                    pass
+
+        sender = threading.Thread(target=send, name="speccheck-client-send", daemon=True)
+        sender.start()
+        with connection.makefile("r", encoding="utf-8") as responses:
+            for line in responses:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    raise ConnectionError(
+                        f"Server on {socket_path} closed the connection mid-response"
+                    ) from None
+        sender.join()
+
+
+def send_spec_lines(socket_path, lines, timeout=None):
+    """Send NDJSON lines to a server and yield one result per non-blank line, in order.
+
+    Lines that are not JSON objects are not sent; they are answered locally
+    with an ``{"ok": false, "error": ...}`` record, as ``collect --stream``
+    answers them. Everything else is validated by the server.
+    """
+    # One slot per line in send order: None for a sent request, else its local error.
+    slots = deque()
+
+    def requests():
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                error = f"Line {line_number}: invalid JSON: {exc}"
+            else:
+                error = (
+                    None
+                    if isinstance(request, dict)
+                    else f"Line {line_number}: expected a JSON object"
+                )
+            if error:
+                slots.append({"sample_id": None, "ok": False, "error": error})
+                continue
+            slots.append(None)
+            yield request
+
+    for response in send_requests(socket_path, requests(), timeout=timeout):
+        while (local := slots.popleft()) is not None:
+            yield local
+        yield response
+    yield from slots
+
+
+class _WarmContext:
+    """The server's collection context, reloaded when the criteria change."""
+
+    def __init__(self, criteria_file, metadata_file):
+        self.criteria_file = os.path.abspath(criteria_file)
+        self.metadata_file = metadata_file
+        self._lock = threading.Lock()
+        self.context = _prepare_collection_context(criteria_file, metadata_file)
+        logging.info("Loaded criteria %s (sha256 %s)", criteria_file, self.context.criteria_sha256)
+
+    def current(self):
+        with self._lock:
+            try:
+                sha256 = load_criteria_store(self.criteria_file).sha256
+            except OSError as exc:
+                logging.error("Cannot read criteria file, keeping loaded criteria: %s", exc)
+                return self.context
+            if sha256 != self.context.criteria_sha256:
+                self._reload(sha256)
+            return self.context
+
+    def _reload(self, sha256):
+        errors, warnings = validate_criteria(self.criteria_file)
+        for warning in warnings:
+            logging.warning("%s", warning)
+        if errors:
+            for error in errors:
+                logging.error("%s", error)
+            logging.error(
+                "Changed criteria file %s is invalid; keeping sha256 %s",
+                self.criteria_file,
+                self.context.criteria_sha256,
+            )
+            return
+        try:
+            context = _prepare_collection_context(self.criteria_file, self.metadata_file)
+        except (Exception, SystemExit) as exc:  # noqa: BLE001 - keep serving the old criteria
+            logging.error(
+                "Could not load changed criteria file %s, keeping sha256 %s: %s",
+                self.criteria_file,
+                self.context.criteria_sha256,
+                exc,
+            )
+            return
+        self.context = context
+        logging.info("Reloaded criteria %s (sha256 %s)", self.criteria_file, sha256)
+
+
+class _CollectServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # Requests read and write files as the server's user: only it may connect.
+        previous = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            text = line.decode("utf-8", errors="replace")
+            if not text.strip():
+                continue
+            response = self._respond(text)
+            self.wfile.write((json.dumps(response, default=str, allow_nan=False) + "\n").encode())
+            self.wfile.flush()
+            if response.get("command") == "shutdown":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+    def _respond(self, text):
+        try:
+            request = json.loads(text)
+        except ValueError:
+            request = None
+        context = self.server.context.current()
+        if isinstance(request, dict) and "command" in request:
+            return _command_response(request["command"], context)
+        spec = next(_read_specs([text]))
+        output_file = request.get("output_file") if isinstance(request, dict) else None
+        if output_file is not None and not isinstance(output_file, str):
+            return {"sample_id": spec.get("sample_id"), "ok": False, "error": "bad output_file"}
+        return _collect_stream_record(spec, self.server.defaults, context, output_file)
+
+
+def _command_response(command, context):
+    if command not in SERVER_COMMANDS:
+        return {
+            "command": command,
+            "ok": False,
+            "error": f"command must be one of: {', '.join(SERVER_COMMANDS)}",
+        }
+    return {
+        "command": command,
+        "ok": True,
+        "version": __version__,
+        "criteria_file": context.criteria_file,
+        "criteria_sha256": context.criteria_sha256,
+        "pid": os.getpid(),
+    }
+
+
+def _remove_stale_socket(socket_path):
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+    raise FileExistsError(f"A speccheck server is already listening on {socket_path}")
@@ -0,0 +1,286 @@
+"""Batch result sinks: many samples per output file instead of two CSVs each.
+
+Batch and pipeline collection can append every sample's detailed report to
+one JSONL, Parquet or SQLite file, or to a few files sharded by a stable hash
+of the sample ID. Records are handed to a dedicated writer thread through a
+bounded queue, so parsing never waits on file I/O and the writer only ever
+appends sequentially. ``summary`` reads these files directly.
+
+Each record holds the same fields and values as ``detailed.<sample>.csv``,
+with check results kept as booleans. Parquet and SQLite store one row per
+sample with ``sample_id`` and the record as JSON text, so samples with
+different parser outputs share one schema. Sink files are rewritten by each
+run that targets the same output directory; each shard is written to a
+partial file and renamed into place only when the run succeeds (see
+``speccheck.atomic``), so a failed or concurrent run never leaves a torn file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import queue
+import sqlite3
+import threading
+import zlib
+
+from speccheck.atomic import commit_partial, discard_partial, reserve_partial
+from speccheck.collect import sanitize_report
+
+SINK_FORMATS = ("jsonl", "parquet", "sqlite")
+OUTPUT_FORMATS = ("csv", *SINK_FORMATS)
+RESULTS_STEM = "speccheck_results"
+SINK_SUFFIXES = {"jsonl": ".jsonl", "parquet": ".parquet", "sqlite": ".sqlite"}
+QUEUE_SIZE = 1024
+_STOP = object()
+
+
+def shard_for(sample_id, shards):
+    """Return the shard a sample is written to; stable across runs and platforms."""
+    return zlib.crc32(str(sample_id).encode("utf-8")) % shards
+
+
+def sink_paths(output_dir, output_format, shards=1, part=""):
+    """Return the sink file paths for ``output_format`` split into ``shards`` files.
+
+    ``part`` is appended to the file stem so that independent jobs writing to
+    one directory, such as ``collect-pipeline --shard``, use separate files.
+    """
+    suffix = SINK_SUFFIXES[output_format]
+    stem = f"{RESULTS_STEM}{part}"
+    if shards == 1:
+        return [os.path.join(output_dir, f"{stem}{suffix}")]
+    return [
+        os.path.join(output_dir, f"{stem}.{index:05d}-of-{shards:05d}{suffix}")
+        for index in range(shards)
+    ]
+
+
+def is_sink_file(filename):
+    """Return whether ``filename`` names a result sink written by ``ResultSink``."""
+    return filename.startswith(RESULTS_STEM) and filename.endswith(tuple(SINK_SUFFIXES.values()))
+
+
+class ResultSink:
+    """Write detailed sample reports to sharded files from a writer thread."""
+
+    def __init__(self, output_dir, output_format, shards=1, queue_size=QUEUE_SIZE, part=""):
+        if output_format not in SINK_FORMATS:
+            raise ValueError(f"output format must be one of: {', '.join(SINK_FORMATS)}")
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_format = output_format
+        self.paths = sink_paths(output_dir, output_format, shards, part=part)
+        writer_class = _SHARD_WRITERS[output_format]
+        self._partial_paths = [reserve_partial(path) for path in self.paths]
+        self._writers = []
+        try:
+            for partial_path in self._partial_paths:
+                self._writers.append(writer_class(partial_path))
+        except BaseException:
+            self._discard()
+            raise
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self.count = 0
+        self._thread = threading.Thread(target=self._run, name="speccheck-result-sink")
+        self._thread.start()
+
+    def write(self, qc_report):
+        """Queue one sample's report; blocks only while the queue is full."""
+        if self._error is not None:
+            raise RuntimeError("Result sink writer failed") from self._error
+        self._queue.put(qc_report)
+        self.count += 1
+
+    def close(self):
+        """Flush queued reports, close every shard and move it into place."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        for writer in self._writers:
+            try:
+                writer.close()
+            except Exception as exc:  # noqa: BLE001 - report the first failure below
+                self._error = self._error or exc
+        if self._error is not None:
+            self._discard()
+            raise RuntimeError("Result sink writer failed") from self._error
+        for partial_path, path in zip(self._partial_paths, self.paths, strict=True):
+            commit_partial(partial_path, path)
+        logging.info(
+            "Wrote %d sample record(s) to %d %s file(s)",
+            self.count,
+            len(self.paths),
+            self.output_format,
+        )
+
+    def abort(self):
+        """Stop the writer and remove partial shards, leaving earlier results in place."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        for writer in self._writers:
+            try:
+                writer.close()
+            except Exception:  # noqa: BLE001 - the shard is discarded anyway
+                logging.debug("Result sink shard failed to close while aborting")
+        self._discard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _discard(self):
+        for partial_path in self._partial_paths:
+            discard_partial(partial_path)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if self._error is not None:
+                # Keep draining so producers never block on a dead writer.
+                continue
+            try:
+                record = report_record(item)
+                shard = shard_for(record["sample_id"], len(self._writers))
+                self._writers[shard].write(record["sample_id"], record)
+            except Exception as exc:  # noqa: BLE001 - re-raised from write()/close()
+                self._error = exc
+
+
+def report_record(qc_report):
+    """Return the JSON-compatible record stored for one detailed report."""
+    return {key: _json_value(value) for key, value in sanitize_report(qc_report).items()}
+
+
+def read_sink_records(path):
+    """Yield the records stored in one sink file, in write order."""
+    if path.endswith(SINK_SUFFIXES["jsonl"]):
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.endswith(SINK_SUFFIXES["sqlite"]):
+        connection = sqlite3.connect(path)
+        try:
+            for (report,) in connection.execute("SELECT report FROM results ORDER BY rowid"):
+                yield json.loads(report)
+        finally:
+            connection.close()
+    elif path.endswith(SINK_SUFFIXES["parquet"]):
+        parquet = _import_parquet()
+        for batch in parquet.ParquetFile(path).iter_batches(columns=["report"]):
+            for report in batch.column(0).to_pylist():
+                yield json.loads(report)
+    else:
+        raise ValueError(f"Unrecognised result sink file: {path}")
+
+
+class _JsonlShard:
+    def __init__(self, path):
+        self._handle = open(path, "w", encoding="utf-8")
+
+    def write(self, _sample_id, record):
+        self._handle.write(_dumps(record) + "\n")
+
+    def close(self):
+        self._handle.close()
+
+
+class _SqliteShard:
+    BATCH_SIZE = 1000
+
+    def __init__(self, path):
+        # The writer thread, not the creating thread, uses this connection.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE results (sample_id TEXT PRIMARY KEY, report TEXT NOT NULL)"
+        )
+        self._pending = []
+
+    def write(self, sample_id, record):
+        self._pending.append((sample_id, _dumps(record)))
+        if len(self._pending) >= self.BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO results (sample_id, report) VALUES (?, ?)", self._pending
+            )
+        self._pending = []
+
+    def close(self):
+        try:
+            if self._pending:
+                self._flush()
+        finally:
+            self._connection.close()
+
+
+class _ParquetShard:
+    ROW_GROUP_SIZE = 10_000
+
+    def __init__(self, path):
+        self._parquet = _import_parquet()
+        import pyarrow as pa
+
+        self._pa = pa
+        self._schema = pa.schema([("sample_id", pa.string()), ("report", pa.string())])
+        self._writer = self._parquet.ParquetWriter(path, self._schema)
+        self._pending = []
+
+    def write(self, sample_id, record):
+        self._pending.append((sample_id, _dumps(record)))
+        if len(self._pending) >= self.ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        sample_ids, reports = zip(*self._pending, strict=True)
+        table = self._pa.table(
+            {"sample_id": list(sample_ids), "report": list(reports)}, schema=self._schema
+        )
+        self._writer.write_table(table)
+        self._pending = []
+
+    def close(self):
+        try:
+            if self._pending:
+                self._flush()
+        finally:
+            self._writer.close()
+
+
+_SHARD_WRITERS = {"jsonl": _JsonlShard, "parquet": _ParquetShard, "sqlite": _SqliteShard}
+
+
+def _import_parquet():
+    try:
+        import pyarrow.parquet as parquet
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet output requires pyarrow; install it with "
+            "`pip install 'speccheck-qc[parquet]'`."
+        ) from exc
+    return parquet
+
+
+def _dumps(record):
+    return json.dumps(record, default=str, allow_nan=False)
+
+
+def _json_value(value):
+    if type(value).__module__ == "numpy":
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
@@ -0,0 +1,179 @@
+"""Streaming collection: NDJSON sample specs in, NDJSON results out.
+
+Each input line is a JSON object describing one sample::
+
+    {"sample_id": "S1", "files": ["S1/*.txt"], "assembly_type": "short", "organism": null}
+
+``files`` may also be a single path or glob string; ``assembly_type`` and
+``organism`` are optional and fall back to the run defaults. For every input
+line one JSON record is written, in input order, as soon as that sample has
+been evaluated::
+
+    {"sample_id": "S1", "ok": true, "report": {...}}
+    {"sample_id": "S2", "ok": false, "error": "..."}
+
+``report`` holds the same keys and values as the sample's ``detailed.*.csv``.
+No CSV files are written.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from speccheck import collect_workflow
+from speccheck.collect import write_to_file
+from speccheck.collect_workflow import (
+    _call_buffering_logs,
+    _init_collection_worker,
+    _prepare_collection_context,
+    _replay_worker_result,
+    collect_report,
+)
+from speccheck.sinks import report_record
+
+
+def collect_stream(
+    input_stream,
+    output_stream,
+    criteria_file,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=False,
+    assembly_type="short",
+    organism=None,
+    workers=1,
+    max_in_flight=None,
+):
+    """Evaluate NDJSON sample specs from ``input_stream`` and write NDJSON results.
+
+    With ``workers`` greater than one, samples are evaluated in a process
+    pool with at most ``max_in_flight`` samples (default ``2 * workers``)
+    submitted ahead of the next record to be written, so memory stays
+    bounded however long the input is. Invalid specs and samples that fail
+    produce ``"ok": false`` records instead of stopping the stream. Returns
+    ``(samples written, samples failed)``.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    max_in_flight = max_in_flight or 2 * workers
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    context = _prepare_collection_context(criteria_file, metadata_file)
+    defaults = {
+        "criteria_file": criteria_file,
+        "metadata_file": metadata_file,
+        "allow_unknown_organism": allow_unknown_organism,
+        "fail_on_not_evaluated": fail_on_not_evaluated,
+        "assembly_type": assembly_type,
+        "organism": organism,
+    }
+    counts = {"written": 0, "failed": 0}
+
+    def emit(record):
+        output_stream.write(json.dumps(record, default=str, allow_nan=False) + "\n")
+        output_stream.flush()
+        counts["written"] += 1
+        counts["failed"] += not record["ok"]
+
+    specs = _read_specs(input_stream)
+    if workers == 1:
+        for spec in specs:
+            emit(_collect_stream_record(spec, defaults, context))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_collection_worker,
+            initargs=(context, logging.getLogger().getEffectiveLevel()),
+        ) as executor:
+            pending = deque()
+            for spec in specs:
+                if len(pending) >= max_in_flight:
+                    _emit_next(pending, emit)
+                pending.append(executor.submit(_collect_stream_record_in_worker, spec, defaults))
+            while pending:
+                _emit_next(pending, emit)
+
+    logging.info("Streamed %d sample result(s), %d failed", counts["written"], counts["failed"])
+    return counts["written"], counts["failed"]
+
+
+def _emit_next(pending, emit):
+    emit(_replay_worker_result(pending.popleft().result()))
+
+
+def _read_specs(input_stream):
+    """Yield parsed spec dicts, or ``{"error": ...}`` for lines that are not valid specs."""
+    for line_number, line in enumerate(input_stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            spec = json.loads(line)
+        except ValueError as exc:
+            yield {"error": f"Line {line_number}: invalid JSON: {exc}"}
+            continue
+        if not isinstance(spec, dict):
+            yield {"error": f"Line {line_number}: expected a JSON object"}
+            continue
+        sample_id = spec.get("sample_id")
+        files = spec.get("files")
+        if isinstance(files, str):
+            files = [files]
+        if not isinstance(sample_id, str) or not sample_id:
+            error = "missing sample_id"
+        elif not files or not all(isinstance(path, str) for path in files):
+            error = "files must be a path or a list of paths"
+        else:
+            error = None
+        if error:
+            yield {"sample_id": sample_id, "error": f"Line {line_number}: {error}"}
+            continue
+        yield {
+            "sample_id": sample_id,
+            "files": files,
+            "assembly_type": spec.get("assembly_type"),
+            "organism": spec.get("organism"),
+        }
+
+
+def _collect_stream_record(spec, defaults, context, output_file=None):
+    """Evaluate one spec; with ``output_file``, also write its CSVs as ``collect`` does."""
+    sample_id = spec.get("sample_id")
+    if "error" in spec:
+        logging.error("Skipping sample spec: %s", spec["error"])
+        return {"sample_id": sample_id, "ok": False, "error": spec["error"]}
+    try:
+        qc_report = collect_report(
+            spec["organism"] or defaults["organism"],
+            spec["files"],
+            defaults["criteria_file"],
+            sample_id,
+            metadata_file=defaults["metadata_file"],
+            allow_unknown_organism=defaults["allow_unknown_organism"],
+            assembly_type=spec["assembly_type"] or defaults["assembly_type"],
+            fail_on_not_evaluated=defaults["fail_on_not_evaluated"],
+            _context=context,
+        )
+        if qc_report is not None and output_file:
+            write_to_file(output_file, qc_report)
+    except Exception as exc:  # noqa: BLE001 - one bad sample must not end the stream
+        logging.error("Failed to collect %s: %s", sample_id, exc)
+        return {"sample_id": sample_id, "ok": False, "error": str(exc)}
+    if qc_report is None:
+        return {"sample_id": sample_id, "ok": False, "error": "No files passed the checks."}
+    record = {
+        "sample_id": sample_id,
+        "ok": True,
+        "report": report_record(qc_report),
+    }
+    if output_file:
+        record["output_file"] = output_file
+    return record
+
+
+def _collect_stream_record_in_worker(spec, defaults):
+    return _call_buffering_logs(
+        _collect_stream_record, spec, defaults, collect_workflow._WORKER_CONTEXT
+    )
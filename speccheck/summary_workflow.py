@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import csv
+import io
 import logging
 import os
 
 import pandas as pd
 
+from speccheck.archive import CollectedArchive, is_archive_file
+from speccheck.atomic import is_partial_file
+from speccheck.collect import concise_row, sanitize_report
 from speccheck.qualibact import add_qualibact_compatibility_columns
+from speccheck.quarantine import is_quarantine_report
 from speccheck.report import plot_charts
 from speccheck.report_tables import (
     build_concise_report_frame,
@@ -16,6 +22,7 @@ from speccheck.report_tables import (
     status_label,
     status_rank,
 )
+from speccheck.sinks import is_sink_file, read_sink_records
 
 
 def summary(
@@ -33,12 +40,39 @@ def summary(
 ):
     """Merge collected CSVs and write concise, full, HTML, and XLSX reports."""
     os.makedirs(output, exist_ok=True)
-    csv_files = discover_summary_csvs(directory, output)
-    merged_data = merge_summary_csvs(csv_files, sample_id)
+    input_files = discover_summary_inputs(directory, output)
+    merged_data = merge_summary_inputs(input_files, sample_id)
     if not merged_data:
         logging.error("No data found in the merged files.")
         return
+    write_summary_reports(
+        merged_data,
+        output,
+        species,
+        template,
+        plot=plot,
+        xlsx_output=xlsx_output,
+        interactive_tables=interactive_tables,
+        qualifyr_style=qualifyr_style,
+        qualibact_compat=qualibact_compat,
+        qualibact_warn_as_fail=qualibact_warn_as_fail,
+    )
 
+
+def write_summary_reports(
+    merged_data,
+    output,
+    species,
+    template,
+    plot=False,
+    xlsx_output=None,
+    interactive_tables=True,
+    qualifyr_style=False,
+    qualibact_compat=False,
+    qualibact_warn_as_fail=False,
+):
+    """Write the concise, full, HTML, and XLSX reports for ``{sample_id: row}`` data."""
+    os.makedirs(output, exist_ok=True)
     report_df = _build_report_frame(merged_data)
     if qualibact_compat:
         report_df = _apply_qualibact_policy(
@@ -105,21 +139,30 @@ def _apply_qualibact_policy(report_df, warn_as_fail=False):
     return result
 
 
-def discover_summary_csvs(directory, output):
-    """Find summary inputs while excluding detailed and generated artifacts."""
-    csv_files = []
+def discover_summary_inputs(directory, output):
+    """Find concise CSVs and batch result files, excluding detailed and generated artifacts."""
+    input_files = []
     skipped_detailed = []
+    skipped_partial = []
     input_root = os.path.abspath(directory)
     output_root = os.path.abspath(output)
 
+    if os.path.isfile(directory) and is_archive_file(directory):
+        return [directory]
     for root, _dirs, files in os.walk(directory):
         abs_root = os.path.abspath(root)
         if abs_root == output_root or abs_root.startswith(output_root + os.sep):
             continue
         for filename in files:
-            if not filename.endswith(".csv"):
-                continue
             path = os.path.join(root, filename)
+            if is_partial_file(filename):
+                skipped_partial.append(path)
+                continue
+            if is_sink_file(filename) or is_archive_file(filename):
+                input_files.append(path)
+                continue
+            if not filename.endswith(".csv") or is_quarantine_report(filename):
+                continue
             if filename.startswith("detailed."):
                 skipped_detailed.append(path)
                 continue
@@ -128,49 +171,103 @@ def discover_summary_csvs(directory, output):
                 os.path.join(output_root, "report.full.csv"),
             }:
                 continue
-            csv_files.append(path)
+            input_files.append(path)
 
+    if skipped_partial:
+        logging.warning(
+            "Ignoring %d partial file(s) from unfinished or interrupted collect runs.",
+            len(skipped_partial),
+        )
     if skipped_detailed:
         logging.info(
             "Ignoring %d detailed CSV file(s) during summary merge; concise CSVs are used.",
             len(skipped_detailed),
         )
-    if not csv_files:
+    if not input_files:
         detail = " Only detailed.*.csv files were found." if skipped_detailed else ""
-        raise ValueError(f"No summary input CSV files found under {input_root}.{detail}")
-    return sorted(csv_files)
+        raise ValueError(f"No summary input CSV or result files found under {input_root}.{detail}")
+    return sorted(input_files)
 
 
-def merge_summary_csvs(csv_files, sample_id):
-    """Merge sample CSVs and reject ambiguous sample identifiers."""
+def merge_summary_inputs(input_files, sample_id):
+    """Merge sample CSVs and result files and reject ambiguous sample identifiers."""
     merged_data = {}
     seen_samples = {}
-    for path in csv_files:
-        frame = pd.read_csv(path)
-        if sample_id not in frame.columns:
-            raise ValueError(
-                f"Summary input {path} is missing required sample column '{sample_id}'."
-            )
-        if frame[sample_id].isna().any():
-            raise ValueError(f"Summary input {path} contains missing sample IDs in '{sample_id}'.")
-        duplicated = frame[frame[sample_id].duplicated(keep=False)][sample_id].astype(str).tolist()
-        if duplicated:
-            duplicate_names = ", ".join(sorted(set(duplicated)))
+    for path in input_files:
+        if is_archive_file(path):
+            _merge_archive_rows(path, sample_id, merged_data, seen_samples)
+            continue
+        frame = _read_summary_frame(path)
+        _merge_frame(frame, path, sample_id, merged_data, seen_samples)
+    return merged_data
+
+
+def _merge_frame(frame, source, sample_id, merged_data, seen_samples):
+    if sample_id not in frame.columns:
+        raise ValueError(f"Summary input {source} is missing required sample column '{sample_id}'.")
+    if frame[sample_id].isna().any():
+        raise ValueError(f"Summary input {source} contains missing sample IDs in '{sample_id}'.")
+    duplicated = frame[frame[sample_id].duplicated(keep=False)][sample_id].astype(str).tolist()
+    if duplicated:
+        duplicate_names = ", ".join(sorted(set(duplicated)))
+        raise ValueError(f"Summary input {source} contains duplicate sample IDs: {duplicate_names}")
+    for row in frame.to_dict(orient="records"):
+        current_sample = str(row.pop(sample_id))
+        if current_sample in seen_samples:
             raise ValueError(
-                f"Summary input {path} contains duplicate sample IDs: {duplicate_names}"
+                f"Duplicate sample ID '{current_sample}' found in both "
+                f"{seen_samples[current_sample]} and {source}."
             )
-        for row in frame.to_dict(orient="records"):
-            current_sample = str(row.pop(sample_id))
-            if current_sample in seen_samples:
-                raise ValueError(
-                    f"Duplicate sample ID '{current_sample}' found in both "
-                    f"{seen_samples[current_sample]} and {path}."
-                )
-            seen_samples[current_sample] = path
-            merged_data[current_sample] = row
+        seen_samples[current_sample] = source
+        merged_data[current_sample] = row
+
+
+def _merge_archive_rows(path, sample_id, merged_data, seen_samples):
+    # Each archived CSV is typed on its own, as ``pd.read_csv`` would type the file.
+    with CollectedArchive(path) as archive:
+        for name in archive.concise_names():
+            frame = pd.read_csv(io.BytesIO(archive.read_bytes(name)))
+            _merge_frame(frame, f"{path}:{name}", sample_id, merged_data, seen_samples)
+
+
+def merge_summary_reports(qc_reports):
+    """Return ``{sample_id: row}`` for in-memory reports, as if read from concise CSVs.
+
+    Each report is read back through ``pandas.read_csv`` as a one-sample CSV,
+    so reports built from collected CSVs and from reports handed over in
+    memory are typed identically.
+    """
+    merged_data = {}
+    for qc_report in qc_reports:
+        frame = _concise_frame([concise_row(sanitize_report(qc_report))])
+        row = frame.to_dict(orient="records")[0]
+        current_sample = str(row.pop("sample_id"))
+        if current_sample in merged_data:
+            raise ValueError(f"Duplicate sample ID '{current_sample}' in collected reports.")
+        merged_data[current_sample] = row
     return merged_data
 
 
+def _read_summary_frame(path):
+    if not is_sink_file(os.path.basename(path)):
+        return pd.read_csv(path)
+    # Render stored reports as concise CSV rows so values are typed exactly as
+    # they would be when read back from per-sample CSVs.
+    return _concise_frame([concise_row(record) for record in read_sink_records(path)])
+
+
+def _concise_frame(rows):
+    fieldnames = list(dict.fromkeys(column for row in rows for column in row))
+    if not fieldnames:
+        return pd.DataFrame(columns=["sample_id"])
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+
 def normalize_report_status_columns(report_df):
     """Write status-like report columns consistently."""
     normalized = report_df.copy()
@@ -5,8 +5,6 @@ from datetime import datetime, timezone
 from io import StringIO
 from pathlib import Path
 
-import requests
-
 QUALIBACT_DEFAULT_URL = "https://static.qualibact.org/api/v2/external/thresholds.csv"
 QUALIBACT_REPOSITORY_URL = (
     "https://raw.githubusercontent.com/cgps-group/qualibact/main/public/api/v2/thresholds.csv"
@@ -95,6 +93,8 @@ def _fetch_qualibact_rows(update_url):
     if local_path.is_file():
         with open(local_path, encoding="utf-8") as handle:
             return list(csv.DictReader(handle))
+    import requests
+
     response = requests.get(update_url, timeout=30)
     response.raise_for_status()
     text = response.text.strip()
@@ -408,6 +408,8 @@ def update_criteria_file(
     snapshot_dir=CONFIG_DIR,
     snapshot_source_url=None,
 ):
+    import requests
+
     logging.info("Updating criteria file from %s", update_url)
     try:
         qualibact_rows = _fetch_qualibact_rows(update_url)
@@ -0,0 +1,179 @@
+"""Work queue on a shared filesystem for ``collect-worker``.
+
+Workers on any number of nodes share one queue directory::
+
+    queue/
+        queue.json              written once, when the queue is filled
+        pending/<sample>.task   one JSON task per sample not yet claimed
+        claimed/<sample>.task.<worker>
+        done/<sample>.json      completion markers
+        failed/<sample>.json    quarantined samples
+
+A worker claims a task by renaming it from ``pending`` into ``claimed``; the
+rename is atomic, so exactly one worker wins each task. While it works, the
+worker refreshes the claim's modification time. A claim that has not been
+refreshed within the claim timeout belongs to a worker that died and is
+renamed back into ``pending`` by whichever worker notices first. Only POSIX
+rename semantics are required, so the queue works on NFS and Lustre alike.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from speccheck.atomic import atomic_write, file_lock
+
+QUEUE_FORMAT = 1
+TASK_SUFFIX = ".task"
+_STATES = ("pending", "claimed", "done", "failed")
+
+
+def default_worker_id():
+    """Return ``<host>-<pid>``, unique among workers sharing a queue."""
+    return f"{socket.gethostname().split('.')[0]}-{os.getpid()}"
+
+
+@dataclass(frozen=True)
+class Claim:
+    """A task held by this worker."""
+
+    sample_id: str
+    task: dict
+    path: str
+
+
+class WorkQueue:
+    """One queue directory shared by every worker of a run."""
+
+    def __init__(self, queue_dir):
+        self.queue_dir = os.path.abspath(queue_dir)
+        self.info_path = os.path.join(self.queue_dir, "queue.json")
+
+    def initialize(self, build_tasks, description=None):
+        """Fill the queue once; later callers find it filled and return False.
+
+        ``build_tasks`` is called only by the first worker and returns
+        ``{sample_id: task}`` with JSON-compatible tasks.
+        """
+        for state in _STATES:
+            os.makedirs(self._dir(state), exist_ok=True)
+        if os.path.exists(self.info_path):
+            return False
+        with file_lock(self.info_path):
+            if os.path.exists(self.info_path):
+                return False
+            tasks = build_tasks()
+            for sample_id, task in tasks.items():
+                with atomic_write(self._path("pending", sample_id + TASK_SUFFIX)) as handle:
+                    json.dump(task, handle)
+            # Written last: its presence means every task is in place.
+            with atomic_write(self.info_path) as handle:
+                json.dump(
+                    {"format": QUEUE_FORMAT, "samples": len(tasks), **(description or {})},
+                    handle,
+                    indent=1,
+                    sort_keys=True,
+                )
+        logging.info("Queued %d sample(s) in %s", len(tasks), self.queue_dir)
+        return True
+
+    def claim(self, worker_id):
+        """Claim the next pending task, or return None when none is left."""
+        for name in sorted(self._list("pending")):
+            if not name.endswith(TASK_SUFFIX):
+                continue
+            pending_path = self._path("pending", name)
+            claimed_path = self._path("claimed", f"{name}.{worker_id}")
+            try:
+                # Start the claim's clock before it becomes visible in claimed/,
+                # so recover_stale never sees the time the task was queued.
+                os.utime(pending_path)
+                os.rename(pending_path, claimed_path)
+                with open(claimed_path, encoding="utf-8") as handle:
+                    task = json.load(handle)
+            except FileNotFoundError:
+                continue  # another worker won this task, or requeued it meanwhile
+            return Claim(sample_id=name[: -len(TASK_SUFFIX)], task=task, path=claimed_path)
+        return None
+
+    @contextmanager
+    def heartbeat(self, claim, interval):
+        """Refresh ``claim`` every ``interval`` seconds until the block exits."""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval):
+                try:
+                    os.utime(claim.path)
+                except FileNotFoundError:
+                    return
+
+        thread = threading.Thread(target=beat, name="speccheck-claim-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, claim, marker):
+        """Write the completion marker for ``claim`` and release it."""
+        self._finish(claim, "done", marker)
+
+    def fail(self, claim, marker):
+        """Record ``claim`` as failed so that no worker retries it, and release it."""
+        self._finish(claim, "failed", marker)
+
+    def recover_stale(self, timeout):
+        """Return claims not refreshed for ``timeout`` seconds to ``pending``."""
+        recovered = 0
+        now = time.time()
+        for name in self._list("claimed"):
+            path = self._path("claimed", name)
+            task_name, _, worker_id = name.partition(TASK_SUFFIX + ".")
+            try:
+                if now - os.stat(path).st_mtime < timeout:
+                    continue
+                os.rename(path, self._path("pending", task_name + TASK_SUFFIX))
+            except FileNotFoundError:
+                continue  # finished or recovered by someone else meanwhile
+            logging.warning(
+                "Recovered stale claim on %s from worker %s", task_name, worker_id or "unknown"
+            )
+            recovered += 1
+        return recovered
+
+    def counts(self):
+        """Return the number of tasks in each state."""
+        return {state: len(self._list(state)) for state in _STATES}
+
+    def _finish(self, claim, state, marker):
+        with atomic_write(self._path(state, claim.sample_id + ".json")) as handle:
+            json.dump(marker, handle, indent=1, sort_keys=True)
+        try:
+            os.unlink(claim.path)
+        except FileNotFoundError:
+            # The claim went stale and was requeued; drop the duplicate task.
+            try:
+                os.unlink(self._path("pending", claim.sample_id + TASK_SUFFIX))
+            except FileNotFoundError:
+                pass
+
+    def _dir(self, state):
+        return os.path.join(self.queue_dir, state)
+
+    def _path(self, state, name):
+        return os.path.join(self.queue_dir, state, name)
+
+    def _list(self, state):
+        try:
+            return [name for name in os.listdir(self._dir(state)) if not name.startswith(".")]
+        except FileNotFoundError:
+            return []
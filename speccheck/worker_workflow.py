@@ -0,0 +1,182 @@
+"""Elastic multi-node collection: workers pull samples from a shared queue.
+
+Any number of ``collect-worker`` processes, on any nodes that see the same
+filesystem, can be started against one GHRU output tree. The first worker
+fills the queue from discovery; every worker then claims samples one at a
+time (see ``speccheck.work_queue``) and collects them exactly as
+``collect-pipeline`` would. Workers that start late or run on faster nodes
+simply take more samples, and samples held by a worker that died are
+reclaimed after the claim timeout.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict
+
+from speccheck.collect_workflow import (
+    GhruCollectOptions,
+    _collect_ghru_sample,
+    _ghru_output_files,
+    _ghru_sample_fingerprint,
+    _prepare_collection_context,
+    _select_ghru_samples,
+)
+from speccheck.ghru import GhruSampleFiles
+from speccheck.manifest import CollectManifest
+from speccheck.quarantine import SampleFailure, raise_for_failures
+from speccheck.work_queue import WorkQueue, default_worker_id
+
+QUEUE_DIR_NAME = ".speccheck_queue"
+
+
+def collect_worker(
+    ghru_output_dir,
+    output_dir,
+    criteria_file,
+    queue_dir=None,
+    organism=None,
+    metadata_file=None,
+    allow_unknown_organism=False,
+    fail_on_not_evaluated=False,
+    work_dir=None,
+    sample_ids=None,
+    discovery_cache=None,
+    worker_id=None,
+    claim_timeout=600.0,
+    poll_interval=5.0,
+):
+    """Collect samples claimed from a shared queue until none are left.
+
+    ``queue_dir`` defaults to ``.speccheck_queue`` inside ``output_dir``. It is
+    filled by the first worker from ``ghru_output_dir`` (restricted to
+    ``sample_ids`` if given) and reused by later workers; delete it to start
+    a new run. A worker exits once no sample is pending or claimed, waiting
+    ``poll_interval`` seconds between checks while other workers still hold
+    claims. A claim not refreshed for ``claim_timeout`` seconds is requeued.
+
+    Failing samples are quarantined rather than retried. A sample whose files
+    match no parser is marked done with no output file, as ``collect-pipeline``
+    skips it. Returns the CSV paths this worker wrote; raises ``QuarantinedSamplesError`` if any of its
+    samples failed.
+    """
+    if claim_timeout <= 0 or poll_interval <= 0:
+        raise ValueError("claim_timeout and poll_interval must be positive")
+    worker_id = worker_id or default_worker_id()
+    queue = WorkQueue(queue_dir or os.path.join(output_dir, QUEUE_DIR_NAME))
+    description = {
+        "output_tree": os.path.abspath(ghru_output_dir),
+        "output_dir": os.path.abspath(output_dir),
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    queue.initialize(
+        lambda: _queue_tasks(ghru_output_dir, work_dir, sample_ids, discovery_cache),
+        description,
+    )
+    _check_queue_description(queue, description)
+
+    context = _prepare_collection_context(criteria_file, metadata_file)
+    options = GhruCollectOptions(
+        output_dir=output_dir,
+        criteria_file=criteria_file,
+        organism=organism,
+        metadata_file=metadata_file,
+        allow_unknown_organism=allow_unknown_organism,
+        fail_on_not_evaluated=fail_on_not_evaluated,
+        continue_on_error=True,
+    )
+    manifest = CollectManifest.load(output_dir)
+    written = []
+    failures = []
+    logging.info("Worker %s collecting from queue %s", worker_id, queue.queue_dir)
+    while True:
+        claim = queue.claim(worker_id)
+        if claim is None:
+            if queue.recover_stale(claim_timeout):
+                continue
+            if not queue.counts()["claimed"]:
+                break
+            time.sleep(poll_interval)
+            continue
+        sample = GhruSampleFiles(
+            sample_id=claim.sample_id,
+            assembly_type=claim.task["assembly_type"],
+            files=list(claim.task["files"]),
+        )
+        with queue.heartbeat(claim, claim_timeout / 4):
+            result = _collect_ghru_sample(sample, options, context)
+        if isinstance(result, SampleFailure):
+            failures.append(result)
+            queue.fail(claim, {**asdict(result), "worker": worker_id})
+            continue
+        if result is None:
+            # Nothing matched a parser, as collect-pipeline skips the sample.
+            queue.complete(
+                claim,
+                {
+                    "sample_id": sample.sample_id,
+                    "worker": worker_id,
+                    "output_file": None,
+                    "skipped": "no input file matched a parser",
+                    "finished_at": time.time(),
+                },
+            )
+            continue
+        manifest.record(
+            sample.sample_id,
+            _ghru_sample_fingerprint(sample, options, context),
+            _ghru_output_files(result),
+        )
+        # Saved per sample: a killed worker keeps the entries it finished.
+        manifest.save()
+        queue.complete(
+            claim,
+            {
+                "sample_id": sample.sample_id,
+                "worker": worker_id,
+                "output_file": os.path.abspath(result),
+                "finished_at": time.time(),
+            },
+        )
+        written.append(result)
+
+    counts = queue.counts()
+    logging.info(
+        "Worker %s finished: %d sample(s) collected here; queue has %d done, %d failed",
+        worker_id,
+        len(written),
+        counts["done"],
+        counts["failed"],
+    )
+    raise_for_failures(output_dir, failures, part=f".{worker_id}")
+    return written
+
+
+def _queue_tasks(ghru_output_dir, work_dir, sample_ids, discovery_cache):
+    sample_map, selected = _select_ghru_samples(
+        ghru_output_dir, sample_ids, work_dir=work_dir, discovery_cache=discovery_cache
+    )
+    for sample_id in selected:
+        if not sample_map[sample_id].assembly_type:
+            raise ValueError(f"Could not infer assembly type for sample {sample_id}")
+    return {
+        sample_id: {
+            "assembly_type": sample_map[sample_id].assembly_type,
+            "files": sample_map[sample_id].files,
+        }
+        for sample_id in selected
+    }
+
+
+def _check_queue_description(queue, description):
+    with open(queue.info_path, encoding="utf-8") as handle:
+        info = json.load(handle)
+    for key, value in description.items():
+        if info.get(key) != value:
+            raise ValueError(
+                f"Queue {queue.queue_dir} was filled for {key} {info.get(key)}, not {value}; "
+                "use another --queue-dir or delete it to start a new run"
+            )
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_config_cache(tmp_path_factory, monkeypatch):
+    """Keep the persistent config cache out of the developer's home directory."""
+    monkeypatch.setenv("SPECCHECK_CACHE_DIR", str(tmp_path_factory.getbasetemp() / "cache"))
@@ -0,0 +1,90 @@
+import csv
+import glob
+import io
+import os
+
+from speccheck import api
+from speccheck.api import Evaluator, QCResult, evaluate_sample, evaluate_samples
+from speccheck.config import get_default_criteria_path
+from speccheck.main import collect
+
+PRACTICE_DATA = os.path.abspath("tests/practice_data")
+SAMPLE = "Sample_178db692semb"
+SAMPLE_DIR = os.path.join(PRACTICE_DATA, SAMPLE)
+
+
+def _sample_files():
+    # Parser results are reported in input order, which for a directory is glob order.
+    return glob.glob(os.path.join(SAMPLE_DIR, "*"))
+
+
+def _detailed_row(path):
+    with open(path, encoding="utf-8", newline="") as handle:
+        return next(csv.DictReader(handle))
+
+
+def _as_cell(key, value):
+    if value is None:
+        return ""
+    if key.endswith(("all_checks_passed", ".check")) and isinstance(value, bool):
+        return "PASSED" if value else "FAILED"
+    return str(value)
+
+
+def test_in_memory_inputs_match_collected_csv(tmp_path):
+    contents = {}
+    for path in _sample_files():
+        with open(path, "rb") as handle:
+            contents[os.path.basename(path)] = handle.read()
+    collect(
+        "Escherichia coli",
+        [SAMPLE_DIR],
+        get_default_criteria_path(),
+        str(tmp_path / f"{SAMPLE}.csv"),
+        SAMPLE,
+    )
+
+    result = Evaluator().evaluate_sample(contents, SAMPLE, organism="Escherichia coli")
+
+    expected = _detailed_row(tmp_path / f"detailed.{SAMPLE}.csv")
+    assert isinstance(result, QCResult)
+    assert {key: _as_cell(key, value) for key, value in result.report.items()} == expected
+    assert result.status == expected["speccheck_overall_status"]
+    assert result.passed is (expected["all_checks_passed"] == "PASSED")
+    assert "; ".join(result.failure_reasons) == expected["speccheck_failure_reasons"]
+
+
+def test_paths_buffers_and_pairs_are_interchangeable():
+    paths = _sample_files()
+    pairs = []
+    for path in paths[1:]:
+        with open(path, "rb") as handle:
+            pairs.append((os.path.basename(path), io.BytesIO(handle.read())))
+
+    from_paths = evaluate_sample(SAMPLE_DIR, SAMPLE, organism="Escherichia coli")
+    mixed = evaluate_sample([paths[0], *pairs], SAMPLE, organism="Escherichia coli")
+
+    assert mixed.report == from_paths.report
+
+
+def test_batch_reuses_one_evaluator(monkeypatch):
+    api._cached_evaluator.cache_clear()
+    prepared = []
+    original_prepare = api._prepare_collection_context
+
+    def counting_prepare(*args, **kwargs):
+        prepared.append(args)
+        return original_prepare(*args, **kwargs)
+
+    monkeypatch.setattr(api, "_prepare_collection_context", counting_prepare)
+
+    results = evaluate_samples(
+        {SAMPLE: SAMPLE_DIR, "EMPTY": {"notes.txt": b"nothing to parse"}},
+        organism="Escherichia coli",
+    )
+    evaluate_sample(SAMPLE_DIR, SAMPLE, organism="Escherichia coli")
+
+    assert [result.sample_id for result in results] == [SAMPLE, "EMPTY"]
+    assert results[1] == QCResult(sample_id="EMPTY", status="NO_DATA", passed=False, report=None)
+    assert results[1].failure_reasons == []
+    assert len(prepared) == 1
@@ -0,0 +1,108 @@
+import shutil
+import zipfile
+
+import pytest
+from typer.testing import CliRunner
+
+from speccheck.archive import ARCHIVE_NAME, CollectedArchive, compact
+from speccheck.cli import app
+from speccheck.config import get_default_criteria_path, get_default_template_path
+from speccheck.main import collect, collect_ghru, recheck, summary
+from tests.test_ghru_collect import _stage_ghru_fixture, _stage_second_sample
+
+PRACTICE_DATA = "tests/practice_data"
+SAMPLES = ("Sample_178db692semb", "Sample_6d8e0e28ntam")
+ORGANISM = "Mycoplasma genitalium"
+
+
+@pytest.fixture
+def collected(tmp_path):
+    collect_dir = tmp_path / "collect"
+    for sample in SAMPLES:
+        collect(
+            "Escherichia coli",
+            [f"{PRACTICE_DATA}/{sample}"],
+            get_default_criteria_path(),
+            str(collect_dir / f"{sample}.csv"),
+            sample,
+        )
+    return collect_dir
+
+
+def _summary(directory, output):
+    summary(
+        str(directory),
+        str(output),
+        "Speciator.speciesName",
+        "sample_id",
+        get_default_template_path(),
+    )
+    return (output / "report.csv").read_text(), (output / "report.full.csv").read_text()
+
+
+def test_compact_packs_csvs_with_a_sample_index(collected, tmp_path):
+    originals = {path.name: path.read_bytes() for path in collected.glob("*.csv")}
+
+    result = CliRunner().invoke(app, ["compact", str(collected), "--remove"])
+
+    assert result.exit_code == 0, result.output
+    assert [path.name for path in collected.iterdir()] == [ARCHIVE_NAME]
+    with CollectedArchive(str(collected / ARCHIVE_NAME)) as archive:
+        assert sorted(archive.samples) == list(SAMPLES)
+        assert archive.sample_row(SAMPLES[1])["sample_id"] == SAMPLES[1]
+        assert archive.sample_row(SAMPLES[1], detailed=True)["Quast.N50"]
+        assert archive.sample_row("missing") is None
+    with zipfile.ZipFile(collected / ARCHIVE_NAME) as archive:
+        assert {name: archive.read(name) for name in originals} == originals
+
+
+def test_summary_and_recheck_read_the_archive(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    collected = tmp_path / "collect"
+    collect_ghru(
+        str(output_dir),
+        str(collected),
+        get_default_criteria_path(),
+        organism=ORGANISM,
+    )
+    expected_summary = _summary(collected, tmp_path / "summary_csv")
+    recheck(
+        str(collected),
+        str(tmp_path / "recheck_csv"),
+        get_default_criteria_path(),
+        organism=ORGANISM,
+    )
+
+    compact(str(collected), remove=True)
+
+    assert _summary(collected, tmp_path / "summary_zip") == expected_summary
+    written = recheck(
+        str(collected / ARCHIVE_NAME),
+        str(tmp_path / "recheck_zip"),
+        get_default_criteria_path(),
+        organism=ORGANISM,
+    )
+    assert [path.rsplit("/", 1)[-1] for path in written] == [
+        "test_sample1.csv",
+        "test_sample2.csv",
+    ]
+    for path in (tmp_path / "recheck_csv").iterdir():
+        assert (tmp_path / "recheck_zip" / path.name).read_text() == path.read_text()
+
+
+def test_compact_merges_new_csvs_into_an_existing_archive(collected, tmp_path):
+    first, second = SAMPLES
+    held_back = tmp_path / "held_back"
+    held_back.mkdir()
+    for name in (f"{second}.csv", f"detailed.{second}.csv"):
+        shutil.move(collected / name, held_back / name)
+    compact(str(collected), remove=True)
+    for name in (f"{second}.csv", f"detailed.{second}.csv"):
+        shutil.move(held_back / name, collected / name)
+
+    compact(str(collected), remove=True)
+
+    with CollectedArchive(str(collected / ARCHIVE_NAME)) as archive:
+        assert sorted(archive.samples) == [first, second]
+        assert len(archive.member_names()) == 4
@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+from speccheck import atomic
+from speccheck.atomic import atomic_write, is_partial_file
+from speccheck.collect import write_to_file
+from speccheck.main import summary
+from speccheck.manifest import CollectManifest
+from speccheck.report import get_default_template_path
+from speccheck.sinks import ResultSink, read_sink_records
+
+
+def test_failed_write_keeps_previous_file_and_leaves_no_partial(tmp_path):
+    target = tmp_path / "S1.csv"
+    target.write_text("sample_id\nS1\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError), atomic_write(target) as handle:
+        handle.write("sample_id\nS")
+        raise RuntimeError("killed")
+
+    assert target.read_text(encoding="utf-8") == "sample_id\nS1\n"
+    assert os.listdir(tmp_path) == ["S1.csv"]
+
+
+def test_fsync_is_opt_in(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(atomic.os, "fsync", synced.append)
+
+    with atomic_write(tmp_path / "a.csv") as handle:
+        handle.write("x\n")
+    assert synced == []
+
+    monkeypatch.setenv(atomic.FSYNC_ENV, "1")
+    with atomic_write(tmp_path / "b.csv") as handle:
+        handle.write("x\n")
+    assert len(synced) == 2  # the file, then its directory
+
+
+def _write_report(output_file, sample_id):
+    write_to_file(output_file, {"sample_id": sample_id, "all_checks_passed": True, "x": "y" * 4096})
+
+
+@pytest.mark.parametrize("umask, expected", [(0o022, 0o644), (0o027, 0o640)])
+def test_written_files_follow_the_umask(tmp_path, umask, expected):
+    previous = os.umask(umask)
+    atomic._umask.cache_clear()
+    try:
+        write_to_file(str(tmp_path / "S1.csv"), {"sample_id": "S1", "all_checks_passed": True})
+        with atomic_write(tmp_path / "archive.zip", "wb") as handle:
+            handle.write(b"data")
+    finally:
+        os.umask(previous)
+        atomic._umask.cache_clear()
+
+    for name in ["S1.csv", "detailed.S1.csv", "archive.zip"]:
+        assert (tmp_path / name).stat().st_mode & 0o777 == expected
+
+
+def test_concurrent_writers_never_expose_partial_csvs(tmp_path):
+    output_file = str(tmp_path / "S1.csv")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_write_report, [output_file] * 16, [f"S{i}" for i in range(16)]))
+
+    assert sorted(os.listdir(tmp_path)) == ["S1.csv", "detailed.S1.csv"]
+    assert len(pd.read_csv(output_file)) == 1
+
+
+def test_concurrent_manifest_saves_keep_each_others_samples(tmp_path):
+    first = CollectManifest.load(tmp_path)
+    second = CollectManifest.load(tmp_path)
+    for manifest, sample_id in ((first, "S1"), (second, "S2")):
+        output_file = tmp_path / f"{sample_id}.csv"
+        output_file.write_text("sample_id\n", encoding="utf-8")
+        manifest.record(sample_id, {"files": []}, [str(output_file)])
+
+    first.save()
+    second.save()
+
+    assert sorted(CollectManifest.load(tmp_path).samples) == ["S1", "S2"]
+
+
+def test_failed_sink_run_keeps_previous_results(tmp_path):
+    with ResultSink(tmp_path, "jsonl") as sink:
+        sink.write({"sample_id": "S1", "all_checks_passed": True})
+
+    with pytest.raises(RuntimeError, match="killed"), ResultSink(tmp_path, "jsonl") as sink:
+        sink.write({"sample_id": "S2", "all_checks_passed": True})
+        raise RuntimeError("killed")
+
+    assert os.listdir(tmp_path) == ["speccheck_results.jsonl"]
+    assert [record["sample_id"] for record in read_sink_records(sink.paths[0])] == ["S1"]
+
+
+def test_summary_ignores_partial_files(tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    pd.DataFrame([{"sample_id": "S1", "all_checks_passed": True}]).to_csv(
+        input_dir / "S1.csv", index=False
+    )
+    partial = input_dir / ".S2.csv.k3x9a.partial"
+    partial.write_text("sample_id,all_checks\nS2,PASS", encoding="utf-8")
+    assert is_partial_file(partial.name)
+
+    summary(
+        str(input_dir),
+        str(tmp_path / "summary"),
+        "Speciator.speciesName",
+        "sample_id",
+        get_default_template_path(),
+    )
+
+    assert list(pd.read_csv(tmp_path / "summary" / "report.csv")["sample_id"]) == ["S1"]
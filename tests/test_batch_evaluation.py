@@ -0,0 +1,115 @@
+import glob
+
+import pandas as pd
+import pytest
+
+from speccheck.batch_evaluation import evaluate_frame, reports_frame, software_order
+from speccheck.collect import collect_files
+from speccheck.collect_workflow import (
+    _add_parser_aliases,
+    _evaluation_plan_for,
+    _prepare_collection_context,
+)
+from speccheck.config import get_default_criteria_path
+from speccheck.evaluation import EvaluationPlan
+from speccheck.util import get_all_files, load_modules_with_checks
+
+
+def _row(software, field, operator, value, severity="fail"):
+    return {
+        "assembly_type": "all",
+        "software": software,
+        "field": field,
+        "operator": operator,
+        "value": value,
+        "severity": severity,
+        "source": "test",
+        "special_field": "",
+    }
+
+
+def _assert_matches_per_sample(plan, recovered_by_sample, *, fail_on_not_evaluated=False):
+    frame = evaluate_frame(
+        plan,
+        reports_frame(recovered_by_sample),
+        software_order=software_order(recovered_by_sample),
+        fail_on_not_evaluated=fail_on_not_evaluated,
+    )
+    for sample_id, recovered_values in recovered_by_sample.items():
+        report = plan.evaluate(recovered_values, fail_on_not_evaluated=fail_on_not_evaluated)
+        report["speccheck_not_evaluated_count"] = report.pop("_not_evaluated_count")
+        row = frame.loc[sample_id]
+        for column, expected in report.items():
+            assert row[column] == expected, (sample_id, column)
+        assert row.drop(list(report)).isna().all(), sample_id
+
+
+@pytest.fixture(scope="module")
+def practice_values():
+    recovered = {}
+    for sample_dir in sorted(glob.glob("tests/practice_data/*")):
+        values = collect_files(get_all_files([sample_dir]), load_modules_with_checks())
+        _add_parser_aliases(values)
+        recovered[sample_dir] = values
+    return recovered
+
+
+@pytest.mark.parametrize("organism", ["Escherichia coli", "Klebsiella pneumoniae", "Unknown"])
+@pytest.mark.parametrize("assembly_type", ["short", "hybrid"])
+def test_frame_evaluation_matches_per_sample_engine(practice_values, organism, assembly_type):
+    context = _prepare_collection_context(get_default_criteria_path())
+    plan = _evaluation_plan_for(context, organism, assembly_type)
+
+    _assert_matches_per_sample(plan, practice_values)
+    _assert_matches_per_sample(plan, practice_values, fail_on_not_evaluated=True)
+
+
+def test_frame_evaluation_handles_mixed_parsers_and_value_types():
+    plan = EvaluationPlan.build(
+        [
+            _row("Quast", "N50", ">=", 1000),
+            _row("Quast", "N50", "<=", 5000, severity="warn"),
+            _row("Quast", "GC (%)", "<=", 40, severity="warn"),
+            _row("Quast", "Missing metric", ">=", 1),
+            _row("Speciator", "speciesName", "regex", "^Escherichia"),
+            _row("DepthParser.short", "Depth", ">=", 30),
+            _row("DepthParser.long", "Depth", ">=", 20, severity="warn"),
+        ],
+        [_row("Checkm", "Completeness", ">=", 90)],
+    )
+    recovered = {
+        "pass": {
+            "Quast": {"N50": "2000", "GC (%)": 35},
+            "Speciator": {"speciesName": "Escherichia coli"},
+            "Depth": {"Read_type": "Short", "Depth": 42.0},
+        },
+        "warn_and_fail": {
+            "Quast": {"N50": 9000, "GC (%)": "50.5"},
+            "Speciator": {"speciesName": "Klebsiella pneumoniae"},
+            "Checkm": {"Completeness": 85},
+            "Depth": [
+                {"Read_type": "short", "Depth": 12.0},
+                {"Read_type": "long", "Depth": 10.0},
+            ],
+        },
+        "unparseable": {"Quast": {"N50": "n/a"}, "Checkm": {"Completeness": 99}},
+        "depth_only": {"Depth": {"Read_type": "long", "Depth": 25}},
+    }
+
+    _assert_matches_per_sample(plan, recovered)
+    _assert_matches_per_sample(plan, recovered, fail_on_not_evaluated=True)
+
+
+def test_frame_evaluation_accepts_numeric_columns_read_from_csv():
+    plan = EvaluationPlan.build([_row("Quast", "N50", ">=", 1000)], [])
+    frame = pd.DataFrame({"Quast.N50": [500, 1500, None]}, index=["low", "high", "missing"])
+
+    result = evaluate_frame(plan, frame)
+
+    assert result["Quast.N50.check"].tolist()[:2] == [False, True]
+    assert (
+        result.loc["missing", "Quast.all_checks_passed"]
+        != result.loc["missing", "Quast.all_checks_passed"]
+    )
+    assert result["speccheck_overall_status"].tolist() == ["FAIL", "PASS", "PASS"]
+    assert result.loc["low", "speccheck_failure_reasons"] == "Quast.N50 >=1000 (test)"
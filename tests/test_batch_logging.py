@@ -0,0 +1,92 @@
+import logging
+
+from typer.testing import CliRunner
+
+from speccheck.batch_logging import (
+    EventAggregator,
+    event,
+    start_batch_logging,
+    stop_batch_logging,
+)
+from speccheck.cli import app
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_aggregator_counts_events_and_passes_other_warnings():
+    target = _ListHandler()
+    aggregator = EventAggregator(target, interval=3600)
+    logger = _logger("test.batch.aggregate", aggregator)
+
+    for _ in range(3):
+        logger.warning("Failed check", extra=event("Checkm", "Completeness", "failed >= 91"))
+    logger.warning("Not evaluated", extra=event("Quast", "N50", "not evaluated", count=4))
+    logger.info("Detected", extra=event("Quast", "", "detected"))
+    logger.info("Collecting sample")
+    logger.warning("Metadata missing")
+    aggregator.summarize(final=True)
+
+    assert target.messages == [
+        "Metadata missing",
+        "Run total: 8 event(s): Quast.N50: not evaluated x4; "
+        "Checkm.Completeness: failed >= 91 x3; Quast: detected x1",
+    ]
+
+
+def test_batch_logging_writes_full_detail_from_a_background_thread(tmp_path):
+    target = _ListHandler()
+    detail_file = tmp_path / "detail.log"
+    file_handler = logging.FileHandler(detail_file, encoding="utf-8")
+    logger = _logger("test.batch.queue", start_batch_logging(target, file_handler))
+
+    logger.warning("Failed check for %s", "Checkm", extra=event("Checkm", "Completeness", "low"))
+    logger.info("Collecting sample %s", "S1")
+    stop_batch_logging()
+    file_handler.close()
+
+    assert detail_file.read_text().splitlines() == [
+        "Failed check for Checkm",
+        "Collecting sample S1",
+    ]
+    assert target.messages == ["Run total: 1 event(s): Checkm.Completeness: low x1"]
+
+
+def test_batch_logs_option_summarises_failed_checks(tmp_path):
+    log_file = tmp_path / "run.log"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "--batch-logs",
+            "--log-file",
+            str(log_file),
+            "collect",
+            "tests/practice_data/Sample_178db692semb",
+            "--sample",
+            "Sample_178db692semb",
+            "--organism",
+            "Escherichia coli",
+            "--output-file",
+            str(tmp_path / "out.csv"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Failed check for Quast" not in result.output
+    assert "Run total" in result.output
+    assert "Failed check for Quast" in log_file.read_text()
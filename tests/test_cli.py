@@ -1,3 +1,4 @@
+import pytest
 from click import unstyle
 from typer.testing import CliRunner
 
@@ -89,6 +90,126 @@ def test_collect_command_dispatches_options(monkeypatch, tmp_path):
     assert calls["fail_on_not_evaluated"] is True
 
 
+def test_collect_stream_command_pipes_stdin_to_stdout(monkeypatch):
+    calls = []
+
+    def fake_collect_stream(input_stream, output_stream, criteria_file, metadata, **kwargs):
+        specs = input_stream.read().splitlines()
+        output_stream.write("".join(f'{{"ok": false, "spec": {spec}}}\n' for spec in specs))
+        calls.append(kwargs)
+        return len(specs), len(specs)
+
+    monkeypatch.setattr("speccheck.cli.collect_stream_func", fake_collect_stream)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        app,
+        ["collect", "--stream", "--workers", "3", "--max-in-flight", "4"],
+        input='{"sample_id": "S1"}\n',
+    )
+    mixed = runner.invoke(app, ["collect", "--stream", "inputs"])
+
+    assert result.exit_code == 1
+    assert result.stdout == '{"ok": false, "spec": {"sample_id": "S1"}}\n'
+    assert calls[0]["workers"] == 3
+    assert calls[0]["max_in_flight"] == 4
+    assert calls[0]["assembly_type"] == "short"
+    assert mixed.exit_code != 0
+    assert len(calls) == 1
+
+
+def test_collect_batch_command_dispatches_options(monkeypatch, tmp_path):
+    calls = {}
+
+    def fake_collect_batch(
+        samplesheet,
+        output_dir,
+        criteria_file,
+        metadata,
+        *,
+        allow_unknown_organism,
+        fail_on_not_evaluated,
+        assembly_type,
+        organism,
+        output_format,
+        shards,
+        continue_on_error,
+    ):
+        calls.update(
+            {
+                "samplesheet": samplesheet,
+                "output_dir": output_dir,
+                "criteria_file": criteria_file,
+                "metadata": metadata,
+                "allow_unknown_organism": allow_unknown_organism,
+                "fail_on_not_evaluated": fail_on_not_evaluated,
+                "assembly_type": assembly_type,
+                "organism": organism,
+                "output_format": output_format,
+                "shards": shards,
+                "continue_on_error": continue_on_error,
+            }
+        )
+
+    monkeypatch.setattr("speccheck.cli.collect_batch_func", fake_collect_batch)
+
+    samplesheet = tmp_path / "samples.csv"
+    output_dir = tmp_path / "collect"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "collect-batch",
+            str(samplesheet),
+            str(output_dir),
+            "--assembly-type",
+            "long",
+            "--organism",
+            "Escherichia coli",
+            "--allow-unknown-organism",
+            "--output-format",
+            "sqlite",
+            "--shards",
+            "2",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert calls["samplesheet"] == str(samplesheet)
+    assert calls["output_dir"] == str(output_dir)
+    assert calls["metadata"] is None
+    assert calls["assembly_type"] == "long"
+    assert calls["organism"] == "Escherichia coli"
+    assert calls["allow_unknown_organism"] is True
+    assert calls["fail_on_not_evaluated"] is False
+    assert calls["output_format"] == "sqlite"
+    assert calls["shards"] == 2
+    assert calls["continue_on_error"] is False
+
+
+def test_recheck_command_keeps_stored_strictness_by_default(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_recheck(input_dir, output_dir, criteria_file, **kwargs):
+        calls.append({"input_dir": input_dir, "output_dir": output_dir, **kwargs})
+
+    monkeypatch.setattr("speccheck.cli.recheck_func", fake_recheck)
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["recheck", str(tmp_path / "in"), str(tmp_path / "out")])
+    strict = runner.invoke(
+        app,
+        ["recheck", str(tmp_path / "in"), str(tmp_path / "out"), "--fail-on-not-evaluated"],
+    )
+
+    assert result.exit_code == 0
+    assert strict.exit_code == 0
+    assert calls[0]["input_dir"] == str(tmp_path / "in")
+    assert calls[0]["fail_on_not_evaluated"] is None
+    assert calls[0]["organism"] is None
+    assert calls[1]["fail_on_not_evaluated"] is True
+
+
 def test_summary_command_dispatches_reporting_options(monkeypatch, tmp_path):
     calls = {}
 
@@ -216,6 +337,16 @@ def test_collect_pipeline_accepts_ghru_layout(monkeypatch, tmp_path):
         fail_on_not_evaluated,
         work_dir,
         sample,
+        workers=1,
+        incremental=False,
+        hash_inputs=False,
+        resume=False,
+        output_format="csv",
+        shards=1,
+        continue_on_error=False,
+        shard=None,
+        discovery_cache=None,
+        io_threads=0,
         verbose=False,
     ):
         calls.update(
@@ -229,6 +360,16 @@ def test_collect_pipeline_accepts_ghru_layout(monkeypatch, tmp_path):
                 "fail_on_not_evaluated": fail_on_not_evaluated,
                 "work_dir": work_dir,
                 "sample": sample,
+                "workers": workers,
+                "incremental": incremental,
+                "hash_inputs": hash_inputs,
+                "resume": resume,
+                "output_format": output_format,
+                "shards": shards,
+                "continue_on_error": continue_on_error,
+                "shard": shard,
+                "discovery_cache": discovery_cache,
+                "io_threads": io_threads,
                 "verbose": verbose,
             }
         )
@@ -251,6 +392,14 @@ def test_collect_pipeline_accepts_ghru_layout(monkeypatch, tmp_path):
             "SAMPLE_001",
             "--organism",
             "Escherichia coli",
+            "--workers",
+            "4",
+            "--incremental",
+            "--resume",
+            "--shard",
+            "2/8",
+            "--io-threads",
+            "8",
         ],
     )
 
@@ -259,6 +408,14 @@ def test_collect_pipeline_accepts_ghru_layout(monkeypatch, tmp_path):
     assert calls["output_dir"] == str(collect_dir)
     assert calls["organism"] == "Escherichia coli"
     assert calls["sample"] == ["SAMPLE_001"]
+    assert calls["workers"] == 4
+    assert calls["incremental"] is True
+    assert calls["hash_inputs"] is False
+    assert calls["resume"] is True
+    assert calls["shard"] == (2, 8)
+    assert calls["discovery_cache"] is None
+    assert calls["io_threads"] == 8
+    assert calls["output_format"] == "csv"
 
 
 def test_collect_ghru_command_is_not_public():
@@ -312,3 +469,13 @@ def test_inspect_command_reports_recognised_and_unrecognised_files(tmp_path):
     assert result.exit_code == 0
     assert "Speciator" in result.output
     assert "not recognised" in result.output
+
+
+@pytest.mark.parametrize("shard", ["8/8", "two/8", "3"])
+def test_collect_pipeline_rejects_malformed_shard(tmp_path, shard):
+    result = CliRunner().invoke(
+        app, ["collect-pipeline", str(tmp_path), str(tmp_path / "out"), "--shard", shard]
+    )
+
+    assert result.exit_code == 2
+    assert "--shard" in result.output
@@ -0,0 +1,147 @@
+import csv
+import os
+
+import pytest
+
+import speccheck.collect_workflow as collect_workflow
+from speccheck.config import get_default_criteria_path
+from speccheck.main import collect, collect_batch
+from speccheck.quarantine import QuarantinedSamplesError
+from speccheck.samplesheet import read_samplesheet
+
+PRACTICE_DATA = os.path.abspath("tests/practice_data")
+SAMPLES = ("Sample_178db692semb", "Sample_6d8e0e28ntam")
+
+
+def _write_samplesheet(path, rows, header="sample_id,assembly_type,organism,files"):
+    path.write_text("\n".join([header, *rows]) + "\n", encoding="utf-8")
+
+
+def test_read_samplesheet_resolves_relative_globs(tmp_path):
+    samplesheet = tmp_path / "sheet.tsv"
+    samplesheet.write_text(
+        "sample_id\tfiles\tassembly_type\nS1\tS1/*.tsv; /abs/S1.json\thybrid\n\t\t\nS2\tS2\t\n",
+        encoding="utf-8",
+    )
+
+    rows = read_samplesheet(samplesheet)
+
+    assert [row.sample_id for row in rows] == ["S1", "S2"]
+    assert rows[0].files == (str(tmp_path / "S1/*.tsv"), "/abs/S1.json")
+    assert rows[0].assembly_type == "hybrid"
+    assert rows[1].assembly_type is None
+    assert rows[1].organism is None
+
+
+@pytest.mark.parametrize(
+    ("rows", "header", "message"),
+    [
+        (["S1,short"], "sample_id,assembly_type", "missing required column"),
+        (["S1,short,,a.tsv", "S1,short,,b.tsv"], None, "duplicate sample_id S1"),
+        ([",short,,a.tsv"], None, "missing sample_id"),
+        (["S1,short,,"], None, "no files for S1"),
+    ],
+)
+def test_read_samplesheet_rejects_malformed_rows(tmp_path, rows, header, message):
+    samplesheet = tmp_path / "sheet.csv"
+    _write_samplesheet(samplesheet, rows, **({"header": header} if header else {}))
+
+    with pytest.raises(ValueError, match=message):
+        read_samplesheet(samplesheet)
+
+
+def test_collect_batch_matches_per_sample_collect(tmp_path, monkeypatch):
+    samplesheet = tmp_path / "sheet.csv"
+    _write_samplesheet(
+        samplesheet,
+        [
+            f"{SAMPLES[0]},short,Escherichia coli,{PRACTICE_DATA}/{SAMPLES[0]}/*.tsv",
+            f"{SAMPLES[1]},,,{PRACTICE_DATA}/{SAMPLES[1]}",
+        ],
+    )
+    single_dir = tmp_path / "single"
+    for sample, organism in zip(SAMPLES, ("Escherichia coli", None), strict=True):
+        pattern = f"{PRACTICE_DATA}/{sample}/*.tsv" if organism else f"{PRACTICE_DATA}/{sample}"
+        collect(
+            organism,
+            [pattern],
+            get_default_criteria_path(),
+            str(single_dir / f"{sample}.csv"),
+            sample,
+            allow_unknown_organism=True,
+        )
+
+    prepared = []
+    original_prepare = collect_workflow._prepare_collection_context
+
+    def counting_prepare(*args, **kwargs):
+        prepared.append(args)
+        return original_prepare(*args, **kwargs)
+
+    monkeypatch.setattr(collect_workflow, "_prepare_collection_context", counting_prepare)
+    batch_dir = tmp_path / "batch"
+    written = collect_batch(
+        str(samplesheet),
+        str(batch_dir),
+        get_default_criteria_path(),
+        allow_unknown_organism=True,
+    )
+
+    assert len(prepared) == 1
+    assert written == [str(batch_dir / f"{sample}.csv") for sample in SAMPLES]
+    for sample in SAMPLES:
+        for name in (f"{sample}.csv", f"detailed.{sample}.csv"):
+            assert (batch_dir / name).read_text(encoding="utf-8") == (single_dir / name).read_text(
+                encoding="utf-8"
+            )
+
+
+def test_collect_batch_rejects_invalid_assembly_type_before_collecting(tmp_path):
+    samplesheet = tmp_path / "sheet.csv"
+    _write_samplesheet(samplesheet, [f"S1,draft,,{PRACTICE_DATA}/{SAMPLES[0]}"])
+
+    with pytest.raises(ValueError, match="assembly_type must be one of"):
+        collect_batch(str(samplesheet), str(tmp_path / "out"), get_default_criteria_path())
+    assert not (tmp_path / "out").exists()
+
+
+def test_collect_batch_quarantines_failing_samples(tmp_path):
+    bad = tmp_path / "BAD.depth.tsv"
+    bad.write_text(
+        "Sample_id\tRead_type\tDepth\nBAD\tshort\t1\nBAD\tlong\t2\nBAD\tshort\t3\n",
+        encoding="utf-8",
+    )
+    samplesheet = tmp_path / "sheet.csv"
+    _write_samplesheet(
+        samplesheet,
+        [
+            f"BAD,short,Escherichia coli,{bad}",
+            f"{SAMPLES[0]},short,Escherichia coli,{PRACTICE_DATA}/{SAMPLES[0]}",
+        ],
+    )
+    output_dir = tmp_path / "out"
+
+    with pytest.raises(QuarantinedSamplesError, match="1 sample") as raised:
+        collect_batch(
+            str(samplesheet),
+            str(output_dir),
+            get_default_criteria_path(),
+            continue_on_error=True,
+        )
+
+    assert (output_dir / f"{SAMPLES[0]}.csv").is_file()
+    assert not (output_dir / "BAD.csv").exists()
+    with open(raised.value.report_path, encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert rows == [
+        {
+            "sample_id": "BAD",
+            "stage": "parse",
+            "exception": "ValueError",
+            "message": "File must contain either one or two rows (short/long or hybrid).",
+            "input_files": str(bad),
+        }
+    ]
+
+    with pytest.raises(ValueError, match="one or two rows"):
+        collect_batch(str(samplesheet), str(output_dir), get_default_criteria_path())
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from speccheck.config import get_default_criteria_path
+from speccheck.main import collect, collect_stream
+
+PRACTICE_DATA = os.path.abspath("tests/practice_data")
+SAMPLES = ("Sample_178db692semb", "Sample_6d8e0e28ntam")
+
+
+def _specs(*specs):
+    return io.StringIO("".join(json.dumps(spec) + "\n" for spec in specs))
+
+
+def _stream(specs, **kwargs):
+    output = io.StringIO()
+    counts = collect_stream(specs, output, get_default_criteria_path(), **kwargs)
+    return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def _detailed_row(path):
+    with open(path, encoding="utf-8", newline="") as handle:
+        return next(csv.DictReader(handle))
+
+
+def _as_cell(key, value):
+    if value is None:
+        return ""
+    if key.endswith(("all_checks_passed", ".check")) and isinstance(value, bool):
+        return "PASSED" if value else "FAILED"
+    return str(value)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stream_reports_match_collected_csv(tmp_path, workers):
+    specs = _specs(
+        {"sample_id": SAMPLES[0], "files": [f"{PRACTICE_DATA}/{SAMPLES[0]}"]},
+        {"sample_id": SAMPLES[1], "files": f"{PRACTICE_DATA}/{SAMPLES[1]}", "organism": None},
+    )
+
+    counts, records = _stream(specs, organism="Escherichia coli", workers=workers, max_in_flight=1)
+
+    assert counts == (2, 0)
+    assert [record["sample_id"] for record in records] == list(SAMPLES)
+    for sample_id, record in zip(SAMPLES, records, strict=True):
+        assert record["ok"] is True
+        output_file = tmp_path / f"{sample_id}.csv"
+        collect(
+            "Escherichia coli",
+            [f"{PRACTICE_DATA}/{sample_id}"],
+            get_default_criteria_path(),
+            str(output_file),
+            sample_id,
+        )
+        expected = _detailed_row(tmp_path / f"detailed.{sample_id}.csv")
+        streamed = {key: _as_cell(key, value) for key, value in record["report"].items()}
+        assert streamed == expected
+
+
+def test_stream_reports_bad_specs_and_keeps_going(tmp_path):
+    specs = io.StringIO(
+        "not json\n"
+        "\n"
+        '{"files": ["x"]}\n'
+        + json.dumps({"sample_id": "EMPTY", "files": [str(tmp_path)]})
+        + "\n"
+        + json.dumps({"sample_id": SAMPLES[0], "files": [f"{PRACTICE_DATA}/{SAMPLES[0]}"]})
+        + "\n"
+    )
+
+    counts, records = _stream(specs)
+
+    assert counts == (4, 3)
+    assert [record["ok"] for record in records] == [False, False, False, True]
+    assert "invalid JSON" in records[0]["error"]
+    assert "missing sample_id" in records[1]["error"]
+    assert records[2] == {
+        "sample_id": "EMPTY",
+        "ok": False,
+        "error": "No files passed the checks.",
+    }
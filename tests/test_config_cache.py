@@ -0,0 +1,151 @@
+import csv
+
+import pytest
+
+from speccheck import config_cache
+from speccheck.config import get_default_criteria_path
+from speccheck.criteria import CriteriaStore, _load_criteria_store, load_criteria_store
+from speccheck.qualibact import _parse_thresholds, load_thresholds
+from speccheck.update_criteria import QUALIBACT_SNAPSHOT_PATH
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    monkeypatch.setenv(config_cache.CACHE_DIR_ENV, str(directory))
+    monkeypatch.setattr(config_cache, "PACKAGED_CACHE_DIR", tmp_path / "packaged")
+    _load_criteria_store.cache_clear()
+    yield directory
+    _load_criteria_store.cache_clear()
+
+
+@pytest.fixture
+def store_builds(monkeypatch):
+    built = []
+    original_init = CriteriaStore.__init__
+
+    def counting_init(self, path, data, sha256=None):
+        built.append(path)
+        original_init(self, path, data, sha256=sha256)
+
+    monkeypatch.setattr(CriteriaStore, "__init__", counting_init)
+    return built
+
+
+def _write_criteria(path, value="10000"):
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            ["species", "assembly_type", "software", "field", "operator", "value", "special_field"]
+        )
+        writer.writerow(["all", "all", "Quast", "N50", ">=", value, ""])
+        writer.writerow(["Escherichia coli", "all", "Speciator", "speciesName", "regex", ".*", ""])
+
+
+def test_compiled_criteria_are_reused_across_processes(tmp_path, cache_dir, store_builds):
+    criteria_file = tmp_path / "criteria.csv"
+    _write_criteria(criteria_file)
+    first = load_criteria_store(criteria_file)
+    first_layers = first.layers("Escherichia coli")
+
+    _load_criteria_store.cache_clear()  # a fresh process only has the on-disk cache
+    second = load_criteria_store(criteria_file)
+
+    assert len(store_builds) == 1
+    assert len(list(cache_dir.glob("criteria-*.pickle"))) == 1
+    assert second is not first
+    assert second.sha256 == first.sha256
+    assert second.path == str(criteria_file)
+    assert second.layers("Escherichia coli") == first_layers
+    assert second.validate() == ([], [])
+
+
+def test_edited_criteria_miss_the_compiled_cache(tmp_path, cache_dir, store_builds):
+    criteria_file = tmp_path / "criteria.csv"
+    _write_criteria(criteria_file)
+    load_criteria_store(criteria_file)
+
+    _write_criteria(criteria_file, value="20000")
+    _load_criteria_store.cache_clear()
+    store = load_criteria_store(criteria_file)
+
+    assert len(store_builds) == 2
+    assert store.layers()["baseline"][0]["value"] == 20000
+
+
+def test_corrupt_or_disabled_cache_falls_back_to_parsing(
+    tmp_path, cache_dir, store_builds, monkeypatch
+):
+    criteria_file = tmp_path / "criteria.csv"
+    _write_criteria(criteria_file)
+    load_criteria_store(criteria_file)
+    (entry,) = cache_dir.glob("criteria-*.pickle")
+    entry.write_bytes(b"not a pickle")
+
+    _load_criteria_store.cache_clear()
+    assert load_criteria_store(criteria_file).layers()["baseline"][0]["field"] == "N50"
+
+    monkeypatch.setenv(config_cache.DISABLE_ENV, "1")
+    _load_criteria_store.cache_clear()
+    load_criteria_store(criteria_file)
+
+    assert len(store_builds) == 3
+
+
+def test_unwritable_cache_dir_does_not_break_loading(tmp_path, monkeypatch):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory", encoding="utf-8")
+    monkeypatch.setenv(config_cache.CACHE_DIR_ENV, str(blocker / "cache"))
+
+    assert config_cache.load_compiled("example", "0" * 64, lambda: {"built": True}) == {
+        "built": True
+    }
+
+
+@pytest.mark.parametrize("shared", ["entry", "directory"])
+def test_cache_entries_writable_by_others_are_not_unpickled(cache_dir, shared):
+    sha256 = "b" * 64
+    entry = cache_dir / config_cache.cache_key("example", sha256)
+    config_cache.write_entry(entry, "cached")
+    assert config_cache.load_compiled("example", sha256, lambda: "built") == "cached"
+
+    shared_path = entry if shared == "entry" else cache_dir
+    shared_path.chmod(shared_path.stat().st_mode | 0o022)
+
+    assert config_cache.load_compiled("example", sha256, lambda: "built") == "built"
+
+
+def test_packaged_entries_take_precedence(tmp_path, cache_dir):
+    sha256 = "a" * 64
+    config_cache.write_entry(
+        config_cache.PACKAGED_CACHE_DIR / config_cache.cache_key("example", sha256),
+        "packaged",
+    )
+
+    assert config_cache.load_compiled("example", sha256, lambda: "built") == "packaged"
+    assert not cache_dir.exists()
+
+
+def test_cached_qualibact_thresholds_match_snapshot(cache_dir):
+    load_thresholds.cache_clear()
+    try:
+        thresholds = load_thresholds()
+        load_thresholds.cache_clear()
+        cached = load_thresholds()
+    finally:
+        load_thresholds.cache_clear()
+
+    with open(QUALIBACT_SNAPSHOT_PATH, encoding="utf-8") as handle:
+        expected = _parse_thresholds(handle.read())
+    assert thresholds == cached == expected
+    assert len(list(cache_dir.glob("qualibact-*.pickle"))) == 1
+
+
+def test_default_criteria_compile_round_trip(cache_dir):
+    store = load_criteria_store(get_default_criteria_path())
+    _load_criteria_store.cache_clear()
+    cached = load_criteria_store(get_default_criteria_path())
+
+    assert cached.species_fields() == store.species_fields()
+    assert cached.layers("Escherichia coli") == store.layers("Escherichia coli")
+    assert cached.species_names == store.species_names
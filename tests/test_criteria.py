@@ -1,8 +1,15 @@
 import csv
+import hashlib
 
 import pytest
 
-from speccheck.criteria import get_criteria_layers, validate_criteria
+from speccheck.criteria import (
+    CriteriaStore,
+    get_criteria_layers,
+    get_species_field,
+    load_criteria_store,
+    validate_criteria,
+)
 
 HEADERS = [
     "species",
@@ -134,3 +141,64 @@ def test_get_criteria_layers_without_species_keeps_baseline(tmp_path):
     assert layers["baseline_overridden_count"] == 0
     assert [row["field"] for row in layers["baseline"]] == ["N50"]
     assert layers["species"] == []
+
+
+def test_criteria_store_parses_file_once_per_process(tmp_path, monkeypatch):
+    criteria_file = tmp_path / "criteria.csv"
+    _write_criteria(
+        criteria_file,
+        [
+            _valid_row(field="N50", value="10000"),
+            _valid_row(species="Escherichia coli", field="N50", value="20000"),
+            _valid_row(species="Klebsiella pneumoniae", field="GC", value="55"),
+        ],
+    )
+    created = []
+    original_init = CriteriaStore.__init__
+
+    def counting_init(self, path, data, sha256=None):
+        created.append(path)
+        original_init(self, path, data, sha256=sha256)
+
+    monkeypatch.setattr(CriteriaStore, "__init__", counting_init)
+
+    validate_criteria(criteria_file)
+    get_species_field(criteria_file)
+    get_criteria_layers(criteria_file, species="Escherichia coli")
+    get_criteria_layers(criteria_file, species="Klebsiella pneumoniae")
+
+    assert len(created) == 1
+    assert (
+        load_criteria_store(criteria_file).sha256
+        == hashlib.sha256(criteria_file.read_bytes()).hexdigest()
+    )
+
+
+def test_criteria_store_reloads_edited_file(tmp_path):
+    criteria_file = tmp_path / "criteria.csv"
+    _write_criteria(criteria_file, [_valid_row(field="N50", value="10000")])
+    first = load_criteria_store(criteria_file)
+
+    _write_criteria(
+        criteria_file,
+        [_valid_row(field="N50", value="10000"), _valid_row(field="GC", value="55")],
+    )
+
+    assert load_criteria_store(criteria_file) is not first
+    assert len(get_criteria_layers(criteria_file)["baseline"]) == 2
+
+
+def test_criteria_store_layers_are_independent_copies(tmp_path):
+    criteria_file = tmp_path / "criteria.csv"
+    _write_criteria(criteria_file, [_valid_row(field="N50", value="10000")])
+
+    layers = get_criteria_layers(criteria_file)
+    layers["baseline"][0]["value"] = 0
+    layers["baseline"].clear()
+    store = load_criteria_store(criteria_file)
+    store.criteria()[0]["value"] = 0
+    store.rows_for("all")[0]["value"] = 0
+
+    assert len(get_criteria_layers(criteria_file)["baseline"]) == 1
+    assert get_criteria_layers(criteria_file)["baseline"][0]["value"] == 10000
+    assert store.criteria()[0]["value"] == 10000
@@ -0,0 +1,82 @@
+import pytest
+
+from speccheck.dispatch import ParserDispatcher
+from speccheck.modules.base import Parser
+from speccheck.registry import get_parser_classes
+
+
+class CountingParser(Parser):
+    software_name = "Counting"
+    filename_suffixes = (".tsv",)
+    format_checks = 0
+
+    @classmethod
+    def matches_header(cls, header):
+        return header.startswith("counting\t")
+
+    @property
+    def has_valid_filename(self):
+        return self.file_path.endswith(".tsv")
+
+    @property
+    def has_valid_fileformat(self):
+        type(self).format_checks += 1
+        return True
+
+    def fetch_values(self):
+        return {"count": 1}
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+    CountingParser.format_checks = 0
+
+
+def _detected(file_path):
+    dispatcher = ParserDispatcher(get_parser_classes())
+    return [parser.software_name for parser in dispatcher.match(file_path)]
+
+
+@pytest.mark.parametrize(
+    ("file_path", "expected"),
+    [
+        ("tests/collect_test_data/report.tsv", ["Quast"]),
+        ("tests/collect_test_data/checkm.short.tsv", ["Checkm"]),
+        ("tests/collect_test_data/sylph.tsv", ["Sylph"]),
+        ("tests/collect_test_data/test_sample1.short.tsv", ["Speciator"]),
+        ("tests/collect_test_data/ariba_mlst_report.details.tsv", ["Ariba"]),
+        ("tests/fastp/fastp_test.json", ["Fastp"]),
+        ("tests/busco/short_summary.test.txt", ["Busco"]),
+    ],
+)
+def test_dispatcher_detects_builtin_parsers(file_path, expected):
+    assert _detected(file_path) == expected
+
+
+def test_dispatcher_indexes_candidates_by_filename_suffix():
+    dispatcher = ParserDispatcher(get_parser_classes())
+
+    assert [cls.__name__ for cls in dispatcher.candidates("sample.JSON")] == ["Fastp"]
+    assert "Quast" in [cls.__name__ for cls in dispatcher.candidates("ori_x.short.report.tsv")]
+    assert "Quast" not in [cls.__name__ for cls in dispatcher.candidates("x.short.tsv")]
+    assert dispatcher.candidates("notes.md") == []
+
+
+def test_dispatcher_skips_full_validation_when_header_does_not_match(tmp_path):
+    other = tmp_path / "other.tsv"
+    other.write_text("something\telse\n", encoding="utf-8")
+    matching = tmp_path / "match.tsv"
+    matching.write_text("counting\tvalue\n", encoding="utf-8")
+    dispatcher = ParserDispatcher([CountingParser])
+
+    assert dispatcher.match(other) == []
+    assert CountingParser.format_checks == 0
+    assert [type(parser) for parser in dispatcher.match(matching)] == [CountingParser]
+    assert CountingParser.format_checks == 1
+
+
+def test_dispatcher_raises_for_unreadable_inputs(tmp_path):
+    dispatcher = ParserDispatcher([CountingParser])
+
+    with pytest.raises(FileNotFoundError):
+        dispatcher.match(tmp_path / "missing.tsv")
@@ -0,0 +1,76 @@
+from speccheck.collect_workflow import _evaluation_plan_for, _prepare_collection_context
+from speccheck.config import get_default_criteria_path
+from speccheck.evaluation import EvaluationPlan, compile_criterion
+
+
+def _row(software, field, operator, value, severity="fail"):
+    return {
+        "assembly_type": "all",
+        "software": software,
+        "field": field,
+        "operator": operator,
+        "value": value,
+        "severity": severity,
+        "source": "test",
+        "special_field": "",
+    }
+
+
+def test_plan_indexes_rows_by_recovered_software():
+    plan = EvaluationPlan.build(
+        [
+            _row("Quast", "N50", ">=", 1000),
+            _row("DepthParser.short", "Depth", ">=", 30),
+            _row("Checkm", "Completeness", ">=", 90),
+        ],
+        [],
+    )
+
+    assert [criterion.name for criterion in plan.baseline["Quast"]] == ["N50"]
+    assert [criterion.software for criterion in plan.baseline["Depth"]] == ["DepthParser.short"]
+    assert "Sylph" not in plan.baseline
+    assert plan.species_checks_available is False
+
+
+def test_compiled_criterion_coerces_numeric_strings_once_compiled():
+    criterion = compile_criterion(_row("Quast", "N50", ">=", 1000))
+
+    assert criterion.check({"N50": "2000"})
+    assert not criterion.check({"N50": "500"})
+    assert not criterion.check({"N50": "not a number"})
+
+
+def test_compiled_regex_matches_from_start():
+    criterion = compile_criterion(_row("Speciator", "speciesName", "regex", "^Escherichia coli"))
+
+    assert criterion.check({"speciesName": "Escherichia coli"})
+    assert not criterion.check({"speciesName": "Klebsiella pneumoniae"})
+
+
+def test_plan_evaluate_reports_statuses_and_reasons():
+    plan = EvaluationPlan.build(
+        [_row("Quast", "N50", ">=", 1000), _row("Quast", "GC (%)", "<=", 40, severity="warn")],
+        [_row("Quast", "Missing metric", ">=", 1)],
+    )
+
+    report = plan.evaluate({"Quast": {"N50": 500, "GC (%)": 50}})
+
+    assert report["Quast.N50.check"] is False
+    assert report["Quast.GC (%).status"] == "WARN"
+    assert report["Quast.Missing metric.check"] == "NOT_EVALUATED"
+    assert report["speccheck_overall_status"] == "FAIL"
+    assert report["speccheck_failure_reasons"] == "Quast.N50 >=1000 (test)"
+    assert report["_not_evaluated_count"] == 1
+
+
+def test_collection_context_caches_plans_per_organism_and_assembly_type():
+    context = _prepare_collection_context(get_default_criteria_path())
+
+    short_plan = _evaluation_plan_for(context, "Escherichia coli", "short")
+
+    assert _evaluation_plan_for(context, "Escherichia coli", "short") is short_plan
+    assert _evaluation_plan_for(context, "Escherichia coli", "long") is not short_plan
+    assert set(context.evaluation_plans) == {
+        ("Escherichia coli", "short"),
+        ("Escherichia coli", "long"),
+    }
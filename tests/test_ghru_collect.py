@@ -1,9 +1,19 @@
 import csv
+import json
+import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 
+import pytest
+from typer.testing import CliRunner
+
+from speccheck.cli import app
 from speccheck.config import get_default_criteria_path
-from speccheck.ghru import discover_ghru_sample_files
-from speccheck.main import collect_ghru
+from speccheck.ghru import discover_ghru_sample_files, load_ghru_sample_files
+from speccheck.main import collect_ghru, collect_worker
+from speccheck.manifest import CollectManifest
+from speccheck.quarantine import QuarantinedSamplesError
+from speccheck.sinks import read_sink_records
 
 
 def _write_depth_report(path, sample_id="test_sample1", read_type="short", depth="42.0"):
@@ -78,3 +88,496 @@ def test_collect_ghru_writes_per_sample_csv(tmp_path):
     assert row["Speciator.speciesName"] == "Mycoplasma genitalium"
     assert row["Checkm.Completeness"] == "93.2"
     assert row["Quast.N50"] == "579729"
+
+
+def _stage_second_sample(output_dir, sample_id="test_sample2"):
+    shutil.copyfile(
+        "tests/collect_test_data/report.tsv",
+        output_dir / "quast_summary" / f"ori_{sample_id}.short.report.tsv",
+    )
+    shutil.copyfile(
+        "tests/collect_test_data/checkm.short.tsv",
+        output_dir / "checkm_summary" / f"{sample_id}.short.tsv",
+    )
+
+
+@pytest.mark.parametrize("io_threads", [0, 2])
+def test_collect_ghru_skips_samples_whose_files_match_no_parser(tmp_path, io_threads):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    (output_dir / "quast_summary" / "ori_test_sample2.short.report.tsv").write_text(
+        "not a tool report\n", encoding="utf-8"
+    )
+    collect_dir = tmp_path / "collect"
+
+    written = collect_ghru(
+        str(output_dir),
+        str(collect_dir),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+        continue_on_error=True,
+        io_threads=io_threads,
+    )
+
+    assert written == [str(collect_dir / "test_sample1.csv")]
+    assert not (collect_dir / "test_sample2.csv").exists()
+    assert sorted(CollectManifest.load(collect_dir).samples) == ["test_sample1"]
+
+
+def test_collect_ghru_with_workers_matches_serial_output(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+
+    serial = collect_ghru(
+        str(output_dir),
+        str(serial_dir),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+    )
+    parallel = collect_ghru(
+        str(output_dir),
+        str(parallel_dir),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+        workers=2,
+    )
+
+    assert [os.path.basename(path) for path in parallel] == ["test_sample1.csv", "test_sample2.csv"]
+    assert [os.path.basename(path) for path in serial] == [
+        os.path.basename(path) for path in parallel
+    ]
+    for serial_path, parallel_path in zip(serial, parallel, strict=True):
+        with (
+            open(serial_path, encoding="utf-8") as expected,
+            open(parallel_path, encoding="utf-8") as actual,
+        ):
+            assert actual.read() == expected.read()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_collect_ghru_with_io_threads_matches_serial_output(tmp_path, workers):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    serial_dir = tmp_path / "serial"
+    staged_dir = tmp_path / "staged"
+
+    collect_ghru(
+        str(output_dir),
+        str(serial_dir),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+    )
+    staged = collect_ghru(
+        str(output_dir),
+        str(staged_dir),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+        workers=workers,
+        io_threads=2,
+    )
+
+    assert [os.path.basename(path) for path in staged] == ["test_sample1.csv", "test_sample2.csv"]
+    for name in ["test_sample1.csv", "detailed.test_sample1.csv", "test_sample2.csv"]:
+        assert (staged_dir / name).read_text() == (serial_dir / name).read_text()
+
+
+def test_collect_ghru_with_io_threads_quarantines_failures(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    (work_dir / "test_sample2.shortshort_reads.depth.tsv").write_text(
+        "Sample_id\tRead_type\tDepth\n" + "test_sample2\tshort\t42.0\n" * 3,
+        encoding="utf-8",
+    )
+    collect_dir = tmp_path / "collect"
+
+    with pytest.raises(QuarantinedSamplesError):
+        collect_ghru(
+            str(output_dir),
+            str(collect_dir),
+            get_default_criteria_path(),
+            organism="Mycoplasma genitalium",
+            work_dir=str(work_dir),
+            io_threads=2,
+            output_format="jsonl",
+            continue_on_error=True,
+        )
+
+    records = read_sink_records(str(collect_dir / "speccheck_results.jsonl"))
+    assert [record["sample_id"] for record in records] == ["test_sample1"]
+
+
+def test_collect_ghru_with_workers_writes_one_result_file(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    collect_dir = tmp_path / "collect"
+
+    written = collect_ghru(
+        str(output_dir),
+        str(collect_dir),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+        workers=2,
+        output_format="sqlite",
+    )
+
+    assert written == [str(collect_dir / "speccheck_results.sqlite")]
+    assert [record["sample_id"] for record in read_sink_records(written[0])] == [
+        "test_sample1",
+        "test_sample2",
+    ]
+    assert not list(collect_dir.glob("*.csv"))
+
+
+def test_collect_ghru_rejects_invalid_worker_count(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+
+    with pytest.raises(ValueError, match="workers must be at least 1"):
+        collect_ghru(
+            str(output_dir), str(tmp_path / "collect"), get_default_criteria_path(), workers=0
+        )
+
+
+def _count_collected(monkeypatch):
+    import speccheck.collect_workflow as collect_workflow
+
+    collected = []
+    original = collect_workflow.collect
+
+    def counting_collect(*args, **kwargs):
+        collected.append(args[4])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(collect_workflow, "collect", counting_collect)
+    return collected
+
+
+def test_collect_ghru_incremental_skips_unchanged_samples(tmp_path, monkeypatch):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    collect_dir = tmp_path / "collect"
+    collected = _count_collected(monkeypatch)
+
+    def run(**kwargs):
+        return collect_ghru(
+            str(output_dir),
+            str(collect_dir),
+            get_default_criteria_path(),
+            organism=kwargs.pop("organism", "Mycoplasma genitalium"),
+            incremental=True,
+            **kwargs,
+        )
+
+    first = run()
+    assert collected == ["test_sample1", "test_sample2"]
+    assert (collect_dir / ".speccheck_manifest.json").is_file()
+
+    collected.clear()
+    assert run() == first
+    assert collected == []
+
+    checkm = output_dir / "checkm_summary" / "test_sample2.short.tsv"
+    stat = checkm.stat()
+    os.utime(checkm, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    _stage_second_sample(output_dir, sample_id="test_sample3")
+    run()
+    assert collected == ["test_sample2", "test_sample3"]
+
+    collected.clear()
+    (collect_dir / "test_sample1.csv").unlink()
+    run()
+    assert collected == ["test_sample1"]
+
+    collected.clear()
+    (collect_dir / "detailed.test_sample2.csv").unlink()
+    run()
+    assert collected == ["test_sample2"]
+
+    collected.clear()
+    run(organism="Escherichia coli")
+    assert collected == ["test_sample1", "test_sample2", "test_sample3"]
+
+
+def test_collect_ghru_hash_inputs_ignores_touched_files(tmp_path, monkeypatch):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    collect_dir = tmp_path / "collect"
+    collected = _count_collected(monkeypatch)
+
+    def run():
+        collect_ghru(
+            str(output_dir),
+            str(collect_dir),
+            get_default_criteria_path(),
+            organism="Mycoplasma genitalium",
+            incremental=True,
+            hash_inputs=True,
+        )
+
+    run()
+    report = output_dir / "quast_summary" / "ori_test_sample1.short.report.tsv"
+    stat = report.stat()
+    os.utime(report, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    run()
+    assert collected == ["test_sample1"]
+
+    with open(report, "a", encoding="utf-8") as handle:
+        handle.write("Extra metric\t1\n")
+    run()
+    assert collected == ["test_sample1", "test_sample1"]
+
+
+def test_collect_ghru_resume_skips_samples_finished_before_a_crash(tmp_path, monkeypatch):
+    import speccheck.collect_workflow as collect_workflow
+
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    _stage_second_sample(output_dir, sample_id="test_sample3")
+    collect_dir = tmp_path / "collect"
+    collected = _count_collected(monkeypatch)
+    counting_collect = collect_workflow.collect
+
+    def crashing_collect(*args, **kwargs):
+        if args[4] == "test_sample3":
+            raise MemoryError("killed")
+        return counting_collect(*args, **kwargs)
+
+    def run(**kwargs):
+        return collect_ghru(
+            str(output_dir),
+            str(collect_dir),
+            get_default_criteria_path(),
+            organism="Mycoplasma genitalium",
+            **kwargs,
+        )
+
+    # A killed process never gets to write its manifest.
+    monkeypatch.setattr(collect_workflow.CollectManifest, "save", lambda self: None)
+    monkeypatch.setattr(collect_workflow, "collect", crashing_collect)
+    with pytest.raises(MemoryError):
+        run()
+    assert collected == ["test_sample1", "test_sample2"]
+    journal = collect_dir / ".speccheck_journal.jsonl"
+    with open(journal, "a", encoding="utf-8") as handle:
+        handle.write('{"sample_id": "test_sam')
+
+    monkeypatch.setattr(collect_workflow, "collect", counting_collect)
+    (collect_dir / "detailed.test_sample2.csv").write_text("truncated", encoding="utf-8")
+    collected.clear()
+    run(resume=True)
+
+    assert collected == ["test_sample2", "test_sample3"]
+    assert not journal.exists()
+
+
+def test_collect_ghru_does_not_reread_outputs_for_the_journal(tmp_path, monkeypatch):
+    import speccheck.manifest as manifest
+
+    def no_hashing(path):
+        raise AssertionError(f"hashed {path}")
+
+    monkeypatch.setattr(manifest, "file_sha256", no_hashing)
+    output_dir = _stage_ghru_fixture(tmp_path)
+
+    written = collect_ghru(
+        str(output_dir),
+        str(tmp_path / "collect"),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+    )
+
+    assert len(written) == 1
+
+
+def test_collect_pipeline_continue_on_error_exits_non_zero(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    (work_dir / "test_sample2.shortshort_reads.depth.tsv").write_text(
+        "Sample_id\tRead_type\tDepth\n" + "test_sample2\tshort\t42.0\n" * 3,
+        encoding="utf-8",
+    )
+    collect_dir = tmp_path / "collect"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "collect-pipeline",
+            str(output_dir),
+            str(collect_dir),
+            "--organism",
+            "Mycoplasma genitalium",
+            "--work-dir",
+            str(work_dir),
+            "--workers",
+            "2",
+            "--continue-on-error",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert (collect_dir / "test_sample1.csv").is_file()
+    with open(collect_dir / "speccheck_quarantine.csv", encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(row["sample_id"], row["stage"]) for row in rows] == [("test_sample2", "parse")]
+
+
+@pytest.mark.parametrize("io_threads", [0, 2])
+def test_failing_worker_sample_logs_reach_the_parent(tmp_path, caplog, io_threads):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    (work_dir / "test_sample2.shortshort_reads.depth.tsv").write_text(
+        "Sample_id\tRead_type\tDepth\n" + "test_sample2\tshort\t42.0\n" * 3,
+        encoding="utf-8",
+    )
+
+    with caplog.at_level("INFO"), pytest.raises(ValueError):
+        collect_ghru(
+            str(output_dir),
+            str(tmp_path / "collect"),
+            get_default_criteria_path(),
+            organism="Mycoplasma genitalium",
+            work_dir=str(work_dir),
+            workers=2,
+            io_threads=io_threads,
+        )
+
+    assert any("test_sample2" in message for message in caplog.messages)
+
+
+def test_collect_ghru_shards_partition_samples(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    for index in range(2, 7):
+        _stage_second_sample(output_dir, sample_id=f"test_sample{index}")
+    collect_dir = tmp_path / "collect"
+
+    written = []
+    for index in range(3):
+        written.extend(
+            collect_ghru(
+                str(output_dir),
+                str(collect_dir),
+                get_default_criteria_path(),
+                organism="Mycoplasma genitalium",
+                shard=(index, 3),
+                discovery_cache=str(tmp_path / "discovery.json"),
+            )
+        )
+
+    assert sorted(written) == [
+        str(collect_dir / f"test_sample{index}.csv") for index in range(1, 7)
+    ]
+    assert len(CollectManifest.load(collect_dir).samples) == 6
+
+
+def test_discovery_cache_is_shared_until_the_tree_changes(tmp_path, monkeypatch):
+    import speccheck.ghru as ghru
+
+    output_dir = _stage_ghru_fixture(tmp_path)
+    cache_file = str(tmp_path / "cache" / "discovery.json")
+    walks = []
+    original = ghru.discover_ghru_sample_files
+
+    def counting_discover(*args, **kwargs):
+        walks.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(ghru, "discover_ghru_sample_files", counting_discover)
+
+    first = load_ghru_sample_files(str(output_dir), cache_file=cache_file)
+    second = load_ghru_sample_files(str(output_dir), cache_file=cache_file)
+    assert len(walks) == 1
+    assert second == first
+
+    _stage_second_sample(output_dir)
+    third = load_ghru_sample_files(str(output_dir), cache_file=cache_file)
+    assert len(walks) == 2
+    assert sorted(third) == ["test_sample1", "test_sample2"]
+
+
+def _run_worker(output_dir, collect_dir, worker_id):
+    return collect_worker(
+        output_dir,
+        collect_dir,
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+        worker_id=worker_id,
+        poll_interval=0.05,
+    )
+
+
+def test_collect_workers_share_a_queue(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    for index in range(2, 9):
+        _stage_second_sample(output_dir, sample_id=f"test_sample{index}")
+    collect_dir = tmp_path / "collect"
+
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        results = list(
+            executor.map(
+                _run_worker,
+                [str(output_dir)] * 3,
+                [str(collect_dir)] * 3,
+                ["w1", "w2", "w3"],
+            )
+        )
+
+    written = sorted(path for worker in results for path in worker)
+    assert written == sorted(str(collect_dir / f"test_sample{index}.csv") for index in range(1, 9))
+    assert len(CollectManifest.load(collect_dir).samples) == 8
+    assert sorted(os.listdir(collect_dir / ".speccheck_queue" / "done")) == sorted(
+        f"test_sample{index}.json" for index in range(1, 9)
+    )
+    assert _run_worker(str(output_dir), str(collect_dir), "late") == []
+
+
+def test_collect_worker_rejects_a_queue_for_another_tree(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    collect_dir = tmp_path / "collect"
+    _run_worker(str(output_dir), str(collect_dir), "w1")
+    other_tree = tmp_path / "other"
+    shutil.copytree(output_dir, other_tree)
+
+    with pytest.raises(ValueError, match="was filled for output_tree"):
+        _run_worker(str(other_tree), str(collect_dir), "w2")
+
+
+def test_collect_worker_skips_samples_whose_files_match_no_parser(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    (output_dir / "quast_summary" / "ori_test_sample2.short.report.tsv").write_text(
+        "not a tool report\n", encoding="utf-8"
+    )
+    collect_dir = tmp_path / "collect"
+
+    written = _run_worker(str(output_dir), str(collect_dir), "w1")
+
+    assert written == [str(collect_dir / "test_sample1.csv")]
+    assert sorted(CollectManifest.load(collect_dir).samples) == ["test_sample1"]
+    marker = collect_dir / ".speccheck_queue" / "done" / "test_sample2.json"
+    assert json.loads(marker.read_text())["output_file"] is None
+
+
+def test_killed_collect_worker_keeps_manifest_entries(tmp_path, monkeypatch):
+    import speccheck.worker_workflow as worker_workflow
+
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    collect_dir = tmp_path / "collect"
+    collect_sample = worker_workflow._collect_ghru_sample
+
+    def killed_on_second_sample(sample, options, context):
+        if sample.sample_id == "test_sample2":
+            # A killed process runs no cleanup, so nothing is saved from here on.
+            monkeypatch.setattr(CollectManifest, "save", lambda self: None)
+            raise MemoryError("killed")
+        return collect_sample(sample, options, context)
+
+    monkeypatch.setattr(worker_workflow, "_collect_ghru_sample", killed_on_second_sample)
+    with pytest.raises(MemoryError):
+        _run_worker(str(output_dir), str(collect_dir), "w1")
+
+    assert sorted(CollectManifest.load(collect_dir).samples) == ["test_sample1"]
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+HEAVY_MODULES = ("jinja2", "numpy", "openpyxl", "pandas", "plotly", "requests")
+# Cumulative ``-X importtime`` budget for ``speccheck.cli``; pandas alone costs more.
+CLI_IMPORT_BUDGET_US = 500_000
+
+
+def _run_python(code, *args):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, *args, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+
+def test_single_sample_collect_does_not_import_heavy_modules(tmp_path):
+    result = _run_python(
+        f"""
+        import sys
+
+        from speccheck.cli import app
+
+        try:
+            app(
+                [
+                    "collect",
+                    "tests/practice_data/Sample_178db692semb",
+                    "--sample",
+                    "Sample_178db692semb",
+                    "--organism",
+                    "Escherichia coli",
+                    "--output-file",
+                    {str(tmp_path / "out.csv")!r},
+                ]
+            )
+        except SystemExit as exc:
+            assert not exc.code, exc.code
+        print("loaded:", *(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+        """
+    )
+
+    assert (tmp_path / "out.csv").exists()
+    assert result.stdout.splitlines()[-1] == "loaded:"
+
+
+def test_cli_import_stays_within_budget():
+    result = _run_python("import speccheck.cli", "-X", "importtime")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, total, name = line.removeprefix("import time:").split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    assert not set(HEAVY_MODULES) & set(cumulative)
+    assert cumulative["speccheck.cli"] < CLI_IMPORT_BUDGET_US
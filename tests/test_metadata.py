@@ -0,0 +1,110 @@
+import math
+
+import pandas as pd
+import pytest
+
+from speccheck import config_cache
+from speccheck.collect_workflow import _load_metadata
+from speccheck.metadata import MetadataIndex, _load_metadata_index, load_metadata_index
+
+METADATA = (
+    "sample_id,country,year,depth,passed,note\n"
+    "S1,UK,2020,31.5,True,plain\n"
+    "\n"
+    'S2,"Viet Nam, South",2021,,False,"two\nlines"\n'
+    "003,Ghana,2019,12.0,True,\n"
+)
+
+
+@pytest.fixture
+def metadata_file(tmp_path, monkeypatch):
+    monkeypatch.setenv(config_cache.CACHE_DIR_ENV, str(tmp_path / "cache"))
+    _load_metadata_index.cache_clear()
+    path = tmp_path / "metadata.csv"
+    path.write_text(METADATA, encoding="utf-8")
+    yield path
+    _load_metadata_index.cache_clear()
+
+
+def _pandas_rows(path):
+    frame = pd.read_csv(path, dtype={"sample_id": str})
+    return frame.set_index("sample_id").to_dict("index")
+
+
+def _same_row(left, right):
+    assert left.keys() == right.keys()
+    for column, value in left.items():
+        other = right[column]
+        if isinstance(value, float) and math.isnan(value):
+            assert isinstance(other, float) and math.isnan(other)
+        else:
+            assert value == other
+            assert type(value) is type(other)
+
+
+def test_single_rows_match_full_pandas_read(metadata_file):
+    index = load_metadata_index(metadata_file)
+    expected = _pandas_rows(metadata_file)
+
+    assert len(index) == 3
+    assert "003" in index and "3" not in index
+    for sample_id, row in expected.items():
+        _same_row(index[sample_id], row)
+    assert index.get("missing") is None
+    with pytest.raises(KeyError):
+        index["missing"]
+
+
+def test_rows_for_joins_only_requested_samples(metadata_file):
+    index = load_metadata_index(metadata_file)
+    expected = _pandas_rows(metadata_file)
+
+    rows = index.rows_for(["003", "missing", "S2"])
+
+    assert set(rows) == {"003", "S2"}
+    for sample_id, row in rows.items():
+        _same_row(row, expected[sample_id])
+
+
+def test_index_is_reused_from_disk_cache(metadata_file, monkeypatch):
+    load_metadata_index(metadata_file)
+    _load_metadata_index.cache_clear()
+    builds = []
+    original_build = MetadataIndex.build.__func__
+
+    def counting_build(cls, path, data):
+        builds.append(path)
+        return original_build(cls, path, data)
+
+    monkeypatch.setattr(MetadataIndex, "build", classmethod(counting_build))
+
+    index = load_metadata_index(metadata_file)
+
+    assert builds == []
+    assert index.path == str(metadata_file)
+    assert index["S1"]["country"] == "UK"
+
+
+def test_load_metadata_streams_selected_samples(metadata_file):
+    assert _load_metadata(None) == {}
+    assert isinstance(_load_metadata(str(metadata_file)), MetadataIndex)
+    assert set(_load_metadata(str(metadata_file), ["S1"])) == {"S1"}
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("name,country\nS1,UK\n", "must contain a 'sample_id' column"),
+        ("sample_id,country\nS1,UK\nS1,FR\n", "duplicate sample_id"),
+    ],
+)
+def test_invalid_metadata_is_rejected(metadata_file, text, message):
+    metadata_file.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        load_metadata_index(metadata_file)
+
+
+def test_missing_metadata_file_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError, match="Metadata file not found"):
+        load_metadata_index(tmp_path / "missing.csv")
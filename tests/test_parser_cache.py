@@ -0,0 +1,61 @@
+import shutil
+
+import pytest
+
+from speccheck.collect import collect_files
+from speccheck.dispatch import ParserDispatcher
+from speccheck.modules.fastp import Fastp
+from speccheck.modules.quast import Quast
+from speccheck.registry import get_parser_classes
+
+
+def test_detection_and_extraction_share_one_read(tmp_path):
+    report = tmp_path / "report.tsv"
+    shutil.copyfile("tests/collect_test_data/report.tsv", report)
+    quast = Quast(report)
+
+    assert quast.has_valid_fileformat
+    report.unlink()
+
+    assert quast.fetch_values()["N50"] == 579729
+
+
+def test_clear_cache_drops_parsed_content(tmp_path):
+    report = tmp_path / "fastp.json"
+    shutil.copyfile("tests/fastp/fastp_test.json", report)
+    fastp = Fastp(report)
+
+    assert fastp.has_valid_fileformat
+    fastp.clear_cache()
+    report.unlink()
+
+    with pytest.raises(FileNotFoundError):
+        fastp.fetch_values()
+
+
+def test_fetch_values_returns_a_fresh_mapping(tmp_path):
+    quast = Quast("tests/collect_test_data/report.tsv")
+
+    values = quast.fetch_values()
+    values["N50"] = 0
+
+    assert quast.fetch_values()["N50"] == 579729
+
+
+def test_dispatcher_seeds_cache_for_small_files(tmp_path):
+    report = tmp_path / "checkm.short.tsv"
+    shutil.copyfile("tests/collect_test_data/checkm.short.tsv", report)
+
+    (parser,) = ParserDispatcher(get_parser_classes()).match(report)
+    report.unlink()
+
+    assert parser.fetch_values()["Completeness"] == 93.2
+
+
+def test_collect_files_releases_parser_cache(monkeypatch):
+    released = []
+    monkeypatch.setattr(Quast, "clear_cache", lambda self: released.append(self.file_path))
+
+    collect_files(["tests/collect_test_data/report.tsv"], [Quast])
+
+    assert released == ["tests/collect_test_data/report.tsv"]
@@ -0,0 +1,81 @@
+import csv
+import hashlib
+import shutil
+
+import pytest
+
+from speccheck.config import get_default_criteria_path
+from speccheck.main import collect, recheck
+
+PRACTICE_DATA = "tests/practice_data"
+SAMPLES = ("Sample_178db692semb", "Sample_6d8e0e28ntam")
+
+
+def _read_row(path):
+    with open(path, encoding="utf-8", newline="") as handle:
+        return next(csv.DictReader(handle))
+
+
+@pytest.fixture
+def collected(tmp_path):
+    collect_dir = tmp_path / "collect"
+    metadata = tmp_path / "metadata.csv"
+    metadata.write_text(
+        "sample_id,country\n" + "".join(f"{sample},Ghana\n" for sample in SAMPLES),
+        encoding="utf-8",
+    )
+    for sample in SAMPLES:
+        collect(
+            "Escherichia coli",
+            [f"{PRACTICE_DATA}/{sample}"],
+            get_default_criteria_path(),
+            str(collect_dir / f"{sample}.csv"),
+            sample,
+            metadata_file=str(metadata),
+            assembly_type="hybrid",
+        )
+    return collect_dir
+
+
+def test_recheck_with_unchanged_criteria_reproduces_collect_output(collected, tmp_path):
+    recheck_dir = tmp_path / "recheck"
+
+    written = recheck(
+        str(collected), str(recheck_dir), get_default_criteria_path(), organism="Escherichia coli"
+    )
+
+    assert written == [str(recheck_dir / f"{sample}.csv") for sample in SAMPLES]
+    for sample in SAMPLES:
+        for name in (f"{sample}.csv", f"detailed.{sample}.csv"):
+            assert (recheck_dir / name).read_text(encoding="utf-8") == (collected / name).read_text(
+                encoding="utf-8"
+            )
+
+
+def test_recheck_applies_new_criteria_and_provenance(collected, tmp_path):
+    criteria_file = tmp_path / "criteria.csv"
+    shutil.copyfile(get_default_criteria_path(), criteria_file)
+    with open(criteria_file, "a", encoding="utf-8") as handle:
+        handle.write("Escherichia coli,all,Quast,N50,>=,999999999,fail,custom,\n")
+    recheck_dir = tmp_path / "recheck"
+
+    recheck(str(collected), str(recheck_dir), str(criteria_file), organism="Escherichia coli")
+
+    before = _read_row(collected / f"detailed.{SAMPLES[0]}.csv")
+    after = _read_row(recheck_dir / f"detailed.{SAMPLES[0]}.csv")
+    assert before["Quast.N50.check"] == "PASSED"
+    assert after["Quast.N50.check"] == "FAILED"
+    assert "Quast.N50 >=999999999 (custom)" in after["speccheck_failure_reasons"]
+    assert (
+        after["speccheck_criteria_sha256"] == hashlib.sha256(criteria_file.read_bytes()).hexdigest()
+    )
+    assert after["speccheck_criteria_file"] == str(criteria_file)
+    assert after["speccheck_assembly_type"] == "hybrid"
+    assert after["speccheck_input_file_count"] == before["speccheck_input_file_count"]
+    assert after["country"] == "Ghana"
+    assert after["Quast.N50"] == before["Quast.N50"]
+
+
+def test_recheck_requires_detailed_files(tmp_path):
+    with pytest.raises(ValueError, match="No detailed"):
+        recheck(str(tmp_path), str(tmp_path / "out"), get_default_criteria_path())
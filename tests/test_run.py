@@ -0,0 +1,56 @@
+from typer.testing import CliRunner
+
+from speccheck.cli import app
+from speccheck.config import get_default_criteria_path, get_default_template_path
+from speccheck.main import collect_ghru, summary
+from tests.test_ghru_collect import _stage_ghru_fixture, _stage_second_sample
+
+
+def test_run_matches_collect_pipeline_then_summary(tmp_path):
+    output_dir = _stage_ghru_fixture(tmp_path)
+    _stage_second_sample(output_dir)
+    metadata = tmp_path / "metadata.csv"
+    metadata.write_text(
+        "sample_id,country,year,batch\ntest_sample1,Kenya,2021,07\ntest_sample2,NA,2022,A1\n",
+        encoding="utf-8",
+    )
+    collect_ghru(
+        str(output_dir),
+        str(tmp_path / "collect"),
+        get_default_criteria_path(),
+        organism="Mycoplasma genitalium",
+        metadata_file=str(metadata),
+    )
+    summary(
+        str(tmp_path / "collect"),
+        str(tmp_path / "summary"),
+        "Speciator.speciesName",
+        "sample_id",
+        get_default_template_path(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "run",
+            str(output_dir),
+            "--output",
+            str(tmp_path / "run"),
+            "--organism",
+            "Mycoplasma genitalium",
+            "--metadata",
+            str(metadata),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    for name in ["report.csv", "report.full.csv"]:
+        assert (tmp_path / "run" / name).read_text() == (tmp_path / "summary" / name).read_text()
+    assert not list((tmp_path / "run").glob("test_sample*.csv"))
+
+
+def test_run_accepts_verbose_and_version():
+    result = CliRunner().invoke(app, ["run", "missing_tree", "--verbose", "--version"])
+
+    assert result.exit_code == 0, result.output
+    assert "speccheck version:" in result.output
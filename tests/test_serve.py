@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import threading
+
+import pytest
+from typer.testing import CliRunner
+
+from speccheck import serve_workflow
+from speccheck.cli import app
+from speccheck.config import get_default_criteria_path
+from speccheck.main import collect
+from speccheck.serve_workflow import send_requests, serve
+
+PRACTICE_DATA = os.path.abspath("tests/practice_data")
+SAMPLE = "Sample_178db692semb"
+
+
+@pytest.fixture
+def server(tmp_path):
+    # AF_UNIX paths are limited to about 100 bytes, shorter than some tmp_paths.
+    socket_dir = tempfile.mkdtemp(prefix="speccheck-")
+    socket_path = os.path.join(socket_dir, "serve.sock")
+    criteria_file = tmp_path / "criteria.csv"
+    shutil.copyfile(get_default_criteria_path(), criteria_file)
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=serve,
+        args=(socket_path, str(criteria_file)),
+        kwargs={"organism": "Escherichia coli", "ready": ready},
+        daemon=True,
+    )
+    thread.start()
+    assert ready.wait(30)
+    yield socket_path, criteria_file
+    if thread.is_alive():
+        list(send_requests(socket_path, [{"command": "shutdown"}]))
+    thread.join(10)
+    shutil.rmtree(socket_dir)
+
+
+def _status(socket_path):
+    (response,) = send_requests(socket_path, [{"command": "status"}])
+    return response
+
+
+def test_served_sample_matches_collect(server, tmp_path):
+    socket_path, criteria_file = server
+    served = tmp_path / "served.csv"
+    expected = tmp_path / "expected.csv"
+
+    responses = list(
+        send_requests(
+            socket_path,
+            [
+                {
+                    "sample_id": SAMPLE,
+                    "files": [f"{PRACTICE_DATA}/{SAMPLE}"],
+                    "output_file": str(served),
+                },
+                {"sample_id": "missing", "files": [f"{PRACTICE_DATA}/nothing"]},
+            ],
+        )
+    )
+    collect(
+        "Escherichia coli",
+        [f"{PRACTICE_DATA}/{SAMPLE}"],
+        str(criteria_file),
+        str(expected),
+        SAMPLE,
+    )
+
+    assert [response["ok"] for response in responses] == [True, False]
+    assert responses[0]["output_file"] == str(served)
+    assert responses[0]["report"]["sample_id"] == SAMPLE
+    assert served.read_text() == expected.read_text()
+    assert (tmp_path / "detailed.served.csv").read_text() == (
+        tmp_path / "detailed.expected.csv"
+    ).read_text()
+
+
+def test_server_reloads_changed_criteria(server):
+    socket_path, criteria_file = server
+    original = criteria_file.read_bytes()
+    assert _status(socket_path)["criteria_sha256"] == hashlib.sha256(original).hexdigest()
+
+    edited = original.replace(b"Checkm,Completeness,>=,91,", b"Checkm,Completeness,>=,91.5,", 1)
+    criteria_file.write_bytes(edited)
+    assert _status(socket_path)["criteria_sha256"] == hashlib.sha256(edited).hexdigest()
+
+    criteria_file.write_text("not,a,criteria,file\n")
+    assert _status(socket_path)["criteria_sha256"] == hashlib.sha256(edited).hexdigest()
+
+
+def test_failed_reload_keeps_serving_the_loaded_criteria(server, monkeypatch):
+    socket_path, criteria_file = server
+    loaded = _status(socket_path)["criteria_sha256"]
+    monkeypatch.setattr(serve_workflow, "_prepare_collection_context", lambda *_: sys.exit(1))
+
+    criteria_file.write_bytes(criteria_file.read_bytes().replace(b",91,", b",91.5,", 1))
+
+    assert _status(socket_path)["criteria_sha256"] == loaded
+
+
+def test_socket_is_private_to_the_server_user(server):
+    socket_path, _ = server
+
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+
+def test_submit_command_uses_running_server(server, tmp_path):
+    socket_path, _ = server
+    output_file = tmp_path / "submitted.csv"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "submit",
+            f"{PRACTICE_DATA}/{SAMPLE}",
+            "--socket",
+            socket_path,
+            "--sample",
+            SAMPLE,
+            "--output-file",
+            str(output_file),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert output_file.is_file()
+
+    result = CliRunner().invoke(app, ["submit", "--socket", socket_path, "--command", "stop"])
+    assert result.exit_code == 1
+
+
+def test_serve_refuses_a_socket_in_use(server):
+    socket_path, criteria_file = server
+
+    with pytest.raises(FileExistsError):
+        serve(socket_path, str(criteria_file))
+
+
+def test_submit_stream_answers_malformed_lines_in_order(server):
+    socket_path, _ = server
+    specs = [
+        json.dumps({"sample_id": SAMPLE, "files": [f"{PRACTICE_DATA}/{SAMPLE}"]}),
+        "{not json",
+        "",
+        json.dumps({"sample_id": "missing", "files": [f"{PRACTICE_DATA}/nothing"]}),
+    ]
+
+    result = CliRunner().invoke(
+        app, ["submit", "--socket", socket_path, "--stream"], input="\n".join(specs) + "\n"
+    )
+
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(record["sample_id"], record["ok"]) for record in records] == [
+        (SAMPLE, True),
+        (None, False),
+        ("missing", False),
+    ]
+    assert records[1]["error"].startswith("Line 2: invalid JSON")
+
+
+def test_serve_does_not_replace_a_file_that_is_not_a_socket(tmp_path):
+    not_a_socket = tmp_path / "results.csv"
+    not_a_socket.write_text("sample_id\n", encoding="utf-8")
+
+    with pytest.raises(FileExistsError, match="not a socket"):
+        serve(str(not_a_socket), get_default_criteria_path())
+
+    assert not_a_socket.read_text(encoding="utf-8") == "sample_id\n"
+
+
+def test_truncated_response_raises_connection_error():
+    socket_dir = tempfile.mkdtemp(prefix="speccheck-")
+    socket_path = os.path.join(socket_dir, "serve.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(1)
+
+    def answer_partially():
+        connection, _ = listener.accept()
+        with connection:
+            connection.recv(4096)
+            connection.sendall(b'{"command": "status", "ok": tr')
+
+    thread = threading.Thread(target=answer_partially, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(ConnectionError, match="mid-response"):
+            list(send_requests(socket_path, [{"command": "status"}], timeout=10))
+    finally:
+        thread.join(10)
+        listener.close()
+        shutil.rmtree(socket_dir)
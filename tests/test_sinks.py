@@ -0,0 +1,90 @@
+import csv
+import os
+
+import pytest
+
+from speccheck.config import get_default_criteria_path
+from speccheck.main import collect_batch, collect_ghru, summary
+from speccheck.sinks import read_sink_records, shard_for, sink_paths
+
+PRACTICE_DATA = os.path.abspath("tests/practice_data")
+SAMPLES = ("Sample_178db692semb", "Sample_6d8e0e28ntam")
+
+
+def _collect(tmp_path, output_format, **kwargs):
+    samplesheet = tmp_path / "sheet.csv"
+    samplesheet.write_text(
+        "sample_id,organism,files\n"
+        + "".join(f"{sample},Escherichia coli,{PRACTICE_DATA}/{sample}\n" for sample in SAMPLES),
+        encoding="utf-8",
+    )
+    output_dir = tmp_path / output_format
+    written = collect_batch(
+        str(samplesheet),
+        str(output_dir),
+        get_default_criteria_path(),
+        output_format=output_format,
+        **kwargs,
+    )
+    return output_dir, written
+
+
+def _summarize(input_dir, output_dir):
+    summary(str(input_dir), str(output_dir), "Escherichia coli", "sample_id", None)
+    return (output_dir / "report.full.csv").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "sqlite"])
+def test_sink_records_match_detailed_csv(tmp_path, output_format):
+    csv_dir, _written = _collect(tmp_path, "csv")
+    _sink_dir, written = _collect(tmp_path, output_format)
+
+    assert [os.path.basename(path) for path in written] == [f"speccheck_results.{output_format}"]
+    records = list(read_sink_records(written[0]))
+    assert [record["sample_id"] for record in records] == list(SAMPLES)
+    for record in records:
+        with open(csv_dir / f"detailed.{record['sample_id']}.csv", encoding="utf-8") as handle:
+            expected = next(csv.DictReader(handle))
+        assert set(record) == set(expected)
+        assert record["all_checks_passed"] is (expected["all_checks_passed"] == "PASSED")
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "sqlite"])
+def test_summary_reads_sink_files_like_csvs(tmp_path, output_format):
+    csv_dir, _written = _collect(tmp_path, "csv")
+    sink_dir, _written = _collect(tmp_path, output_format, shards=2)
+
+    assert _summarize(sink_dir, tmp_path / "sink_summary") == _summarize(
+        csv_dir, tmp_path / "csv_summary"
+    )
+
+
+def test_parquet_sink_round_trips(tmp_path):
+    pytest.importorskip("pyarrow")
+    _sink_dir, written = _collect(tmp_path, "parquet")
+
+    assert [record["sample_id"] for record in read_sink_records(written[0])] == list(SAMPLES)
+
+
+def test_shards_are_stable_and_cover_every_sample(tmp_path):
+    sink_dir, written = _collect(tmp_path, "jsonl", shards=3)
+
+    assert written == sink_paths(str(sink_dir), "jsonl", 3)
+    stored = []
+    for index, path in enumerate(written):
+        for record in read_sink_records(path):
+            assert shard_for(record["sample_id"], 3) == index
+            stored.append(record["sample_id"])
+    assert sorted(stored) == list(SAMPLES)
+    assert not list(sink_dir.glob("*.csv"))
+
+
+def test_incremental_collection_requires_csv_output(tmp_path):
+    with pytest.raises(ValueError, match="requires CSV output"):
+        collect_ghru(
+            str(tmp_path),
+            str(tmp_path / "collect"),
+            get_default_criteria_path(),
+            incremental=True,
+            output_format="sqlite",
+        )
@@ -288,6 +288,9 @@ def test_summary_ignores_detailed_csv_and_output_directory(tmp_path):
     pd.DataFrame([{"sample_id": "S1", "extra": "legacy"}]).to_csv(
         input_dir / "detailed.sample.csv", index=False
     )
+    pd.DataFrame([{"sample_id": "S2", "stage": "parse"}]).to_csv(
+        input_dir / "speccheck_quarantine.csv", index=False
+    )
     output_dir.mkdir()
     pd.DataFrame([{"sample_id": "S1", "old": "report"}]).to_csv(
         output_dir / "report.csv", index=False
@@ -88,7 +88,7 @@ def test_update_criteria_file_preserves_unmanaged_rows(tmp_path, monkeypatch):
             return None
 
     monkeypatch.setattr(
-        "speccheck.update_criteria.requests.get",
+        "requests.get",
         lambda *_args, **_kwargs: MockResponse(fixture_text),
     )
 
@@ -0,0 +1,102 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from speccheck import work_queue
+from speccheck.work_queue import WorkQueue
+
+
+def _fill(queue_dir, count=20):
+    queue = WorkQueue(queue_dir)
+    queue.initialize(lambda: {f"S{index:02d}": {"index": index} for index in range(count)})
+    return queue
+
+
+def _drain(queue_dir, worker_id):
+    queue = WorkQueue(queue_dir)
+    claimed = []
+    while (claim := queue.claim(worker_id)) is not None:
+        claimed.append(claim.sample_id)
+        queue.complete(claim, {"worker": worker_id})
+    return claimed
+
+
+def test_queue_is_filled_once(tmp_path):
+    built = []
+
+    def build():
+        built.append(True)
+        return {"S1": {}}
+
+    assert WorkQueue(tmp_path).initialize(build) is True
+    assert WorkQueue(tmp_path).initialize(build) is False
+    assert built == [True]
+    assert WorkQueue(tmp_path).counts() == {"pending": 1, "claimed": 0, "done": 0, "failed": 0}
+
+
+def test_concurrent_workers_claim_each_task_once(tmp_path):
+    _fill(tmp_path)
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        claimed = list(executor.map(_drain, [str(tmp_path)] * 4, [f"w{i}" for i in range(4)]))
+
+    all_claimed = [sample_id for worker in claimed for sample_id in worker]
+    assert sorted(all_claimed) == [f"S{index:02d}" for index in range(20)]
+    assert WorkQueue(tmp_path).counts() == {"pending": 0, "claimed": 0, "done": 20, "failed": 0}
+
+
+def test_stale_claims_are_requeued(tmp_path):
+    queue = _fill(tmp_path, count=2)
+    stale = queue.claim("dead-worker")
+    live = queue.claim("live-worker")
+    old = time.time() - 120
+    os.utime(stale.path, (old, old))
+
+    assert queue.recover_stale(timeout=60) == 1
+    recovered = queue.claim("new-worker")
+
+    assert recovered.sample_id == stale.sample_id
+    assert recovered.task == stale.task
+    assert os.path.exists(live.path)
+
+
+def test_heartbeat_keeps_a_claim_fresh(tmp_path):
+    queue = _fill(tmp_path, count=1)
+    claim = queue.claim("worker")
+    old = time.time() - 120
+    os.utime(claim.path, (old, old))
+
+    with queue.heartbeat(claim, interval=0.01):
+        time.sleep(0.1)
+
+    assert queue.recover_stale(timeout=60) == 0
+
+
+def test_finishing_a_requeued_claim_drops_the_duplicate_task(tmp_path):
+    queue = _fill(tmp_path, count=1)
+    claim = queue.claim("slow-worker")
+    os.utime(claim.path, (0, 0))
+    queue.recover_stale(timeout=60)
+
+    queue.fail(claim, {"error": "boom"})
+
+    assert queue.counts() == {"pending": 0, "claimed": 0, "done": 0, "failed": 1}
+
+
+def test_a_new_claim_is_never_stale(tmp_path, monkeypatch):
+    queue = _fill(tmp_path, count=1)
+    (task,) = os.listdir(tmp_path / "pending")
+    os.utime(tmp_path / "pending" / task, (0, 0))
+    rename = os.rename
+    recovered = []
+
+    def rename_then_recover(source, target):
+        rename(source, target)
+        # Another node checks for stale claims right after the rename.
+        recovered.append(WorkQueue(tmp_path).recover_stale(timeout=60))
+
+    monkeypatch.setattr(work_queue.os, "rename", rename_then_recover)
+    claim = queue.claim("worker")
+
+    assert recovered == [0]
+    assert claim.sample_id == "S00"